@@ -11,11 +11,12 @@ if not os.getenv("GOOGLE_API_KEY"):
 
 import re
 import sys
+import gzip
 import json
 import time
 import threading
 from pathlib import Path
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Response, request, jsonify, render_template, send_from_directory, stream_with_context
 
 from utils.pruner import (
     run_prune_job,
@@ -352,9 +353,8 @@ def start_requery():
     return jsonify({"status": "processing", "protein": protein_name})
 
 
-@app.route('/api/status/<protein>')
-def get_status(protein):
-    """Checks the status of a running job."""
+def _job_status_payload(protein: str) -> dict:
+    """Current status of a protein's job, as served by /api/status."""
     # IMPORTANT: Check jobs dict FIRST before checking cache
     # This allows re-queries to run even when cache exists
     with jobs_lock:
@@ -363,16 +363,97 @@ def get_status(protein):
     # If there's an active job, return its status
     if job_status:
         # Filter out non-serializable fields (like threading.Event)
-        serializable_status = {k: v for k, v in job_status.items() if k != "cancel_event"}
-        return jsonify(serializable_status)
+        return {k: v for k, v in job_status.items() if k != "cancel_event"}
 
     # If no active job, check if cached result exists
     cache_path = os.path.join(CACHE_DIR, f"{protein}.json")
     if os.path.exists(cache_path):
-        return jsonify({"status": "complete"})
+        return {"status": "complete"}
 
     # No job and no cache
-    return jsonify({"status": "not_found"})
+    return {"status": "not_found"}
+
+
+# --- Status streams (Server-Sent Events) ---
+# Each open stream holds one worker thread and re-reads the in-process job
+# state; frames are only sent when the status changes. The gthread worker has
+# 10 threads (Procfile), so only a few may be held by streams at once; the rest
+# get 503 and the client falls back to interval polling.
+STATUS_STREAM_INTERVAL = 0.5      # seconds between job-state checks
+STATUS_STREAM_KEEPALIVE = 15      # seconds between comment frames while unchanged
+STATUS_STREAM_MAX_SECONDS = 300   # stream lifetime; EventSource reconnects after it
+STATUS_STREAM_MAX_CONCURRENT = 4  # open streams per worker process
+STATUS_STREAM_FINAL = {"complete", "cancelled", "error", "not_found", "unknown"}
+_status_stream_slots = threading.BoundedSemaphore(STATUS_STREAM_MAX_CONCURRENT)
+
+
+def _status_event_stream(read_status) -> Response:
+    """
+    Streams read_status() as SSE data frames until it reports a final status.
+
+    Args:
+        read_status: Callable returning the current status dict
+
+    Returns:
+        text/event-stream response, or a 503 JSON error when
+        STATUS_STREAM_MAX_CONCURRENT streams are already open
+    """
+    if not _status_stream_slots.acquire(blocking=False):
+        busy = jsonify({"error": "Too many status streams; poll instead"})
+        busy.status_code = 503
+        return busy
+
+    released = threading.Event()
+
+    def release_slot():
+        # call_on_close runs whether or not the generator was ever started
+        if not released.is_set():
+            released.set()
+            _status_stream_slots.release()
+
+    def generate():
+        yield "retry: 2000\n\n"
+        last_frame = None
+        last_sent = time.monotonic()
+        deadline = last_sent + STATUS_STREAM_MAX_SECONDS
+        while True:
+            status = read_status()
+            frame = json.dumps(status, default=str)
+            now = time.monotonic()
+            if frame != last_frame:
+                yield f"data: {frame}\n\n"
+                last_frame, last_sent = frame, now
+            elif now - last_sent >= STATUS_STREAM_KEEPALIVE:
+                # Comment frame: keeps proxies open and surfaces client disconnects
+                yield ": keepalive\n\n"
+                last_sent = now
+            if status.get("status") in STATUS_STREAM_FINAL or now >= deadline:
+                return
+            time.sleep(STATUS_STREAM_INTERVAL)
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    response.call_on_close(release_slot)
+    return response
+
+
+@app.route('/api/status/<protein>')
+def get_status(protein):
+    """Checks the status of a running job."""
+    return jsonify(_job_status_payload(protein))
+
+
+@app.route('/api/status/stream/<protein>')
+def stream_status(protein):
+    """Pushes the job status (same payload as /api/status) whenever it changes."""
+    # Nothing to follow: answer 404 instead of holding a stream slot
+    status = _job_status_payload(protein)
+    if status.get("status") == "not_found":
+        return jsonify(status), 404
+    return _status_event_stream(lambda: _job_status_payload(protein))
 
 
 # ============================================================================
@@ -922,7 +1003,15 @@ def get_visualization(protein):
 
             # Add cache-busting headers
             from flask import make_response
-            response = make_response(html)
+            # The page inlines the full network JSON (often several MB); gzip it
+            # so the browser decodes it natively instead of transferring it raw
+            if 'gzip' in request.headers.get('Accept-Encoding', ''):
+                response = make_response(gzip.compress(html.encode('utf-8'), compresslevel=6))
+                response.headers['Content-Type'] = 'text/html; charset=utf-8'
+                response.headers['Content-Encoding'] = 'gzip'
+                response.headers['Vary'] = 'Accept-Encoding'
+            else:
+                response = make_response(html)
             response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
             response.headers['Pragma'] = 'no-cache'
             response.headers['Expires'] = '0'
@@ -1075,22 +1164,35 @@ def expand_pruned():
     t.start()
     return jsonify({"status":"queued", "job_id": job_id}), 202
 
-@app.get('/api/expand/status/<job_id>')
-def expand_status(job_id):
+def _expand_status_payload(job_id: str) -> dict:
+    """Current status of a pruned-expansion job ({"status": "unknown"} if none)."""
     # If pruned file already exists, return complete
     try:
         parent, protein = parse_prune_job_id(job_id)
         full_path = Path(os.path.join(CACHE_DIR, f"{protein}.json"))
         pruned_path = Path(os.path.join(PRUNED_DIR, pruned_filename(parent, protein)))
         if full_path.exists() and is_pruned_fresh(full_path, pruned_path, HARD_MAX_KEEP_DEFAULT):
-            return jsonify({"status":"complete"}), 200
+            return {"status":"complete"}
     except Exception:
         pass
     with jobs_lock:
         st = jobs.get(job_id)
     if not st:
-        return jsonify({"status":"unknown"}), 404
-    return jsonify(st), 200
+        return {"status":"unknown"}
+    return dict(st)
+
+@app.get('/api/expand/status/<job_id>')
+def expand_status(job_id):
+    st = _expand_status_payload(job_id)
+    return jsonify(st), (404 if st.get("status") == "unknown" else 200)
+
+@app.get('/api/expand/status/stream/<job_id>')
+def expand_status_stream(job_id):
+    # Unknown/expired job: 404 like /api/expand/status, instead of holding a stream slot
+    st = _expand_status_payload(job_id)
+    if st.get("status") == "unknown":
+        return jsonify(st), 404
+    return _status_event_stream(lambda: _expand_status_payload(job_id))
 
 @app.get('/api/expand/results/<job_id>')
 def expand_results(job_id):
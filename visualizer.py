@@ -1525,6 +1525,109 @@ HTML = r"""<!DOCTYPE html>
       background: #dc2626 !important;
     }
 
+    /* Interaction modal footers (compact variant used by link/node modals) */
+    .modal-footer.modal-footer-compact,
+    body.dark-mode .modal-footer.modal-footer-compact {
+      border-top: 1px solid var(--color-border);
+      padding: 16px;
+      background: var(--color-bg-secondary);
+    }
+    .modal-footer-actions { display: flex; gap: 12px; align-items: center; flex-wrap: wrap; }
+    .modal-footer-hint { margin-top: 12px; font-size: 12px; color: var(--color-text-secondary); font-family: var(--font-sans); }
+    .modal-btn {
+      padding: 8px 20px;
+      color: white;
+      border: none;
+      border-radius: 6px;
+      font-weight: 500;
+      cursor: pointer;
+      font-size: 14px;
+      font-family: var(--font-sans);
+      transition: background 0.2s;
+    }
+    .modal-btn-expand { background: #3b82f6; }
+    .modal-btn-query { background: #10b981; }
+    .modal-btn-collapse { background: #ef4444; }
+    .modal-btn.modal-btn-disabled { background: #d1d5db; color: #6b7280; cursor: not-allowed; transition: none; }
+    .modal-depth-note {
+      padding: 8px 20px;
+      background: #f3f4f6;
+      color: #6b7280;
+      border-radius: 6px;
+      font-size: 13px;
+      font-family: var(--font-sans);
+      font-style: italic;
+    }
+
+    /* Aggregated interactions modal: section dividers and per-link sections */
+    .modal-section-divider { margin: 24px 0 16px 0; padding: 12px 16px; border-radius: 8px; }
+    .modal-section-divider h3 {
+      margin: 0;
+      font-size: 16px;
+      font-weight: 700;
+      text-transform: uppercase;
+      letter-spacing: 1px;
+      display: flex;
+      align-items: center;
+      gap: 8px;
+    }
+    .modal-section-divider-dot { display: inline-block; width: 8px; height: 8px; border-radius: 50%; }
+    .modal-section-divider-direct { background: linear-gradient(135deg, #dbeafe 0%, #e0e7ff 100%); border-left: 6px solid #3b82f6; box-shadow: 0 2px 4px rgba(59,130,246,0.1); }
+    .modal-section-divider-direct h3 { color: #1e40af; }
+    .modal-section-divider-direct .modal-section-divider-dot { background: #3b82f6; }
+    .modal-section-divider-indirect { background: linear-gradient(135deg, #fef3c7 0%, #fed7aa 100%); border-left: 6px solid #f59e0b; box-shadow: 0 2px 4px rgba(245,158,11,0.1); }
+    .modal-section-divider-indirect h3 { color: #92400e; }
+    .modal-section-divider-indirect .modal-section-divider-dot { background: #f59e0b; }
+    .modal-section-divider-shared { background: linear-gradient(135deg, #f3e8ff 0%, #fae8ff 100%); border-left: 6px solid #9333ea; box-shadow: 0 2px 4px rgba(147,51,234,0.1); }
+    .modal-section-divider-shared h3 { color: #581c87; }
+    .modal-section-divider-shared .modal-section-divider-dot { background: #9333ea; }
+    .interaction-section { margin-bottom: 24px; border: 1px solid var(--color-border); border-radius: 8px; overflow: hidden; }
+    .interaction-section-header {
+      padding: 12px 16px;
+      background: var(--color-bg-secondary);
+      display: flex;
+      align-items: center;
+      justify-content: space-between;
+      gap: 12px;
+    }
+    .interaction-section-heading { display: flex; align-items: center; gap: 12px; }
+    .interaction-section-title { font-weight: 600; font-size: 14px; }
+    .interaction-section-body { padding: 16px; }
+    .interaction-section-body[data-lazy-section] { min-height: 120px; }
+    .function-context-header {
+      padding: 8px 12px;
+      background: var(--color-bg-secondary);
+      border-bottom: 1px solid var(--color-border);
+      font-size: 11px;
+      font-weight: 600;
+      color: var(--color-text-secondary);
+      display: flex;
+      align-items: center;
+      gap: 8px;
+    }
+    /* Section type badges keep their colours over the themed mechanism-badge */
+    .mechanism-badge.type-badge-direct,
+    body.dark-mode .mechanism-badge.type-badge-direct,
+    body.dark-mode .mechanism-badge.type-badge-direct:hover { background: #10b981; color: white; }
+    .mechanism-badge.type-badge-indirect,
+    body.dark-mode .mechanism-badge.type-badge-indirect,
+    body.dark-mode .mechanism-badge.type-badge-indirect:hover { background: #f59e0b; color: white; }
+    .mechanism-badge.type-badge-shared,
+    body.dark-mode .mechanism-badge.type-badge-shared,
+    body.dark-mode .mechanism-badge.type-badge-shared:hover { background: #9333ea; color: white; }
+
+    /* Direction-grouped function tags (effect colour stays inline) */
+    .function-effect-tag-row { display: flex; align-items: center; gap: 6px; margin-bottom: 4px; }
+    .function-effect-tag {
+      display: inline-block;
+      padding: 2px 6px;
+      color: white;
+      border-radius: 3px;
+      font-size: 9px;
+      font-weight: 600;
+    }
+    .function-effect-tag-name { font-weight: 600; font-size: 11px; }
+
     /* Interaction Summary Section */
     .modal-summary{
       margin-bottom: var(--space-8);
@@ -1774,6 +1877,141 @@ HTML = r"""<!DOCTYPE html>
       border-left-color: #fbbf24;
     }
 
+    /* Function row details (renderExpandableFunction) */
+    .function-row-left .function-separator {
+      margin: 0 8px;
+      color: var(--color-text-secondary);
+    }
+    .function-row-left .context-badge {
+      color: white;
+      font-size: 9px;
+      padding: 2px 6px;
+      border-radius: 3px;
+      margin-left: 6px;
+    }
+    .function-row-left .context-badge.context-chain { background: #f59e0b; }
+    .function-row-left .context-badge.context-direct { background: #10b981; }
+    .function-expanded-content .function-section-empty {
+      color: var(--color-text-secondary);
+    }
+    .function-expanded-content .effect-pill-lg {
+      font-size: 0.875rem;
+      padding: 0.25rem 0.75rem;
+    }
+    .function-expanded-content .function-detail-section.section-effects-summary.section-highlighted {
+      background: var(--color-bg-secondary);
+      border-left: 3px solid var(--color-primary);
+    }
+    .function-expanded-content .effects-summary-item {
+      margin-bottom: 12px;
+    }
+    .function-expanded-content .effects-summary-label {
+      font-size: 11px;
+      color: var(--color-text-secondary);
+      margin-bottom: 4px;
+      font-weight: 600;
+      text-transform: uppercase;
+    }
+    .function-expanded-content .effects-summary-text {
+      margin-left: 0.5rem;
+      font-size: 0.875rem;
+      color: var(--color-text-secondary);
+    }
+    .function-expanded-content .function-detail-section.section-chain-context {
+      background: #fffbeb;
+      border-left: 3px solid #f59e0b;
+    }
+    .function-expanded-content .chain-context-pathway {
+      font-size: 13px;
+      color: #92400e;
+    }
+    .function-expanded-content .chain-context-note {
+      font-size: 11px;
+      color: #78350f;
+      margin-top: 4px;
+      font-style: italic;
+    }
+    .function-expanded-content .chain-cascade {
+      margin-top: 12px;
+      padding: 12px;
+      background: rgba(245, 158, 11, 0.1);
+      border-radius: 6px;
+    }
+    .function-expanded-content .chain-cascade-title {
+      font-size: 12px;
+      font-weight: 600;
+      color: #92400e;
+      margin-bottom: 8px;
+    }
+    .function-expanded-content .chain-cascade-step {
+      display: flex;
+      align-items: center;
+      margin: 6px 0;
+      font-size: 12px;
+    }
+    .function-expanded-content .chain-cascade-protein {
+      font-weight: 500;
+    }
+    .function-expanded-content .chain-cascade-arrow {
+      margin: 0 8px;
+      color: #6b7280;
+      font-weight: 600;
+    }
+    .function-expanded-content .chain-cascade-arrow.chain-step-activates { color: #059669; }
+    .function-expanded-content .chain-cascade-arrow.chain-step-inhibits { color: #dc2626; }
+    .function-expanded-content .chain-cascade-arrow.chain-step-other { color: #7c3aed; }
+    .function-expanded-content .chain-cascade-summary {
+      margin-top: 12px;
+      padding-top: 12px;
+      border-top: 1px solid rgba(245, 158, 11, 0.3);
+    }
+    .function-expanded-content .chain-cascade-summary-label {
+      font-size: 11px;
+      color: #78350f;
+      font-weight: 600;
+      margin-bottom: 4px;
+    }
+    .function-expanded-content .chain-cascade-summary-text {
+      font-size: 12px;
+      color: #92400e;
+    }
+    .function-expanded-content .mechanism-text {
+      margin-left: 0.5rem;
+    }
+    .function-expanded-content .mechanism-text.mechanism-text-muted {
+      color: var(--color-text-secondary);
+    }
+    .function-expanded-content .function-specific-effects {
+      margin: 0;
+      padding-left: 1.5em;
+    }
+    .function-expanded-content .evidence-links {
+      margin-top: var(--space-2);
+    }
+
+    /* Interaction type badge (interaction modals); colour by arrow kind */
+    .interaction-type-badge {
+      display: inline-block;
+      padding: 2px 8px;
+      border: 1px solid;
+      border-radius: 4px;
+      font-size: 10px;
+      font-weight: 600;
+      text-transform: uppercase;
+      letter-spacing: 0.3px;
+    }
+    .interaction-type-badge.itype-spaced { margin-right: 4px; margin-bottom: 4px; }
+    .interaction-type-badge.itype-activates { background: #d1fae5; color: #047857; border-color: #059669; }
+    .interaction-type-badge.itype-inhibits { background: #fee2e2; color: #b91c1c; border-color: #dc2626; }
+    .interaction-type-badge.itype-binds { background: #ede9fe; color: #6d28d9; border-color: #7c3aed; }
+    .interaction-type-badge.itype-regulates { background: #fef3c7; color: #a16207; border-color: #d97706; }
+    .interaction-type-badge.itype-complex { background: #e0e7ff; color: #4f46e5; border-color: #6366f1; }
+    body.dark-mode .interaction-type-badge.itype-activates { background: #065f46; color: #a7f3d0; border-color: #047857; }
+    body.dark-mode .interaction-type-badge.itype-inhibits { background: #991b1b; color: #fecaca; border-color: #b91c1c; }
+    body.dark-mode .interaction-type-badge.itype-binds { background: #5b21b6; color: #ddd6fe; border-color: #6d28d9; }
+    body.dark-mode .interaction-type-badge.itype-regulates { background: #854d0e; color: #fef3c7; border-color: #a16207; }
+    body.dark-mode .interaction-type-badge.itype-complex { background: #6366f1; color: #e0e7ff; border-color: #4f46e5; }
+
     /* Cascade Display */
     .cascade-flow{
       display: flex;
@@ -2278,6 +2516,12 @@ HTML = r"""<!DOCTYPE html>
     .data-table tbody tr.function-row:hover {
       background: #e0e7ff;
     }
+    /* Skip layout/paint of off-screen rows. Containment does not apply to <tr>
+       boxes, so it is set on the cells; "auto" remembers each cell's last size. */
+    .data-table tbody tr.function-row > td {
+      content-visibility: auto;
+      contain-intrinsic-size: auto 44px;
+    }
     .data-table td {
       padding: 8px 12px;
       color: var(--color-text-primary);
@@ -4032,6 +4276,15 @@ HTML = r"""<!DOCTYPE html>
 
 <script src="https://cdnjs.cloudflare.com/ajax/libs/d3/7.8.5/d3.min.js"></script>
 <script>
+// Verbose layout/drag diagnostics; flip to true when debugging cluster behaviour.
+const DEBUG_GRAPH = false;
+
+// escapeHtml tables (declared up front: escapeHtml may run during initial render)
+const ESCAPE_HTML_RE = /[&<>"'\u00a0]/g;
+const ESCAPE_HTML_MAP = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;', '\u00a0': '&nbsp;' };
+const escapeHtmlCache = new Map();   // raw string -> escaped; protein names repeat across every modal row
+const ESCAPE_HTML_CACHE_MAX = 2000;
+
 /* ===== Robust data load & hydration ===== */
 let RAW, SNAP, CTX;
 
@@ -4079,26 +4332,9 @@ try {
   throw error; // Stop execution
 }
 
-function hydrateSnapshotWithCtx(snap, ctx){
-  if (!ctx || !ctx.interactors) return snap;
-  const byPrimary = new Map();
-  ctx.interactors.forEach(ci => { if (ci && ci.primary) byPrimary.set(ci.primary, ci); });
-  snap.interactors.forEach(si => {
-    const ci = byPrimary.get(si.primary);
-    if (!ci) return;
-    // Replace/augment functions & evidence with richer ctx details
-    if (Array.isArray(ci.functions) && ci.functions.length) si.functions = ci.functions;
-    if (!si.evidence && Array.isArray(ci.evidence)) si.evidence = ci.evidence;
-    if (!si.support_summary && ci.support_summary) si.support_summary = ci.support_summary;
-    // Hydrate new fact-checker fields (optional, for future enhancement)
-    if (ci.validation_status) si.validation_status = ci.validation_status;
-    if (ci.validated !== undefined) si.validated = ci.validated;
-  });
-  // also allow ctx.main to override title if needed
-  if (!snap.main && ctx.main) snap.main = ctx.main;
-  return snap;
-}
-hydrateSnapshotWithCtx(SNAP, CTX);
+// ctx_json interactor details are merged in buildInitialGraph's legacy transform
+// (single pass over SNAP.interactors); only the title fallback is applied up front
+if (CTX && CTX.interactors && !SNAP.main && CTX.main) SNAP.main = CTX.main;
 
 console.log('✅ Step 3: Hydration complete');
 
@@ -4110,15 +4346,60 @@ let graphInitialFitDone = false;
 let fitToViewTimer = null;
 
 let nodes = [], links = [];
+const nodeById = new Map();          // nodeId -> node, kept in sync with nodes (addNode/removeNodesById)
+const linkById = new Map();          // linkId -> link, kept in sync with links (addLink/removeLinksById)
+const indirectLinkByTarget = new Map(); // targetId -> first indirect/upstream link into it (see findParentNode)
+let indirectLinkByTargetDirty = true;   // set by addLink/removeLinksById
+const linksByNode = new Map();          // nodeId -> links touching it, in links order (see getNodeLinks)
+let linksByNodeDirty = true;            // set by addLink/removeLinksById
+
+function addNode(node){
+  nodes.push(node);
+  if (!nodeById.has(node.id)) nodeById.set(node.id, node);
+  return node;
+}
+
+function addLink(link){
+  links.push(link);
+  if (!linkById.has(link.id)) linkById.set(link.id, link);
+  indirectLinkByTargetDirty = true;
+  linksByNodeDirty = true;
+  return link;
+}
+
+/** Removes nodes whose ids are in idSet (a Set<string>) from nodes and nodeById */
+function removeNodesById(idSet){
+  nodes = nodes.filter(n => !idSet.has(n.id));
+  idSet.forEach(id => nodeById.delete(id));
+}
+
+/** Removes links whose ids are in idSet (a Set<string>) from links and linkById */
+function removeLinksById(idSet){
+  links = links.filter(l => !idSet.has(l.id));
+  idSet.forEach(id => linkById.delete(id));
+  indirectLinkByTargetDirty = true;
+  linksByNodeDirty = true;
+}
+
 // --- expansion toggle tracking ---
 const expansionRegistry = new Map(); // ownerId -> {nodes:Set<string>, links:Set<string>}
+const expansionParentOf = new Map(); // nodeId -> ownerId, derived from expansionRegistry
+let expansionParentOfDirty = true;   // set whenever expansionRegistry gains/loses an entry
 const refCounts = new Map();         // entityId (nodeId or linkId) -> number of expansions referencing it
 let baseNodes = null;                // Set<string> of initial nodes (never removed)
 let baseLinks = null;                // Set<string> of initial links (never removed)
+let baseLinkPairs = null;            // Set<string> of linkPairKey()s of initial `${src}-${tgt}-${arrow}` links
+
+/** Direction-independent key for a source/target pair with a given arrow */
+function linkPairKey(a, b, arrow){
+  return a < b ? `${a}|${b}|${arrow}` : `${b}|${a}|${arrow}`;
+}
 
 // Multi-graph cluster state
 const CLUSTER_RADIUS = 500;          // Radius of each mini force-graph (2.5x larger for spacing)
 const clusters = new Map();          // Map<centerId, {center, centerPos, members, localLinks}>
+const nodeClusterIndex = new Map();  // nodeId -> centerId, derived from clusters (see getNodeCluster)
+let nodeClusterIndexDirty = true;
 let nextClusterAngle = 0;            // For radial cluster positioning
 
 /**
@@ -4134,7 +4415,60 @@ function getClusterSeparation(interactorCount) {
 let currentZoom = 1;
 let mainNodeRadius = 32;            // Bigger than interactors but not too fat
 let interactorNodeRadius = 24;      // Standard size for interactor nodes
+let mainNodeRef = null;              // The 'main' node, cached by initializeClusterLayout (see getMainNode)
 let linkGroup, nodeGroup;            // D3 selections for links and nodes
+let svgDefs = null;                  // <defs> holding markers/gradients (filled lazily)
+const createdDefIds = new Set();     // ids of markers/gradients already appended to svgDefs
+
+// Marker builders keyed by arrow kind (activates -> 'activate', etc.)
+const ARROW_MARKER_DEFS = {
+  activate: (m) => m.append('path').attr('d','M0,-5L10,0L0,5L3,0Z').attr('fill','#059669'),
+  inhibit: (m) => m.append('rect').attr('x',6).attr('y',-4).attr('width',3).attr('height',8).attr('fill','#dc2626'),
+  binding: (m) => {
+    m.append('rect').attr('x',4).attr('y',-4).attr('width',2).attr('height',8).attr('fill','#7c3aed');
+    m.append('rect').attr('x',7).attr('y',-4).attr('width',2).attr('height',8).attr('fill','#7c3aed');
+  }
+};
+
+// Radial gradient stops: [light 0%, light 100%, dark 0%, dark 100%]
+const NODE_GRADIENT_DEFS = {
+  main: ['#6366f1', '#4338ca', '#818cf8', '#6366f1'],
+  interactor: ['#525252', '#404040', '#404040', '#262626'],
+  expanded: ['#c7d2fe', '#a5b4fc', '#a5b4fc', '#818cf8']  // Light indigo (indigo-200/300/400)
+};
+
+/**
+ * Appends the arrowhead marker for an arrow kind on first use.
+ * @returns {string} marker url() reference
+ */
+function ensureArrowMarker(arrow){
+  const type = arrow === 'activates' ? 'activate' : arrow === 'inhibits' ? 'inhibit' : 'binding';
+  const id = `arrow-${type}`;
+  if (svgDefs && !createdDefIds.has(id)) {
+    createdDefIds.add(id);
+    const m = svgDefs.append('marker').attr('id', id).attr('viewBox','0 -5 10 10').attr('refX',10).attr('refY',0)
+        .attr('markerWidth',10).attr('markerHeight',10).attr('orient','auto');
+    ARROW_MARKER_DEFS[type](m);
+  }
+  return `url(#${id})`;
+}
+
+/**
+ * Appends the light and dark radial gradients for a node kind on first use
+ * (both are created because the theme can be toggled without re-rendering).
+ */
+function ensureNodeGradient(kind){
+  const id = `${kind}Gradient`;
+  if (!svgDefs || createdDefIds.has(id)) return;
+  createdDefIds.add(id);
+  const [light0, light100, dark0, dark100] = NODE_GRADIENT_DEFS[kind];
+  const grad = svgDefs.append('radialGradient').attr('id', id);
+  grad.append('stop').attr('offset', '0%').attr('stop-color', light0);
+  grad.append('stop').attr('offset', '100%').attr('stop-color', light100);
+  const gradDark = svgDefs.append('radialGradient').attr('id', `${id}Dark`);
+  gradDark.append('stop').attr('offset', '0%').attr('stop-color', dark0);
+  gradDark.append('stop').attr('offset', '100%').attr('stop-color', dark100);
+}
 
 function initNetwork(){
   const container = document.getElementById('network');
@@ -4153,89 +4487,94 @@ function initNetwork(){
     fitToViewTimer = null;
   }
 
+  // Coalesce zoom transforms to one write per animation frame
+  // (trackpads fire wheel events far faster than the display refreshes)
+  let pendingZoomTransform = null;
+  let zoomRafId = 0;
   zoomBehavior = d3.zoom()
     .scaleExtent([0.35, 2.8])
     .on('zoom', (ev) => {
-      if (g) {
-        g.attr('transform', ev.transform);
-      }
-      currentZoom = ev.transform.k;
+      pendingZoomTransform = ev.transform;
+      if (zoomRafId) return;
+      zoomRafId = requestAnimationFrame(() => {
+        zoomRafId = 0;
+        if (g) {
+          g.attr('transform', pendingZoomTransform);
+        }
+        currentZoom = pendingZoomTransform.k;
+      });
     });
 
   svg.call(zoomBehavior);
   g = svg.append('g');
 
-  // Arrowheads
-  const defs = svg.append('defs');
-  ['activate','inhibit','binding'].forEach(type=>{
-    const color = type==='activate' ? '#059669' : type==='inhibit' ? '#dc2626' : '#7c3aed';
-    if (type==='activate'){
-      defs.append('marker').attr('id','arrow-activate').attr('viewBox','0 -5 10 10').attr('refX',10).attr('refY',0)
-          .attr('markerWidth',10).attr('markerHeight',10).attr('orient','auto')
-          .append('path').attr('d','M0,-5L10,0L0,5L3,0Z').attr('fill',color);
-    } else if (type==='inhibit'){
-      defs.append('marker').attr('id','arrow-inhibit').attr('viewBox','0 -5 10 10').attr('refX',10).attr('refY',0)
-          .attr('markerWidth',10).attr('markerHeight',10).attr('orient','auto')
-          .append('rect').attr('x',6).attr('y',-4).attr('width',3).attr('height',8).attr('fill',color);
-    } else {
-      const m = defs.append('marker').attr('id','arrow-binding').attr('viewBox','0 -5 10 10').attr('refX',10).attr('refY',0)
-          .attr('markerWidth',10).attr('markerHeight',10).attr('orient','auto');
-      m.append('rect').attr('x',4).attr('y',-4).attr('width',2).attr('height',8).attr('fill',color);
-      m.append('rect').attr('x',7).attr('y',-4).attr('width',2).attr('height',8).attr('fill',color);
-    }
-  });
-
-  // Node Gradients - Light Mode
-  const mainGrad = defs.append('radialGradient').attr('id', 'mainGradient');
-  mainGrad.append('stop').attr('offset', '0%').attr('stop-color', '#6366f1');
-  mainGrad.append('stop').attr('offset', '100%').attr('stop-color', '#4338ca');
-
-  const interactorGrad = defs.append('radialGradient').attr('id', 'interactorGradient');
-  interactorGrad.append('stop').attr('offset', '0%').attr('stop-color', '#525252');
-  interactorGrad.append('stop').attr('offset', '100%').attr('stop-color', '#404040');
-
-  // Node Gradients - Dark Mode
-  const mainGradDark = defs.append('radialGradient').attr('id', 'mainGradientDark');
-  mainGradDark.append('stop').attr('offset', '0%').attr('stop-color', '#818cf8');
-  mainGradDark.append('stop').attr('offset', '100%').attr('stop-color', '#6366f1');
-
-  const interactorGradDark = defs.append('radialGradient').attr('id', 'interactorGradientDark');
-  interactorGradDark.append('stop').attr('offset', '0%').attr('stop-color', '#404040');
-  interactorGradDark.append('stop').attr('offset', '100%').attr('stop-color', '#262626');
-
-  // Expanded Node Gradients - Distinct from main, darker glow
-  const expandedGrad = defs.append('radialGradient').attr('id', 'expandedGradient');
-  expandedGrad.append('stop').attr('offset', '0%').attr('stop-color', '#c7d2fe'); // Light indigo (indigo-200)
-  expandedGrad.append('stop').attr('offset', '100%').attr('stop-color', '#a5b4fc'); // Light indigo (indigo-300)
-
-  const expandedGradDark = defs.append('radialGradient').attr('id', 'expandedGradientDark');
-  expandedGradDark.append('stop').attr('offset', '0%').attr('stop-color', '#a5b4fc'); // Light indigo (indigo-300)
-  expandedGradDark.append('stop').attr('offset', '100%').attr('stop-color', '#818cf8'); // Light indigo (indigo-400)
+  // Arrowhead markers and node gradients are created lazily on first use
+  svgDefs = svg.append('defs');
+  createdDefIds.clear();
 
    buildInitialGraph();
    // snapshot base graph ids (non-removable)
    baseNodes = new Set(nodes.map(n => n.id));
    baseLinks = new Set(links.map(l => l.id));
+   // Only links whose id is `${src}-${tgt}-${arrow}` (not e.g. orphan `-fallback` links),
+   // matching the id probes mergeSubgraph used to make against baseLinks
+   baseLinkPairs = new Set();
+   links.forEach(l => {
+     const src = l.source.id || l.source, tgt = l.target.id || l.target;
+     if (l.id === `${src}-${tgt}-${l.arrow}`) baseLinkPairs.add(linkPairKey(src, tgt, l.arrow));
+   });
    createSimulation();
 }
 
 // calculateSpacing function removed - logic now inline in buildInitialGraph()
 
+// Comprehensive activation / inhibition terms, matched as substrings in a single scan
+const ACTIVATE_TERMS_RE = /activate|activation|enhance|promote|upregulate|stabilize/;
+const INHIBIT_TERMS_RE = /inhibit|suppress|repress|downregulate|block|reduce/;
+
+// Exact arrow values whose kind does not depend on intent (the common case)
+const ARROW_KIND_LUT = new Map();
+['activate','activates','activation','enhance','enhances','promote','promotes',
+ 'upregulate','upregulates','stabilize','stabilizes','activator','positive']
+  .forEach(k => ARROW_KIND_LUT.set(k, 'activates'));
+['inhibit','inhibits','inhibition','suppress','suppresses','repress','represses',
+ 'downregulate','downregulates','block','blocks','reduce','reduces','negative']
+  .forEach(k => ARROW_KIND_LUT.set(k, 'inhibits'));
+['binds','binding'].forEach(k => ARROW_KIND_LUT.set(k, 'binds'));
+
+// Arrow values that carry no effect, so intent decides
+const UNDIRECTED_ARROW_VALUES = new Set(['undirected','unknown','none','na','n/a','bidirectional','both','reciprocal','neutral','modulates','regulates']);
+
+// arrowKind() sees only a few dozen distinct arrow/intent pairs per dataset,
+// so results are memoized (direction does not affect classification)
+const arrowKindCache = new Map();
+
 function arrowKind(rawArrow, intent, direction){
+  const cacheKey = `${rawArrow}|${intent}`;
+  let kind = arrowKindCache.get(cacheKey);
+  if (kind === undefined) {
+    kind = classifyArrowKind(rawArrow, intent);
+    arrowKindCache.set(cacheKey, kind);
+  }
+  return kind;
+}
+
+function classifyArrowKind(rawArrow, intent){
   const arrowValue = (rawArrow || '').toString().trim().toLowerCase();
-  const intentValue = (intent || '').toString().trim().toLowerCase();
+  // Exact known value - single table lookup
+  const exactKind = ARROW_KIND_LUT.get(arrowValue);
+  if (exactKind) {
+    return exactKind;
+  }
 
-  // Comprehensive activation terms
-  const activateTerms = ['activate','activates','activation','enhance','enhances','promote','promotes','upregulate','upregulates','stabilize','stabilizes'];
-  // Comprehensive inhibition terms
-  const inhibitTerms = ['inhibit','inhibits','inhibition','suppress','suppresses','repress','represses','downregulate','downregulates','block','blocks','reduce','reduces'];
+  const intentValue = (intent || '').toString().trim().toLowerCase();
 
   // Check arrow value for activation
-  if (activateTerms.some(term => arrowValue.includes(term))) {
+  if (ACTIVATE_TERMS_RE.test(arrowValue)) {
     return 'activates';
   }
   // Check arrow value for inhibition
-  if (inhibitTerms.some(term => arrowValue.includes(term))) {
+  if (INHIBIT_TERMS_RE.test(arrowValue)) {
     return 'inhibits';
   }
   // Exact binding match
@@ -4250,7 +4589,7 @@ function arrowKind(rawArrow, intent, direction){
     return 'inhibits';
   }
   // If arrow is undirected/unknown, check intent
-  if (!arrowValue || ['undirected','unknown','none','na','n/a','bidirectional','both','reciprocal','neutral','modulates','regulates'].includes(arrowValue)) {
+  if (!arrowValue || UNDIRECTED_ARROW_VALUES.has(arrowValue)) {
     if (intentValue === 'activation' || intentValue === 'activates') return 'activates';
     if (intentValue === 'inhibition' || intentValue === 'inhibits') return 'inhibits';
     if (intentValue === 'binding') return 'binds';
@@ -4297,16 +4636,36 @@ function buildInitialGraph(){
   if (proteins.length === 0 && SNAP.interactors && SNAP.interactors.length > 0) {
     console.log('Legacy format detected - transforming old interactors array to new format...');
 
-    // Extract proteins from interactors
+    // Extract proteins from interactors (Set-based de-dup keeps this linear)
     proteins = [SNAP.main];
-    SNAP.interactors.forEach(int => {
-      if (int.primary && !proteins.includes(int.primary)) {
+    const seenProteins = new Set(proteins);
+    for (const int of SNAP.interactors) {
+      if (int.primary && !seenProteins.has(int.primary)) {
+        seenProteins.add(int.primary);
         proteins.push(int.primary);
       }
-    });
+    }
+
+    // Richer ctx_json interactor details, merged in the same pass that builds interactions
+    const ctxByPrimary = (CTX && Array.isArray(CTX.interactors)) ? new Map() : null;
+    if (ctxByPrimary) {
+      CTX.interactors.forEach(ci => { if (ci && ci.primary) ctxByPrimary.set(ci.primary, ci); });
+    }
+
+    // Transform interactors to interactions array (preallocated to final length)
+    interactions = new Array(SNAP.interactors.length);
+    SNAP.interactors.forEach((int, intIndex) => {
+      const ci = ctxByPrimary && ctxByPrimary.get(int.primary);
+      if (ci) {
+        // Replace/augment functions & evidence with richer ctx details
+        if (Array.isArray(ci.functions) && ci.functions.length) int.functions = ci.functions;
+        if (!int.evidence && Array.isArray(ci.evidence)) int.evidence = ci.evidence;
+        if (!int.support_summary && ci.support_summary) int.support_summary = ci.support_summary;
+        // Hydrate new fact-checker fields (optional, for future enhancement)
+        if (ci.validation_status) int.validation_status = ci.validation_status;
+        if (ci.validated !== undefined) int.validated = ci.validated;
+      }
 
-    // Transform interactors to interactions array
-    interactions = SNAP.interactors.map(int => {
       // For indirect interactions, source should be upstream_interactor, not main
       const isIndirect = (int.interaction_type || int.type || 'direct') === 'indirect';
       const upstream = int.upstream_interactor;
@@ -4341,7 +4700,7 @@ function buildInitialGraph(){
       // Note: When upstream is missing for indirect, link comes from query protein
       // This shows "unknown mediator" pathway rather than false assignment
 
-      return {
+      interactions[intIndex] = {
         source: finalSource,  // D3 will replace this with node object reference
         target: finalTarget,  // D3 will replace this with node object reference
         semanticSource: finalSource,  // Preserve original semantic source
@@ -4426,7 +4785,7 @@ function buildInitialGraph(){
   const interactorR = Math.max(minR, calculatedRadius);
 
   // Create main protein node (fixed at center)
-  nodes.push({
+  addNode({
     id: SNAP.main,
     label: SNAP.main,
     type: 'main',
@@ -4483,7 +4842,7 @@ function buildInitialGraph(){
     const x = width/2 + Math.cos(angle)*interactorR;
     const y = height/2 + Math.sin(angle)*interactorR;
 
-    nodes.push({
+    addNode({
       id: protein,
       label: protein,
       type: 'interactor',
@@ -4502,7 +4861,7 @@ function buildInitialGraph(){
     const x = width/2 + Math.cos(angle)*outerR;
     const y = height/2 + Math.sin(angle)*outerR;
 
-    nodes.push({
+    addNode({
       id: protein,
       label: protein,
       type: 'interactor',
@@ -4516,7 +4875,21 @@ function buildInitialGraph(){
   });
 
   // Create interaction links (handles direct, shared, and cross_link types)
-  const linkIds = new Set();  // Track created links to avoid duplicates
+  // Duplicate detection uses numeric keys packed from interned protein indices
+  // and a 2-bit arrow code, so the hot edge loop never hashes composite strings.
+  const LINK_ARROW_CODE = { activates: 0, inhibits: 1, binds: 2 };
+  const proteinIndex = new Map();  // protein id -> small int
+  nodes.forEach((n, i) => proteinIndex.set(n.id, i));
+  const internProtein = (id) => {
+    let idx = proteinIndex.get(id);
+    if (idx === undefined) {
+      idx = proteinIndex.size;
+      proteinIndex.set(id, idx);
+    }
+    return idx;
+  };
+  const packLinkKey = (srcIdx, tgtIdx, arrow) => (srcIdx * 1048576 + tgtIdx) * 4 + LINK_ARROW_CODE[arrow];
+  const linkByKey = new Map();  // packed key -> link (tracks created links to avoid duplicates)
 
   interactions.forEach(interaction => {
     const source = interaction.source;
@@ -4528,8 +4901,8 @@ function buildInitialGraph(){
     }
 
     // Verify both nodes exist
-    let sourceNode = nodes.find(n => n.id === source);
-    const targetNode = nodes.find(n => n.id === target);
+    let sourceNode = nodeById.get(source);
+    const targetNode = nodeById.get(target);
 
     // Handle orphaned indirect interactors (missing upstream mediator)
     let isIncompletePathway = false;
@@ -4538,7 +4911,7 @@ function buildInitialGraph(){
     if (!sourceNode && interaction.interaction_type === 'indirect' && targetNode) {
       // Fallback: connect orphaned indirect interactor to main protein
       console.warn(`buildInitialGraph: Upstream mediator '${source}' not found for indirect interactor '${target}'. Creating fallback link from main protein.`);
-      sourceNode = nodes.find(n => n.id === SNAP.main);
+      sourceNode = nodeById.get(SNAP.main);
       isIncompletePathway = true;
       missingMediator = source;
       // Update link to use main protein as source
@@ -4557,23 +4930,24 @@ function buildInitialGraph(){
       interaction.direction || 'main_to_primary'
     );
 
-    // Create link ID with arrow type to allow multiple parallel links with different arrows
+    // Link key includes arrow type to allow multiple parallel links with different arrows
     // Example: "HDAC6-VCP-activates" and "HDAC6-VCP-binds" are both allowed
-    const linkId = `${source}-${target}-${arrow}`;
-    const reverseLinkId = `${target}-${source}-${arrow}`;
+    const sourceIdx = internProtein(source);
+    const targetIdx = internProtein(target);
+    const linkKey = packLinkKey(sourceIdx, targetIdx, arrow);
 
     // Check if this exact link already exists
-    if (linkIds.has(linkId)) {
-      console.warn(`buildInitialGraph: Duplicate link ${linkId}`);
+    if (linkByKey.has(linkKey)) {
+      console.warn(`buildInitialGraph: Duplicate link ${source}-${target}-${arrow}`);
       return;
     }
 
     // Check if reverse link exists (for bidirectional detection)
-    const reverseExists = linkIds.has(reverseLinkId);
+    const existing = linkByKey.get(packLinkKey(targetIdx, sourceIdx, arrow));
+    const reverseExists = existing !== undefined;
     if (reverseExists) {
       // Reverse link exists with same arrow type - mark both as bidirectional
-      const existing = links.find(l => l.id === reverseLinkId);
-      if (existing && !existing.isBidirectional) {
+      if (!existing.isBidirectional) {
         existing.isBidirectional = true;
         existing.linkOffset = 0;
         existing.showBidirectionalMarkers = true;
@@ -4585,7 +4959,7 @@ function buildInitialGraph(){
 
     // Create link object
     const link = {
-      id: linkId,
+      id: `${source}-${target}-${arrow}`,
       source: source,
       target: target,
       type: 'interaction',  // All links are interaction type now (no function links)
@@ -4602,8 +4976,8 @@ function buildInitialGraph(){
       _missing_mediator: missingMediator  // Name of the missing upstream protein
     };
 
-    links.push(link);
-    linkIds.add(linkId);
+    addLink(link);
+    linkByKey.set(linkKey, link);
   });
 
   // === DETECT AND FIX ORPHANED SUBGRAPHS ===
@@ -4612,29 +4986,35 @@ function buildInitialGraph(){
   // Perform BFS from main protein to find all reachable nodes, then create fallback links for orphans.
 
   function findOrphanedNodes(nodes, links, mainProteinId) {
+    // Build undirected adjacency once so the BFS visits each edge at most twice
+    const adjacency = new Map();
+    nodes.forEach(n => adjacency.set(n.id, []));
+    links.forEach(link => {
+      const sourceId = typeof link.source === 'object' ? link.source.id : link.source;
+      const targetId = typeof link.target === 'object' ? link.target.id : link.target;
+      // Links are navigable both ways
+      if (!adjacency.has(sourceId)) adjacency.set(sourceId, []);
+      if (!adjacency.has(targetId)) adjacency.set(targetId, []);
+      adjacency.get(sourceId).push(targetId);
+      adjacency.get(targetId).push(sourceId);
+    });
+
     const visited = new Set();
     const queue = [mainProteinId];
     visited.add(mainProteinId);
 
-    // BFS traversal from main protein
-    while (queue.length > 0) {
-      const current = queue.shift();
-
-      // Find all links connected to current node (bidirectional search)
-      links.forEach(link => {
-        const sourceId = typeof link.source === 'object' ? link.source.id : link.source;
-        const targetId = typeof link.target === 'object' ? link.target.id : link.target;
-
-        // Check both directions (links are navigable both ways)
-        if (sourceId === current && !visited.has(targetId)) {
-          visited.add(targetId);
-          queue.push(targetId);
+    // BFS traversal from main protein (index-based dequeue instead of O(n) shift)
+    let head = 0;
+    while (head < queue.length) {
+      const current = queue[head++];
+      const neighbors = adjacency.get(current);
+      if (!neighbors) continue;
+      for (const neighbor of neighbors) {
+        if (!visited.has(neighbor)) {
+          visited.add(neighbor);
+          queue.push(neighbor);
         }
-        if (targetId === current && !visited.has(sourceId)) {
-          visited.add(sourceId);
-          queue.push(sourceId);
-        }
-      });
+      }
     }
 
     // Return nodes NOT visited (= orphaned, not reachable from main)
@@ -4672,8 +5052,7 @@ function buildInitialGraph(){
         _orphaned_subgraph: true  // Flag to distinguish from single node orphans
       };
 
-      links.push(fallbackLink);
-      linkIds.add(fallbackLink.id);
+      addLink(fallbackLink);
     });
   }
 
@@ -4698,7 +5077,7 @@ function buildInitialGraph(){
 
   // Position each group around its upstream node
   upstreamGroups.forEach((indirectNodes, upstreamId) => {
-    const upstreamNode = nodes.find(n => n.id === upstreamId);
+    const upstreamNode = nodeById.get(upstreamId);
 
     if (!upstreamNode) {
       console.warn(`Upstream node ${upstreamId} not found, using default position`);
@@ -4731,24 +5110,17 @@ function buildInitialGraph(){
  */
 function findParentNode(nodeId) {
   // Check if this node is in any expansion registry
-  for (const [parentId, registry] of expansionRegistry.entries()) {
-    if (registry.nodes && registry.nodes.has(nodeId)) {
-      return nodes.find(n => n.id === parentId);
-    }
+  const parentId = getExpansionParentId(nodeId);
+  if (parentId !== undefined) {
+    return nodeById.get(parentId);
   }
 
   // For indirect interactors loaded in initial graph: check link data for upstream_interactor
-  const indirectLink = links.find(l => {
-    const target = (l.target && l.target.id) ? l.target.id : l.target;
-    return target === nodeId && (
-      (l.data?.interaction_type || l.data?.type || 'direct') === 'indirect' ||
-      l.data?.upstream_interactor
-    );
-  });
+  const indirectLink = getIndirectLinkByTarget(nodeId);
 
   if (indirectLink && indirectLink.data?.upstream_interactor) {
     const upstreamId = indirectLink.data.upstream_interactor;
-    const upstreamNode = nodes.find(n => n.id === upstreamId);
+    const upstreamNode = nodeById.get(upstreamId);
     if (upstreamNode) {
       return upstreamNode;
     }
@@ -4758,6 +5130,74 @@ function findParentNode(nodeId) {
   return null;
 }
 
+/**
+ * Returns the id of the node whose expansion added nodeId, if any.
+ * Memoized in expansionParentOf, which is rebuilt only after an expansion
+ * is registered or collapsed (first registry in insertion order wins).
+ * @param {string} nodeId
+ * @returns {string|undefined}
+ */
+function getExpansionParentId(nodeId) {
+  if (expansionParentOfDirty) {
+    expansionParentOf.clear();
+    for (const [ownerId, registry] of expansionRegistry.entries()) {
+      if (!registry.nodes) continue;
+      registry.nodes.forEach(id => {
+        if (!expansionParentOf.has(id)) expansionParentOf.set(id, ownerId);
+      });
+    }
+    expansionParentOfDirty = false;
+  }
+  return expansionParentOf.get(nodeId);
+}
+
+/**
+ * Returns the first link (in links order) into nodeId that is indirect or
+ * names an upstream_interactor. Memoized in indirectLinkByTarget, rebuilt
+ * only after links are added or removed.
+ * @param {string} nodeId
+ * @returns {object|undefined}
+ */
+function getIndirectLinkByTarget(nodeId) {
+  if (indirectLinkByTargetDirty) {
+    indirectLinkByTarget.clear();
+    for (let i = 0; i < links.length; i++) {
+      const l = links[i];
+      if ((l.data?.interaction_type || l.data?.type || 'direct') !== 'indirect' && !l.data?.upstream_interactor) continue;
+      const target = (l.target && l.target.id) ? l.target.id : l.target;
+      if (!indirectLinkByTarget.has(target)) indirectLinkByTarget.set(target, l);
+    }
+    indirectLinkByTargetDirty = false;
+  }
+  return indirectLinkByTarget.get(nodeId);
+}
+
+/**
+ * Returns every link with nodeId as source or target, in links order.
+ * Memoized in linksByNode, rebuilt only after links are added or removed.
+ * @param {string} nodeId
+ * @returns {object[]}
+ */
+function getNodeLinks(nodeId) {
+  if (linksByNodeDirty) {
+    linksByNode.clear();
+    for (let i = 0; i < links.length; i++) {
+      const l = links[i];
+      const src = (l.source && l.source.id) ? l.source.id : l.source;
+      const tgt = (l.target && l.target.id) ? l.target.id : l.target;
+      let bucket = linksByNode.get(src);
+      if (!bucket) linksByNode.set(src, bucket = []);
+      bucket.push(l);
+      if (tgt === src) continue;
+      bucket = linksByNode.get(tgt);
+      if (!bucket) linksByNode.set(tgt, bucket = []);
+      bucket.push(l);
+    }
+    linksByNodeDirty = false;
+  }
+  return linksByNode.get(nodeId) || [];
+}
+
 /**
  * Gets all children of a node (nodes it expanded)
  * @param {string} nodeId - Parent node ID
@@ -4775,6 +5215,17 @@ function getChildrenNodes(nodeId) {
  * Each cluster is an independent mini force-graph
  */
 
+/**
+ * Returns the main protein node without scanning nodes on every call.
+ * Falls back to a scan if the cached node is no longer in the graph.
+ * @returns {object|null}
+ */
+function getMainNode() {
+  if (mainNodeRef && nodeById.get(mainNodeRef.id) === mainNodeRef) return mainNodeRef;
+  mainNodeRef = nodes.find(n => n.type === 'main') || null;
+  return mainNodeRef;
+}
+
 /**
  * Calculate cluster radius based on member count
  * Uses same formula as buildInitialGraph for consistency
@@ -4798,7 +5249,7 @@ function calculateClusterRadius(memberCount) {
  * @param {number} initialMemberCount - Expected number of members (optional, for radius calculation)
  */
 function createCluster(centerId, position, initialMemberCount = 0) {
-  const centerNode = nodes.find(n => n.id === centerId);
+  const centerNode = nodeById.get(centerId);
   if (!centerNode) return;
 
   const radius = calculateClusterRadius(initialMemberCount);
@@ -4807,10 +5258,12 @@ function createCluster(centerId, position, initialMemberCount = 0) {
     center: centerId,
     centerPos: position,
     members: new Set([centerId]),
+    memberNodes: [],  // Resolved member node objects (center excluded) for forceClusterBounds
     localLinks: new Set(),
     isDragging: false,
     radius: radius  // Dynamic radius based on member count
   });
+  invalidateNodeClusterIndex();
 
   // Fix the center node position
   centerNode.fx = position.x;
@@ -4818,7 +5271,7 @@ function createCluster(centerId, position, initialMemberCount = 0) {
   centerNode.x = position.x;
   centerNode.y = position.y;
 
-  console.log(`Created cluster for ${centerId} at (${position.x}, ${position.y}) with radius ${radius.toFixed(0)}px`);
+  if (DEBUG_GRAPH) console.log(`Created cluster for ${centerId} at (${position.x}, ${position.y}) with radius ${radius.toFixed(0)}px`);
 }
 
 /**
@@ -4829,22 +5282,57 @@ function createCluster(centerId, position, initialMemberCount = 0) {
 function addNodeToCluster(clusterId, nodeId) {
   const cluster = clusters.get(clusterId);
   if (!cluster) return;
+  if (cluster.members.has(nodeId)) return;
 
   cluster.members.add(nodeId);
+  const node = nodeById.get(nodeId);
+  if (node && nodeId !== cluster.center) cluster.memberNodes.push(node);
+  invalidateNodeClusterIndex();
+}
+
+/**
+ * Re-resolves cluster.memberNodes from cluster.members against the current
+ * node set, dropping members that are no longer in the graph
+ */
+function syncClusterMemberNodes() {
+  clusters.forEach(cluster => {
+    const memberNodes = [];
+    cluster.members.forEach(memberId => {
+      if (memberId === cluster.center) return;
+      const member = nodeById.get(memberId);
+      if (member) memberNodes.push(member);
+    });
+    cluster.memberNodes = memberNodes;
+  });
+}
+
+/**
+ * Marks the node -> cluster index stale; call after any change to
+ * clusters or cluster.members
+ */
+function invalidateNodeClusterIndex() {
+  nodeClusterIndexDirty = true;
 }
 
 /**
  * Finds which cluster a node belongs to
+ * Backed by nodeClusterIndex (rebuilt once per membership change) so that
+ * classifying every link does not rescan every cluster.
  * @param {string} nodeId
  * @returns {string|null} - Cluster center ID or null
  */
 function getNodeCluster(nodeId) {
-  for (const [clusterId, cluster] of clusters.entries()) {
-    if (cluster.members.has(nodeId)) {
-      return clusterId;
+  if (nodeClusterIndexDirty) {
+    nodeClusterIndex.clear();
+    for (const [clusterId, cluster] of clusters.entries()) {
+      cluster.members.forEach(memberId => {
+        // First cluster (insertion order) wins, matching a linear scan
+        if (!nodeClusterIndex.has(memberId)) nodeClusterIndex.set(memberId, clusterId);
+      });
     }
+    nodeClusterIndexDirty = false;
   }
-  return null;
+  return nodeClusterIndex.get(nodeId) ?? null;
 }
 
 /**
@@ -4899,19 +5387,70 @@ function getNextClusterPosition(interactorCount = 5) {
   return { x, y };
 }
 
+const LEVEL1_SIBLINGS_KEY = '__level1__';
+const siblingCache = new Map();      // parentId | LEVEL1_SIBLINGS_KEY -> {list, indexById}; cleared per layout pass
+
+/**
+ * Returns the memoized sibling list for an orbit key, building it on first use.
+ * Callers clear siblingCache before each positioning pass so graph edits are seen.
+ * @param {string} key - Parent node id, or LEVEL1_SIBLINGS_KEY for the main orbit
+ * @param {function(): object[]} build - Produces the ordered sibling nodes
+ * @returns {{list: object[], indexById: Map<string, number>}}
+ */
+function getSiblingGroup(key, build) {
+  let group = siblingCache.get(key);
+  if (!group) {
+    const list = build();
+    const indexById = new Map();
+    for (let i = 0; i < list.length; i++) indexById.set(list[i].id, i);
+    group = { list, indexById };
+    siblingCache.set(key, group);
+  }
+  return group;
+}
+
+const orbitTrigTables = new Map();   // slot count -> {cos, sin} for evenly spaced orbit angles
+
+/**
+ * Returns cos/sin of 2*PI*i/count for every slot i on an orbit of `count`
+ * nodes. Tables are kept per count, so re-laying out an orbit whose size did
+ * not change costs no trig calls.
+ * @param {number} count
+ * @returns {{cos: Float64Array, sin: Float64Array}}
+ */
+function getOrbitTrigTable(count) {
+  let table = orbitTrigTables.get(count);
+  if (!table) {
+    const cos = new Float64Array(count);
+    const sin = new Float64Array(count);
+    const slots = Math.max(count, 1);
+    for (let i = 0; i < count; i++) {
+      const angle = (2 * Math.PI * i) / slots;
+      cos[i] = Math.cos(angle);
+      sin[i] = Math.sin(angle);
+    }
+    table = { cos, sin };
+    orbitTrigTables.set(count, table);
+  }
+  return table;
+}
+
 /**
  * Calculates position for a node using orbital rings
  * Each node orbits around its parent in a circle
  * @param {object} node - Node to position
- * @returns {{x: number, y: number}} - Calculated position
+ * @param {{x: number, y: number}} out - Receives the position (may be node itself)
+ * @returns {{x: number, y: number}} - out
  */
-function calculateOrbitalPosition(node) {
+function calculateOrbitalPosition(node, out) {
   const centerX = width / 2;
   const centerY = height / 2;
 
   // Main protein at canvas center
   if (node.type === 'main') {
-    return { x: centerX, y: centerY };
+    out.x = centerX;
+    out.y = centerY;
+    return out;
   }
 
   // Find parent node
@@ -4920,23 +5459,25 @@ function calculateOrbitalPosition(node) {
   // If no parent, this is a level-1 interactor (orbits main protein)
   if (!parent) {
     // Get all level-1 nodes
-    const level1Nodes = nodes.filter(n => {
+    const level1 = getSiblingGroup(LEVEL1_SIBLINGS_KEY, () => nodes.filter(n => {
       const depth = depthMap.get(n.id);
       return n.type === 'interactor' && depth === 1;
-    });
+    }));
+    const level1Nodes = level1.list;
 
-    const nodeIndex = level1Nodes.findIndex(n => n.id === node.id);
+    const nodeIndex = level1.indexById.has(node.id) ? level1.indexById.get(node.id) : -1;
     if (nodeIndex === -1) {
-      console.warn(`Node ${node.id} not found in level-1 list`);
-      return { x: centerX + RADII.level1, y: centerY };
+      if (DEBUG_GRAPH) console.warn(`Node ${node.id} not found in level-1 list`);
+      out.x = centerX + RADII.level1;
+      out.y = centerY;
+      return out;
     }
 
     // Distribute evenly around main protein
-    const angle = (2 * Math.PI * nodeIndex) / Math.max(level1Nodes.length, 1);
-    const x = centerX + Math.cos(angle) * RADII.level1;
-    const y = centerY + Math.sin(angle) * RADII.level1;
-
-    return { x, y };
+    const trig = getOrbitTrigTable(level1Nodes.length);
+    out.x = centerX + trig.cos[nodeIndex] * RADII.level1;
+    out.y = centerY + trig.sin[nodeIndex] * RADII.level1;
+    return out;
   }
 
   // This node has a parent - orbit around the parent
@@ -4944,24 +5485,26 @@ function calculateOrbitalPosition(node) {
   const parentY = parent.y || centerY;
 
   // Get all siblings (nodes with same parent)
-  const siblings = getChildrenNodes(parent.id);
-  const nodeIndex = siblings.findIndex(n => n.id === node.id);
+  const siblingGroup = getSiblingGroup(parent.id, () => getChildrenNodes(parent.id));
+  const siblings = siblingGroup.list;
+  const nodeIndex = siblingGroup.indexById.has(node.id) ? siblingGroup.indexById.get(node.id) : -1;
 
   if (nodeIndex === -1) {
-    console.warn(`Node ${node.id} not found in siblings list`);
-    return { x: parentX + 200, y: parentY };
+    if (DEBUG_GRAPH) console.warn(`Node ${node.id} not found in siblings list`);
+    out.x = parentX + 200;
+    out.y = parentY;
+    return out;
   }
 
   // Distribute evenly around parent
-  const angle = (2 * Math.PI * nodeIndex) / Math.max(siblings.length, 1);
+  const trig = getOrbitTrigTable(siblings.length);
 
   // Use fixed orbital radius (distance from parent)
   const orbitalRadius = 200;
 
-  const x = parentX + Math.cos(angle) * orbitalRadius;
-  const y = parentY + Math.sin(angle) * orbitalRadius;
-
-  return { x, y };
+  out.x = parentX + trig.cos[nodeIndex] * orbitalRadius;
+  out.y = parentY + trig.sin[nodeIndex] * orbitalRadius;
+  return out;
 }
 
 /**
@@ -4969,43 +5512,48 @@ function calculateOrbitalPosition(node) {
  * Enforces orbital ring structure with minimum radius
  */
 function forceClusterBounds(strength = 0.3) {
-  return function force(alpha) {
+  function force(alpha) {
     // For each cluster, maintain bounds for members using cluster-specific radius
     clusters.forEach((cluster, clusterId) => {
-      const centerNode = nodes.find(n => n.id === cluster.center);
+      const centerNode = nodeById.get(cluster.center);
       if (!centerNode) return;
 
       // Use cluster-specific radius (dynamic based on member count)
       const clusterRadius = cluster.radius || CLUSTER_RADIUS; // Fallback to global constant if not set
       const minRadius = clusterRadius * 0.5;  // Minimum distance (40% of radius)
       const maxRadius = clusterRadius;  // Maximum distance (90% of radius)
+      const minR2 = minRadius * minRadius;
+      const maxR2 = maxRadius * maxRadius;
 
       // Use fx/fy if set (center is fixed), otherwise fall back to x/y
       const centerX = Number.isFinite(centerNode.fx) ? centerNode.fx : centerNode.x;
       const centerY = Number.isFinite(centerNode.fy) ? centerNode.fy : centerNode.y;
 
-      // Apply boundary force to cluster members (except center itself)
-      cluster.members.forEach(memberId => {
-        if (memberId === cluster.center) return; // Skip center node
-
-        const member = nodes.find(n => n.id === memberId);
-        if (!member) return;
+      // Apply boundary force to cluster members (center is not in memberNodes)
+      const memberNodes = cluster.memberNodes;
+      for (let i = 0; i < memberNodes.length; i++) {
+        const member = memberNodes[i];
 
         const dx = member.x - centerX;
         const dy = member.y - centerY;
-        const distance = Math.sqrt(dx * dx + dy * dy);
+        const d2 = dx * dx + dy * dy;
 
-        if (distance < 1) {
+        // Settled members sit inside the shell: no sqrt needed to skip them
+        if (d2 >= minR2 && d2 <= maxR2) continue;
+
+        if (d2 < 1) {
           // Node is at center, push it outward in random direction
           const angle = Math.random() * Math.PI * 2;
           member.vx += Math.cos(angle) * alpha * strength * 20;
           member.vy += Math.sin(angle) * alpha * strength * 20;
-          return;
+          continue;
         }
 
+        const distance = Math.sqrt(d2);
+
         // Too close to center - PUSH AWAY STRONGLY
         // Use exponential scaling: closer = much stronger push
-        if (distance < minRadius) {
+        if (d2 < minR2) {
           const proximityRatio = (minRadius - distance) / minRadius; // 0 to 1, higher = closer
           const pushMultiplier = 5 + (proximityRatio * 10); // 5x to 15x based on proximity
           const pushForce = ((minRadius - distance) / distance) * alpha * strength * pushMultiplier;
@@ -5013,14 +5561,22 @@ function forceClusterBounds(strength = 0.3) {
           member.vy += (dy / distance) * pushForce;
         }
         // Too far from center - PULL IN (gentle)
-        else if (distance > maxRadius) {
+        else if (d2 > maxR2) {
           const pullForce = ((distance - maxRadius) / distance) * alpha * strength * 0.8;
           member.vx -= (dx / distance) * pullForce;
           member.vy -= (dy / distance) * pullForce;
         }
-      });
+      }
     });
+  }
+
+  // Node objects can be replaced or dropped between simulation.nodes(...)
+  // calls (expand/collapse), so re-resolve member lists on (re)initialize
+  force.initialize = function() {
+    syncClusterMemberNodes();
   };
+
+  return force;
 }
 
 /**
@@ -5028,29 +5584,46 @@ function forceClusterBounds(strength = 0.3) {
  * Creates visual clustering to show cascade/pathway relationships
  */
 function forceIndirectClustering(strength = 0.2) {
-  return function force(alpha) {
-    nodes.forEach(node => {
-      // Only apply to indirect interactors (those with upstream_interactor field)
-      if (!node.upstream_interactor) return;
+  // (indirect node, upstream node) pairs as parallel arrays, resolved whenever
+  // d3 (re)initializes the force (simulation.nodes(...)) rather than every tick
+  let indirectNodes = [];
+  let upstreamNodes = [];
 
-      // Find the upstream node
-      const upstream = nodes.find(n => n.id === node.upstream_interactor);
-      if (!upstream) return;
+  function force(alpha) {
+    const pull = alpha * strength * 10;
+    for (let i = 0; i < indirectNodes.length; i++) {
+      const node = indirectNodes[i];
+      const upstream = upstreamNodes[i];
 
       // Calculate vector from indirect node to upstream node
       const dx = upstream.x - node.x;
       const dy = upstream.y - node.y;
-      const distance = Math.sqrt(dx * dx + dy * dy);
+      const d2 = dx * dx + dy * dy;
 
-      if (distance < 1) return; // Avoid division by zero
+      if (d2 < 1) continue; // Avoid division by zero
+      const distance = Math.sqrt(d2);
 
       // Apply attractive force toward upstream (gentle pull)
-      const force = alpha * strength;
-      node.vx += (dx / distance) * force * 10;
-      node.vy += (dy / distance) * force * 10;
-    });
-  };
-}
+      node.vx += (dx / distance) * pull;
+      node.vy += (dy / distance) * pull;
+    }
+  }
+
+  force.initialize = function(simNodes) {
+    indirectNodes = [];
+    upstreamNodes = [];
+    simNodes.forEach(node => {
+      // Only apply to indirect interactors (those with upstream_interactor field)
+      if (!node.upstream_interactor) return;
+      const upstream = nodeById.get(node.upstream_interactor);
+      if (!upstream) return;
+      indirectNodes.push(node);
+      upstreamNodes.push(upstream);
+    });
+  };
+
+  return force;
+}
 
 /**
  * Initializes cluster structure and node positions
@@ -5061,6 +5634,7 @@ function initializeClusterLayout() {
 
   // Find main protein
   const mainNode = nodes.find(n => n.type === 'main');
+  mainNodeRef = mainNode || null;
   if (!mainNode) return;
 
   // Count interactors for dynamic radius calculation
@@ -5087,7 +5661,15 @@ function initializeClusterLayout() {
     rootCluster.localLinks.add(link.id);
   });
 
-  console.log(`Initialized cluster layout: 1 cluster with ${nodes.length} nodes, radius ${rootCluster.radius.toFixed(0)}px`);
+  if (DEBUG_GRAPH) console.log(`Initialized cluster layout: 1 cluster with ${nodes.length} nodes, radius ${rootCluster.radius.toFixed(0)}px`);
+}
+
+/**
+ * Charge force for the simulation. The looser theta is fine for a purely
+ * visual layout and visits fewer Barnes-Hut quadtree cells per tick.
+ */
+function makeChargeForce(){
+  return d3.forceManyBody().strength(-20).theta(1.2);
 }
 
 /**
@@ -5099,18 +5681,21 @@ function createSimulation(){
   // Initialize cluster layout and node positions
   initializeClusterLayout();
 
+  // Node radii and bidirectional flags are final once the graph is built
+  links.forEach(l => cacheLinkPathFlags(l));
+
   // Filter links: only intra-cluster links have force
   const intraClusterLinks = links.filter(link => {
     const type = classifyLink(link);
     return type === 'intra-cluster';
   });
 
-  console.log(`Force simulation: ${links.length} total links, ${intraClusterLinks.length} with force`);
+  if (DEBUG_GRAPH) console.log(`Force simulation: ${links.length} total links, ${intraClusterLinks.length} with force`);
 
   // Create force simulation with cluster-local forces (very gentle)
   simulation = d3.forceSimulation(nodes)
     .force('link', d3.forceLink(intraClusterLinks).id(d=>d.id).distance(300).strength(0.1))
-    .force('charge', d3.forceManyBody().strength(-20))
+    .force('charge', makeChargeForce())
     .force('collision', d3.forceCollide().radius(d=>{
       if (d.type==='main') return mainNodeRadius + 15;
       if (d.type==='interactor') return interactorNodeRadius + 10;
@@ -5164,10 +5749,7 @@ function createSimulation(){
       // marker-start shows arrow at source end
       // Use for bidirectional (both ends) only
       if (dir === 'bidirectional') {
-        const a=d.arrow||'binds';
-        if (a==='activates') return 'url(#arrow-activate)';
-        if (a==='inhibits') return 'url(#arrow-inhibit)';
-        return 'url(#arrow-binding)';
+        return ensureArrowMarker(d.arrow||'binds');
       }
       return null;
     })
@@ -5179,10 +5761,7 @@ function createSimulation(){
       // Absolute: a_to_b, b_to_a (used for shared links and database storage)
       if (dir === 'main_to_primary' || dir === 'primary_to_main' || dir === 'bidirectional' ||
           dir === 'a_to_b' || dir === 'b_to_a') {
-        const a=d.arrow||'binds';
-        if (a==='activates') return 'url(#arrow-activate)';
-        if (a==='inhibits') return 'url(#arrow-inhibit)';
-        return 'url(#arrow-binding)';
+        return ensureArrowMarker(d.arrow||'binds');
       }
       return null;
     })
@@ -5203,6 +5782,7 @@ function createSimulation(){
   node.each(function(d){
     const group = d3.select(this);
     if (d.type==='main'){
+      ensureNodeGradient('main');
       group.append('circle')
         .attr('class','node main-node')
         .attr('r', mainNodeRadius)
@@ -5210,6 +5790,7 @@ function createSimulation(){
         .on('click', (ev)=>{ ev.stopPropagation(); handleNodeClick(d); });
       group.append('text').attr('class','node-label main-label').attr('dy',5).text(d.label);
     } else if (d.type==='interactor'){
+      ensureNodeGradient('interactor');
       // Check if this interactor has been expanded (is a cluster center)
       const isExpanded = clusters.has(d.id);
       const isIndirect = d._is_indirect || false;
@@ -5239,45 +5820,112 @@ function createSimulation(){
     }
   });
 
-  // Tick handler - updates positions on every frame
-  simulation.on('tick', ()=>{
-    // Use current selections (updated by updateGraphWithTransitions)
-    if (linkGroup) linkGroup.attr('d', calculateLinkPath);
-    if (nodeGroup) nodeGroup.attr('transform', d=> `translate(${d.x},${d.y})`);
-  });
+  // Tick handler - positions are painted at most once per animation frame
+  simulation.on('tick', scheduleSimulationRender);
 
   // Store selections
   linkGroup = link;
   nodeGroup = node;
 }
 
+let simulationRenderRafId = 0;        // pending requestAnimationFrame for renderSimulationTick
+
+/**
+ * Coalesces simulation ticks into one DOM write per animation frame: d3's
+ * timer can run several ticks per frame (or tick while the tab is hidden),
+ * and only the latest positions need painting.
+ */
+function scheduleSimulationRender(){
+  if (simulationRenderRafId) return;
+  simulationRenderRafId = requestAnimationFrame(() => {
+    simulationRenderRafId = 0;
+    renderSimulationTick();
+  });
+}
+
+/**
+ * Writes current link paths and node positions straight to the DOM.
+ * Bypasses d3's selection.attr wrapper in the per-tick hot loop and rounds
+ * node translations to whole pixels to avoid sub-pixel repaints.
+ */
+function renderSimulationTick(){
+  // Once the layout has settled, alpha decays for many more ticks while every
+  // node moves by a fraction of a pixel; skip those frames entirely (no path
+  // building, no attribute reads) until something moves by half a pixel.
+  if (nodeGroup && !simulationMovedSincePaint(nodeGroup.nodes())) return;
+
+  // Use current selections (updated by updateGraphWithTransitions).
+  // Compare against the current attribute (a cheap, layout-free read) so
+  // links/nodes that did not move (fixed centers, settled regions) cost no
+  // DOM write or style invalidation.
+  if (linkGroup) {
+    const linkEls = linkGroup.nodes();
+    for (let i = 0; i < linkEls.length; i++) {
+      const el = linkEls[i];
+      const path = calculateLinkPath(el.__data__);
+      if (el.getAttribute('d') !== path) el.setAttribute('d', path);
+    }
+  }
+  if (nodeGroup) {
+    const nodeEls = nodeGroup.nodes();
+    for (let i = 0; i < nodeEls.length; i++) {
+      const el = nodeEls[i];
+      const d = el.__data__;
+      const transform = `translate(${Math.round(d.x)},${Math.round(d.y)})`;
+      if (el.getAttribute('transform') !== transform) el.setAttribute('transform', transform);
+      d._paintX = d.x;
+      d._paintY = d.y;
+    }
+  }
+}
+
+/**
+ * True if any node moved at least half a pixel since it was last painted.
+ * Nodes never painted (no _paintX/_paintY yet) always count as moved.
+ * @param {Element[]} nodeEls - Node <g> elements bound to node data
+ * @returns {boolean}
+ */
+function simulationMovedSincePaint(nodeEls){
+  for (let i = 0; i < nodeEls.length; i++) {
+    const d = nodeEls[i].__data__;
+    // Negated form so NaN/undefined comparisons count as movement
+    if (!(Math.abs(d.x - d._paintX) < 0.5 && Math.abs(d.y - d._paintY) < 0.5)) return true;
+  }
+  return false;
+}
+
 // Drag handlers for cluster-aware force simulation
 function dragstarted(ev, d){
-  console.log(`\n========== DRAG START ==========`);
-  console.log(`Dragged node:`, { id: d.id, type: d.type, x: d.x, y: d.y, fx: d.fx, fy: d.fy });
-  console.log(`Total clusters in system:`, clusters.size);
-  console.log(`All cluster centers:`, Array.from(clusters.keys()));
+  if (DEBUG_GRAPH) {
+    console.log(`\n========== DRAG START ==========`);
+    console.log(`Dragged node:`, { id: d.id, type: d.type, x: d.x, y: d.y, fx: d.fx, fy: d.fy });
+    console.log(`Total clusters in system:`, clusters.size);
+    console.log(`All cluster centers:`, Array.from(clusters.keys()));
+  }
 
   if (!ev.active) simulation.alphaTarget(0.3).restart();
 
   // Check if this is a cluster center
   const cluster = clusters.get(d.id);
-  console.log(`\n🔍 CLUSTER LOOKUP for '${d.id}':`, cluster ? '✅ FOUND' : '❌ NOT FOUND');
-
-  if (cluster) {
-    console.log(`📊 CLUSTER DATA:`, {
-      center: cluster.center,
-      memberCount: cluster.members.size,
-      members: Array.from(cluster.members),
-      isDragging: cluster.isDragging,
-      centerPos: cluster.centerPos
-    });
+  if (DEBUG_GRAPH) {
+    console.log(`\n🔍 CLUSTER LOOKUP for '${d.id}':`, cluster ? '✅ FOUND' : '❌ NOT FOUND');
+    if (cluster) {
+      console.log(`📊 CLUSTER DATA:`, {
+        center: cluster.center,
+        memberCount: cluster.members.size,
+        members: Array.from(cluster.members),
+        isDragging: cluster.isDragging,
+        centerPos: cluster.centerPos
+      });
+    }
   }
 
   if (cluster) {
-    console.log(`✓ CLUSTER CENTER DRAG DETECTED`);
-    console.log(`  Cluster members:`, Array.from(cluster.members));
-    console.log(`  Cluster center pos:`, cluster.centerPos);
+    if (DEBUG_GRAPH) {
+      console.log(`✓ CLUSTER CENTER DRAG DETECTED`);
+      console.log(`  Cluster members:`, Array.from(cluster.members));
+      console.log(`  Cluster center pos:`, cluster.centerPos);
+    }
 
     // Mark cluster as being dragged
     cluster.isDragging = true;
@@ -5286,46 +5934,49 @@ function dragstarted(ev, d){
     const startX = Number.isFinite(d.x) ? d.x : (d.fx || 0);
     const startY = Number.isFinite(d.y) ? d.y : (d.fy || 0);
     cluster.dragStartPos = { x: startX, y: startY };
-    console.log(`  Drag start position:`, cluster.dragStartPos);
-
-    // Store initial positions of all members
-    cluster.memberStartPos = new Map();
-    let fixedCount = 0;
-    let notFoundCount = 0;
+    if (DEBUG_GRAPH) console.log(`  Drag start position:`, cluster.dragStartPos);
+
+    // Pin the center, then store initial positions of all members in typed
+    // arrays index-aligned with cluster.memberNodes (center excluded), so
+    // dragged() does no per-member lookups or allocations
+    d.fx = startX;
+    d.fy = startY;
+
+    // Keep this array (not cluster.memberNodes, which a re-sync may replace
+    // mid-drag) so indices stay aligned with the start positions
+    const memberNodes = cluster.memberNodes;
+    const memberCount = memberNodes.length;
+    cluster.dragMemberNodes = memberNodes;
+    cluster.memberStartX = new Float64Array(memberCount);
+    cluster.memberStartY = new Float64Array(memberCount);
     let invalidPosCount = 0;
 
-    cluster.members.forEach(memberId => {
-      const member = nodes.find(n => n.id === memberId);
-      if (!member) {
-        console.log(`  ✗ Member '${memberId}' NOT FOUND in nodes array`);
-        notFoundCount++;
-        return;
-      }
-
+    for (let i = 0; i < memberCount; i++) {
+      const member = memberNodes[i];
       const memberX = Number.isFinite(member.x) ? member.x : 0;
       const memberY = Number.isFinite(member.y) ? member.y : 0;
 
       if (memberX === 0 && memberY === 0) {
-        console.log(`  ⚠ Member '${memberId}' has (0,0) position`);
+        if (DEBUG_GRAPH) console.log(`  ⚠ Member '${member.id}' has (0,0) position`);
         invalidPosCount++;
       }
 
-      cluster.memberStartPos.set(memberId, { x: memberX, y: memberY });
+      cluster.memberStartX[i] = memberX;
+      cluster.memberStartY[i] = memberY;
       member.fx = memberX;
       member.fy = memberY;
-      fixedCount++;
 
-      console.log(`  ✓ Member '${memberId}': pos (${memberX.toFixed(1)}, ${memberY.toFixed(1)}) -> FIXED`);
-    });
+      if (DEBUG_GRAPH) console.log(`  ✓ Member '${member.id}': pos (${memberX.toFixed(1)}, ${memberY.toFixed(1)}) -> FIXED`);
+    }
 
-    console.log(`  Summary: ${fixedCount} fixed, ${notFoundCount} not found, ${invalidPosCount} invalid`);
+    if (DEBUG_GRAPH) console.log(`  Summary: ${memberCount} fixed, ${invalidPosCount} invalid`);
   } else {
-    console.log(`✓ REGULAR NODE DRAG`);
+    if (DEBUG_GRAPH) console.log(`✓ REGULAR NODE DRAG`);
     d.fx = d.x;
     d.fy = d.y;
   }
 
-  console.log(`================================\n`);
+  if (DEBUG_GRAPH) console.log(`================================\n`);
 }
 
 function dragged(ev, d){
@@ -5337,60 +5988,43 @@ function dragged(ev, d){
     const dx = ev.x - cluster.dragStartPos.x;
     const dy = ev.y - cluster.dragStartPos.y;
 
-    // Move all cluster members together
-    let movedCount = 0;
-    let notFoundCount = 0;
-    let noStartPosCount = 0;
-    const movedNodes = [];
-
-    cluster.members.forEach(memberId => {
-      const member = nodes.find(n => n.id === memberId);
-      if (!member) {
-        notFoundCount++;
-        console.warn(`  [DRAG] Member '${memberId}' not found in nodes array!`);
-        return;
-      }
-
-      const startPos = cluster.memberStartPos.get(memberId);
-      if (!startPos) {
-        noStartPosCount++;
-        console.warn(`  [DRAG] No start pos for '${memberId}'`);
-        return;
-      }
-
-      if (!Number.isFinite(startPos.x) || !Number.isFinite(startPos.y)) {
-        console.warn(`  [DRAG] Invalid start pos for '${memberId}':`, startPos);
-        return;
-      }
-
-      const newX = startPos.x + dx;
-      const newY = startPos.y + dy;
+    // Move the center and all cluster members together
+    d.fx = ev.x;
+    d.fy = ev.y;
+    d.x = ev.x;
+    d.y = ev.y;
+
+    const memberNodes = cluster.dragMemberNodes;
+    const startX = cluster.memberStartX;
+    const startY = cluster.memberStartY;
+    // Members appended mid-drag (expansion) have no start position; leave them
+    const movedCount = Math.min(memberNodes.length, startX.length);
+    for (let i = 0; i < movedCount; i++) {
+      const member = memberNodes[i];
+      const newX = startX[i] + dx;
+      const newY = startY[i] + dy;
 
       member.fx = newX;
       member.fy = newY;
       member.x = newX;
       member.y = newY;
-      movedCount++;
-      movedNodes.push(memberId);
-    });
+    }
 
     // Update cluster center position
     cluster.centerPos = { x: ev.x, y: ev.y };
 
     // Log every 10 drag events to see what's moving
-    if (!cluster._dragCounter) cluster._dragCounter = 0;
-    cluster._dragCounter++;
-    if (cluster._dragCounter === 1 || cluster._dragCounter % 10 === 0) {
-      console.log(`\n🎯 [DRAG] Dragging cluster '${d.id}'`);
-      console.log(`  - Offset: (${dx.toFixed(0)}, ${dy.toFixed(0)})`);
-      console.log(`  - Moved ${movedCount}/${cluster.members.size} members`);
-      console.log(`  - Moved nodes:`, movedNodes.slice(0, 5), movedNodes.length > 5 ? `... +${movedNodes.length - 5} more` : '');
-      if (notFoundCount > 0 || noStartPosCount > 0) {
-        console.warn(`  - Issues: ${notFoundCount} not found, ${noStartPosCount} no start pos`);
+    if (DEBUG_GRAPH) {
+      if (!cluster._dragCounter) cluster._dragCounter = 0;
+      cluster._dragCounter++;
+      if (cluster._dragCounter === 1 || cluster._dragCounter % 10 === 0) {
+        console.log(`\n🎯 [DRAG] Dragging cluster '${d.id}'`);
+        console.log(`  - Offset: (${dx.toFixed(0)}, ${dy.toFixed(0)})`);
+        console.log(`  - Moved ${movedCount}/${memberNodes.length} members`);
       }
     }
   } else if (cluster) {
-    console.log(`[DRAG] Cluster found but isDragging=false for ${d.id}`);
+    if (DEBUG_GRAPH) console.log(`[DRAG] Cluster found but isDragging=false for ${d.id}`);
     d.fx = ev.x;
     d.fy = ev.y;
   } else {
@@ -5406,7 +6040,7 @@ function dragended(ev, d){
   // Check if this is a cluster center
   const cluster = clusters.get(d.id);
   if (cluster && cluster.isDragging) {
-    console.log(`[DRAG END] Cluster ${d.id} - releasing members`);
+    if (DEBUG_GRAPH) console.log(`[DRAG END] Cluster ${d.id} - releasing members`);
 
     cluster.isDragging = false;
     cluster._dragCounter = 0; // Reset counter
@@ -5419,7 +6053,7 @@ function dragended(ev, d){
     let releasedCount = 0;
     cluster.members.forEach(memberId => {
       if (memberId !== d.id) { // Don't release the center itself
-        const member = nodes.find(n => n.id === memberId);
+        const member = nodeById.get(memberId);
         if (member) {
           member.fx = null;
           member.fy = null;
@@ -5431,7 +6065,7 @@ function dragended(ev, d){
     // Update cluster center position
     cluster.centerPos = { x: ev.x, y: ev.y };
 
-    console.log(`[DRAG END] Released ${releasedCount} members, reheating simulation`);
+    if (DEBUG_GRAPH) console.log(`[DRAG END] Released ${releasedCount} members, reheating simulation`);
 
     // Reheat simulation to settle members in new position
     reheatSimulation(0.2);
@@ -5445,18 +6079,49 @@ function dragended(ev, d){
 }
 
 /**
- * Calculates SVG path for a link (shared between render and update)
+ * Calculates SVG path for a link (shared between render and update).
+ * Dispatches to the path builder picked for the link in cacheLinkPathFlags.
  */
 function calculateLinkPath(d) {
   // Get source/target positions (handle both object and id references)
-  const sourceNode = typeof d.source === 'object' ? d.source : nodes.find(n => n.id === d.source);
-  const targetNode = typeof d.target === 'object' ? d.target : nodes.find(n => n.id === d.target);
+  const sourceNode = typeof d.source === 'object' ? d.source : nodeById.get(d.source);
+  const targetNode = typeof d.target === 'object' ? d.target : nodeById.get(d.target);
 
   if (!sourceNode || !targetNode) {
-    console.warn('Link missing source or target:', d);
+    if (DEBUG_GRAPH) console.warn('Link missing source or target:', d);
     return 'M 0 0'; // Empty path
   }
 
+  // Links added after createSimulation (expansions) get their flags on first draw
+  if (d._pathFn === undefined) cacheLinkPathFlags(d, sourceNode, targetNode);
+
+  // Reuse the last path while both endpoints (and, for shared links that
+  // curve around it, the main node) are where they were when it was built.
+  // Fixed cluster centers and settled regions hit this on most ticks.
+  const mainNode = d._isShared ? getMainNode() : null;
+  const mx = mainNode ? mainNode.x : 0;
+  const my = mainNode ? mainNode.y : 0;
+  if (d._path !== undefined &&
+      d._pathSX === sourceNode.x && d._pathSY === sourceNode.y &&
+      d._pathTX === targetNode.x && d._pathTY === targetNode.y &&
+      d._pathMX === mx && d._pathMY === my) {
+    return d._path;
+  }
+
+  d._path = d._pathFn(d, sourceNode, targetNode);
+  d._pathSX = sourceNode.x;
+  d._pathSY = sourceNode.y;
+  d._pathTX = targetNode.x;
+  d._pathTY = targetNode.y;
+  d._pathMX = mx;
+  d._pathMY = my;
+  return d._path;
+}
+
+/**
+ * Straight line for unidirectional links, trimmed to the node edges
+ */
+function pathStraight(d, sourceNode, targetNode) {
   const sx = sourceNode.x || 0;
   const sy = sourceNode.y || 0;
   const tx = targetNode.x || 0;
@@ -5466,112 +6131,395 @@ function calculateLinkPath(d) {
   const dy = ty - sy;
   const dist = Math.max(1e-6, Math.sqrt(dx * dx + dy * dy));
 
-  // Calculate node radii for edge offset
-  const rS = sourceNode.type === 'main' ? mainNodeRadius : (sourceNode.type === 'interactor' ? interactorNodeRadius : 0);
-  const rT = targetNode.type === 'main' ? mainNodeRadius : (targetNode.type === 'interactor' ? interactorNodeRadius : 0);
+  const x1 = sx + (dx / dist) * d._rS;
+  const y1 = sy + (dy / dist) * d._rS;
+  const x2 = tx - (dx / dist) * d._rT;
+  const y2 = ty - (dy / dist) * d._rT;
 
-  // Calculate offset for bidirectional links
-  let offset = 0;
-  if (d.isBidirectional && d.type === 'interaction') {
-    offset = d.linkOffset === 0 ? -10 : 10;
-  }
+  return `M ${roundPathCoord(x1)} ${roundPathCoord(y1)} L ${roundPathCoord(x2)} ${roundPathCoord(y2)}`;
+}
+
+/**
+ * Gentle curve for one half of a bidirectional pair: the whole link is
+ * shifted by a perpendicular offset so the two directions do not overlap
+ */
+function pathBidirectional(d, sourceNode, targetNode) {
+  const sx = sourceNode.x || 0;
+  const sy = sourceNode.y || 0;
+  const tx = targetNode.x || 0;
+  const ty = targetNode.y || 0;
+
+  const dx = tx - sx;
+  const dy = ty - sy;
+  const dist = Math.max(1e-6, Math.sqrt(dx * dx + dy * dy));
 
   // Calculate perpendicular offset
-  const perpX = -dy / dist * offset;
-  const perpY = dx / dist * offset;
+  const perpX = -dy / dist * d._curveOffset;
+  const perpY = dx / dist * d._curveOffset;
 
   // Calculate start/end points (offset from node centers)
-  const x1 = sx + (dx / dist) * rS + perpX;
-  const y1 = sy + (dy / dist) * rS + perpY;
-  const x2 = tx - (dx / dist) * rT + perpX;
-  const y2 = ty - (dy / dist) * rT + perpY;
-
-  // Check if this is a shared link (interactor-to-interactor)
-  const isShared = (d.data && d.data._is_shared_link) || d.interactionType === 'shared' || d.interactionType === 'cross_link';
-
-  // Use curved path for bidirectional or shared links
-  if ((d.isBidirectional && d.type === 'interaction') || isShared) {
-    const midX = (x1 + x2) / 2;
-    const midY = (y1 + y2) / 2;
-
-    let curveX, curveY;
-
-    // SHARED LINKS: Curve outward around the ring (away from center)
-    if (isShared) {
-      // Get center position (main protein node)
-      const mainNode = nodes.find(n => n.type === 'main');
-      const centerX = mainNode?.x || width / 2;
-      const centerY = mainNode?.y || height / 2;
-
-      // Calculate vector from center to midpoint (points outward)
-      const toMidX = midX - centerX;
-      const toMidY = midY - centerY;
-      const toMidDist = Math.max(1e-6, Math.sqrt(toMidX * toMidX + toMidY * toMidY));
-
-      // Calculate curve offset: base (clears main node) + scaled by link length
-      // Longer links (opposite interactors) get more prominent curves
-      const baseOffset = 160;  // Clears main node (72px) + larger margin for 750px ring
-      const linkLengthFactor = Math.min(dist / 300, 1.8);  // Cap at 1.8x
-      const totalOffset = baseOffset + (linkLengthFactor * 60);
-
-      // Push control point outward from center
-      const outwardX = (toMidX / toMidDist) * totalOffset;
-      const outwardY = (toMidY / toMidDist) * totalOffset;
-      curveX = midX + outwardX;
-      curveY = midY + outwardY;
-    } else {
-      // BIDIRECTIONAL (non-shared): Use perpendicular offset for gentle curve
-      curveX = midX + perpX;
-      curveY = midY + perpY;
-    }
+  const x1 = sx + (dx / dist) * d._rS + perpX;
+  const y1 = sy + (dy / dist) * d._rS + perpY;
+  const x2 = tx - (dx / dist) * d._rT + perpX;
+  const y2 = ty - (dy / dist) * d._rT + perpY;
 
-    return `M ${x1} ${y1} Q ${curveX} ${curveY} ${x2} ${y2}`;
-  }
+  const curveX = (x1 + x2) / 2 + perpX;
+  const curveY = (y1 + y2) / 2 + perpY;
+
+  return `M ${roundPathCoord(x1)} ${roundPathCoord(y1)} Q ${roundPathCoord(curveX)} ${roundPathCoord(curveY)} ${roundPathCoord(x2)} ${roundPathCoord(y2)}`;
+}
+
+/**
+ * Shared (interactor-to-interactor) links curve outward around the ring,
+ * away from the main protein. Bidirectional shared links keep their offset.
+ */
+function pathSharedCurve(d, sourceNode, targetNode) {
+  const sx = sourceNode.x || 0;
+  const sy = sourceNode.y || 0;
+  const tx = targetNode.x || 0;
+  const ty = targetNode.y || 0;
+
+  const dx = tx - sx;
+  const dy = ty - sy;
+  const dist = Math.max(1e-6, Math.sqrt(dx * dx + dy * dy));
+
+  // Perpendicular offset (zero unless the link is half of a bidirectional pair)
+  const perpX = -dy / dist * d._curveOffset;
+  const perpY = dx / dist * d._curveOffset;
+
+  const x1 = sx + (dx / dist) * d._rS + perpX;
+  const y1 = sy + (dy / dist) * d._rS + perpY;
+  const x2 = tx - (dx / dist) * d._rT + perpX;
+  const y2 = ty - (dy / dist) * d._rT + perpY;
+
+  const midX = (x1 + x2) / 2;
+  const midY = (y1 + y2) / 2;
+
+  // Get center position (main protein node)
+  const mainNode = getMainNode();
+  const centerX = mainNode?.x || width / 2;
+  const centerY = mainNode?.y || height / 2;
 
-  // Straight line for unidirectional links
-  return `M ${x1} ${y1} L ${x2} ${y2}`;
+  // Calculate vector from center to midpoint (points outward)
+  const toMidX = midX - centerX;
+  const toMidY = midY - centerY;
+  const toMidDist = Math.max(1e-6, Math.sqrt(toMidX * toMidX + toMidY * toMidY));
+
+  // Calculate curve offset: base (clears main node) + scaled by link length
+  // Longer links (opposite interactors) get more prominent curves
+  const baseOffset = 160;  // Clears main node (72px) + larger margin for 750px ring
+  const linkLengthFactor = Math.min(dist / 300, 1.8);  // Cap at 1.8x
+  const totalOffset = baseOffset + (linkLengthFactor * 60);
+
+  // Push control point outward from center
+  const curveX = midX + (toMidX / toMidDist) * totalOffset;
+  const curveY = midY + (toMidY / toMidDist) * totalOffset;
+
+  return `M ${roundPathCoord(x1)} ${roundPathCoord(y1)} Q ${roundPathCoord(curveX)} ${roundPathCoord(curveY)} ${roundPathCoord(x2)} ${roundPathCoord(y2)}`;
 }
 
 /**
- * Updates all link paths based on current node positions
+ * Caches the link properties the path builders read every tick, so the tick
+ * does not re-walk d.data / interactionType / node types per link per frame
+ * @param {object} link
+ * @param {object} [sourceNode] - Resolved source node (defaults to link.source)
+ * @param {object} [targetNode] - Resolved target node (defaults to link.target)
  */
-function updateLinkPaths(linkSelection) {
-  linkSelection.attr('d', calculateLinkPath);
+function cacheLinkPathFlags(link, sourceNode, targetNode) {
+  const src = sourceNode || (typeof link.source === 'object' ? link.source : nodeById.get(link.source));
+  const tgt = targetNode || (typeof link.target === 'object' ? link.target : nodeById.get(link.target));
+  const nodeRadius = n => !n ? 0 : n.type === 'main' ? mainNodeRadius : (n.type === 'interactor' ? interactorNodeRadius : 0);
+
+  link._isShared = !!((link.data && link.data._is_shared_link) || link.interactionType === 'shared' || link.interactionType === 'cross_link');
+  link._isBidirectional = !!(link.isBidirectional && link.type === 'interaction');
+  link._curveOffset = link._isBidirectional ? (link.linkOffset === 0 ? -10 : 10) : 0;
+  link._rS = nodeRadius(src);
+  link._rT = nodeRadius(tgt);
+  // Link kind never changes after creation, so pick its path builder once
+  link._pathFn = link._isShared ? pathSharedCurve : (link._isBidirectional ? pathBidirectional : pathStraight);
+  link._path = undefined; // radii may have changed; drop any memoized path
 }
 
-// Drag handlers removed - static layout with fixed positions
-// User can zoom/pan the entire graph, but nodes don't move individually
+/**
+ * Rounds a path coordinate to 0.1px: visually identical, but yields much
+ * shorter path strings and lets unchanged links be detected by string compare
+ */
+function roundPathCoord(v) {
+  return Math.round(v * 10) / 10;
+}
 
 /* ===============================================================
    MODAL SYSTEM
    =============================================================== */
 
+// The modal markup precedes this script, so the elements can be resolved once
+const MODAL_EL = document.getElementById('modal');
+const MODAL_TITLE = document.getElementById('modalTitle');
+const MODAL_BODY = document.getElementById('modalBody');
+
+/**
+ * Shows the modal. bodyHTML may be an HTML string or an already-built DOM
+ * node / DocumentFragment, which is swapped in without a serialize/parse trip.
+ * Titles without markup or entities are set as text, skipping the HTML parser.
+ */
 function openModal(titleHTML, bodyHTML){
-  document.getElementById('modalTitle').innerHTML = titleHTML;
-  document.getElementById('modalBody').innerHTML = bodyHTML;
-  document.getElementById('modal').classList.add('active');
-
-  // Wire up expandable function rows after modal opens
-  setTimeout(() => {
-    document.querySelectorAll('.function-expandable-row').forEach(row => {
-      const header = row.querySelector('.function-row-header');
-      if (header) {
-        header.addEventListener('click', () => {
-          row.classList.toggle('expanded');
-        });
-      }
-    });
-  }, 100);
+  if (titleHTML.indexOf('<') < 0 && titleHTML.indexOf('&') < 0) {
+    MODAL_TITLE.textContent = titleHTML;
+  } else {
+    MODAL_TITLE.innerHTML = titleHTML;
+  }
+  if (bodyHTML instanceof Node) {
+    MODAL_BODY.replaceChildren(bodyHTML);
+  } else {
+    MODAL_BODY.innerHTML = bodyHTML;
+  }
+  // Rows rendered for this body become the ones that can be expanded
+  activeFunctionRows = pendingFunctionRows;
+  pendingFunctionRows = new Map();
+  if (lazySectionObserver) {
+    lazySectionObserver.disconnect();
+    lazySectionObserver = null;
+  }
+  MODAL_EL.classList.add('active');
+}
+
+// Function rows rendered since the last openModal (pending) and those of the
+// modal on screen (active): rowId -> {fn, ctx} for building details lazily
+let pendingFunctionRows = new Map();
+let activeFunctionRows = new Map();
+let nextFunctionRowId = 0;
+
+// Aggregated modal: sections after this many get their body rendered only
+// when scrolled near (observeLazySections); the observer lives until the
+// next openModal
+const LAZY_SECTION_EAGER_COUNT = 8;
+let lazySectionObserver = null;
+
+// Modal footer buttons: data-action -> handler, called with data-protein-id
+const MODAL_ACTIONS = new Map([
+  ['query', handleQueryFromModal],
+  ['expand', handleExpandFromModal],
+  ['collapse', handleCollapseFromModal]
+]);
+
+// Expandable function rows and footer actions: one delegated listener for
+// every modal body, instead of wiring each element after the HTML is injected
+MODAL_BODY.addEventListener('click', (e) => {
+  const actionBtn = e.target.closest('[data-action]');
+  if (actionBtn && MODAL_BODY.contains(actionBtn)) {
+    const handler = MODAL_ACTIONS.get(actionBtn.dataset.action);
+    if (handler) handler(actionBtn.dataset.proteinId);
+    return;
+  }
+
+  const header = e.target.closest('.function-row-header');
+  if (!header || !MODAL_BODY.contains(header)) return;
+  const row = header.closest('.function-expandable-row');
+  if (!row) return;
+  if (row.dataset.fnRow !== undefined) renderLazyFunctionRow(row);
+  row.classList.toggle('expanded');
+});
+
+/**
+ * Fills a function row's expanded content the first time it is opened, so
+ * modals only pay for the details the user actually looks at.
+ * @param {HTMLElement} row - .function-expandable-row carrying data-fn-row
+ */
+function renderLazyFunctionRow(row){
+  const rowId = Number(row.dataset.fnRow);
+  delete row.dataset.fnRow;
+  const entry = activeFunctionRows.get(rowId);
+  const content = row.querySelector(':scope > .function-expanded-content');
+  if (!entry || !content) return;
+  activeFunctionRows.delete(rowId);
+  content.innerHTML = renderFunctionRowDetails(entry.fn, entry.ctx);
+}
+
+/**
+ * Fills the deferred interaction-section bodies of the open aggregated modal
+ * as they approach the visible part of its scroll area.
+ * @param {Array<function(): string>} renderers - Indexed by data-lazy-section
+ */
+function observeLazySections(renderers){
+  const bodies = MODAL_BODY.querySelectorAll('.interaction-section-body[data-lazy-section]');
+  const hydrate = (el) => {
+    const render = renderers[Number(el.dataset.lazySection)];
+    delete el.dataset.lazySection;
+    if (!render) return;
+    el.innerHTML = render();
+    // Function rows rendered after openModal join the open modal's rows
+    pendingFunctionRows.forEach((entry, rowId) => activeFunctionRows.set(rowId, entry));
+    pendingFunctionRows.clear();
+  };
+
+  if (typeof IntersectionObserver === 'undefined') {
+    bodies.forEach(hydrate);
+    return;
+  }
+  lazySectionObserver = new IntersectionObserver((entries, observer) => {
+    for (const entry of entries) {
+      if (!entry.isIntersecting) continue;
+      observer.unobserve(entry.target);
+      hydrate(entry.target);
+    }
+  }, { root: MODAL_BODY.querySelector('.aggregated-sections-scroll'), rootMargin: '300px 0px' });
+  bodies.forEach(el => lazySectionObserver.observe(el));
 }
 
 function closeModal(){
-  document.getElementById('modal').classList.remove('active');
+  MODAL_EL.classList.remove('active');
 }
 
-document.getElementById('modal').addEventListener('click', (e)=>{
+MODAL_EL.addEventListener('click', (e)=>{
   if (e.target.id==='modal') closeModal();
 });
 
+// Function rows: per-direction arrow and whether the interactor is the source
+const FUNCTION_DIRECTION_DEFAULT = Object.freeze({ symbol: '→', interactorIsSource: false }); // Main → Interactor
+const FUNCTION_DIRECTION_TABLE = new Map([
+  ['primary_to_main', Object.freeze({ symbol: '→', interactorIsSource: true })],  // Interactor → Main
+  ['bidirectional', Object.freeze({ symbol: '↔', interactorIsSource: false })]    // Main ↔ Interactor
+]);
+
+// Typed arrow markup between chain_with_arrows segments (' → ' otherwise)
+const CHAIN_ARROW_SYMBOLS = new Map([
+  ['activates', ' <span style="color:#059669;font-weight:700;">--&gt;</span> '],
+  ['inhibits', ' <span style="color:#dc2626;font-weight:700;">--|</span> '],
+  ['binds', ' <span style="color:#7c3aed;font-weight:700;">---</span> '],
+  ['complex', ' <span style="color:#f59e0b;font-weight:700;">--=</span> ']
+]);
+
+// Interaction modal title badges (the indirect one wraps the chain path when known)
+const TITLE_BADGE_DIRECT = '<span class="mechanism-badge" style="background: #10b981; color: white; font-size: 10px; padding: 3px 8px; margin-left: 12px;">DIRECT</span>';
+const TITLE_BADGE_SHARED = '<span class="mechanism-badge" style="background: #9333ea; color: white; font-size: 10px; padding: 3px 8px; margin-left: 12px;">SHARED</span>';
+const TITLE_BADGE_MEDIATOR = '<span class="mechanism-badge" style="background: #6366f1; color: white; font-size: 10px; padding: 3px 8px; margin-left: 4px;">MEDIATOR</span>';
+const TITLE_BADGE_INDIRECT_OPEN = '<span class="mechanism-badge" style="background: #f59e0b; color: white; font-size: 10px; padding: 3px 8px; margin-left: 12px;">';
+const TITLE_BADGE_INDIRECT = TITLE_BADGE_INDIRECT_OPEN + 'INDIRECT</span>';
+
+// Aggregated modal: body of an interaction section with no functions
+const EMPTY_FUNCTIONS = Object.freeze([]);
+const SECTION_NO_FUNCTIONS = `
+        <div style="padding: var(--space-4); color: var(--color-text-secondary); font-style: italic;">
+          No functions associated with this interaction.
+        </div>
+      `;
+const SECTION_NO_FUNCTIONS_SHARED = `
+        <div style="padding: var(--space-4); color: var(--color-text-secondary); font-style: italic;">
+          Shared interactions may not include context-specific functions.
+        </div>
+      `;
+
+// Direction-grouped function tags: arrow -> colour, symbol and label; other
+// arrows use the grey default and their own upper-cased name
+const FUNCTION_EFFECT_TAG_DEFAULT = Object.freeze({ color: '#6b7280', symbol: '--=', label: 'COMPLEX' });
+const FUNCTION_EFFECT_TAGS = new Map([
+  ['activates', Object.freeze({ color: '#059669', symbol: '-->', label: 'ACTIVATES' })],
+  ['inhibits', Object.freeze({ color: '#dc2626', symbol: '--|', label: 'INHIBITS' })],
+  ['complex', FUNCTION_EFFECT_TAG_DEFAULT]
+]);
+
+/**
+ * Colour-coded divider above a group of aggregated modal sections; the
+ * per-kind colours live in the .modal-section-divider-<kind> rules.
+ * @param {'direct'|'indirect'|'shared'} kind
+ * @param {number} count - Links in the group
+ * @returns {string} HTML
+ */
+function renderSectionDivider(kind, count){
+  return `<div class="modal-section-divider modal-section-divider-${kind}">
+      <h3>
+        <span class="modal-section-divider-dot"></span>
+        ${kind.toUpperCase()} INTERACTIONS (${count})
+      </h3>
+    </div>`;
+}
+
+// Display order of direction groups in the interaction modal
+const FUNCTION_DIRECTION_ORDER = Object.freeze(['main_to_primary', 'primary_to_main', 'bidirectional']);
+// Static opening of a direction group, up to the source protein name
+const DIRECTION_GROUP_OPEN = '<div style=""><div style=""><span class="detail-interaction">';
+
+// Query-relative direction -> arrow between the displayed source and target ('↔' otherwise)
+const QUERY_DIRECTION_ARROWS = new Map([
+  ['main_to_primary', '→'], ['a_to_b', '→'],
+  ['primary_to_main', '←'], ['b_to_a', '←']
+]);
+
+// functions array -> its deduplicated copy; link function arrays are replaced,
+// never edited in place, so a result stays valid for the array's lifetime
+const dedupedFunctionsCache = new WeakMap();
+const dedupSeenKeys = new Set();  // scratch set reused by deduplicateFunctions
+
+/**
+ * Drops functions repeating an earlier (function, arrow, cellular_process)
+ * triple, keeping first occurrences in order. The key uses the ASCII unit
+ * separator, which cannot appear in the text fields, so values containing
+ * '|' no longer collide. Results are memoized per input array, so reopening
+ * a modal does not rebuild the keys.
+ * @param {object[]} functionArray
+ * @returns {object[]}
+ */
+function deduplicateFunctions(functionArray) {
+  const cached = dedupedFunctionsCache.get(functionArray);
+  if (cached && cached.length === functionArray.length) return cached.out;
+
+  const seen = dedupSeenKeys;
+  seen.clear();  // cleared up front too, in case a previous call threw mid-loop
+  const out = [];
+  for (let i = 0; i < functionArray.length; i++) {
+    const fn = functionArray[i];
+    const key = (fn.function || '') + '\x1f' + (fn.arrow || '') + '\x1f' + (fn.cellular_process || '');
+    if (seen.has(key)) continue;
+    seen.add(key);
+    out.push(fn);
+  }
+  seen.clear();
+  dedupedFunctionsCache.set(functionArray, { length: functionArray.length, out });
+  return out;
+}
+
+// functions array -> first function with chain context (null if none); same
+// lifetime argument as dedupedFunctionsCache
+const firstChainFunctionCache = new WeakMap();
+
+/**
+ * First function in the array whose _context is a chain with a chain list,
+ * used for the INDIRECT chain badge. Memoized per array.
+ * @param {object[]} functionArray
+ * @returns {object|null}
+ */
+function getFirstChainFunction(functionArray) {
+  let found = firstChainFunctionCache.get(functionArray);
+  if (found === undefined) {
+    found = null;
+    for (let i = 0; i < functionArray.length; i++) {
+      const f = functionArray[i];
+      if (f._context && f._context.type === 'chain' && f._context.chain) { found = f; break; }
+    }
+    firstChainFunctionCache.set(functionArray, found);
+  }
+  return found;
+}
+
+/**
+ * Number of distinct arrow values across a link's per-direction arrow lists.
+ * @param {Object<string, string[]>|undefined} arrows - e.g. L.arrows
+ * @returns {number}
+ */
+function uniqueArrowCount(arrows){
+  const seen = new Set();
+  if (!arrows) return 0;
+  for (const key in arrows) {
+    const list = arrows[key];
+    if (Array.isArray(list)) {
+      for (let i = 0; i < list.length; i++) seen.add(list[i]);
+    } else {
+      seen.add(list);
+    }
+  }
+  return seen.size;
+}
+
 /* Helper: Render an expandable function row */
 function renderExpandableFunction(fn, mainProtein, interactorProtein, defaultInteractionEffect){
   const functionName = escapeHtml(fn.function || 'Function');
@@ -5584,23 +6532,10 @@ function renderExpandableFunction(fn, mainProtein, interactorProtein, defaultInt
   // Each function can have its own direction (main_to_primary, primary_to_main, or bidirectional)
   const fnDirection = fn.interaction_direction || fn.direction || 'main_to_primary';
 
-  let sourceProtein, targetProtein, arrowSymbol;
-  if (fnDirection === 'primary_to_main') {
-    // Interactor → Main
-    sourceProtein = interactorProtein;
-    targetProtein = mainProtein;
-    arrowSymbol = '→';
-  } else if (fnDirection === 'bidirectional') {
-    // Main ↔ Interactor
-    sourceProtein = mainProtein;
-    targetProtein = interactorProtein;
-    arrowSymbol = '↔';
-  } else {
-    // Default: main_to_primary (Main → Interactor)
-    sourceProtein = mainProtein;
-    targetProtein = interactorProtein;
-    arrowSymbol = '→';
-  }
+  const dirInfo = FUNCTION_DIRECTION_TABLE.get(fnDirection) || FUNCTION_DIRECTION_DEFAULT;
+  const sourceProtein = dirInfo.interactorIsSource ? interactorProtein : mainProtein;
+  const targetProtein = dirInfo.interactorIsSource ? mainProtein : interactorProtein;
+  const arrowSymbol = dirInfo.symbol;
 
   // NEW: Read interaction_effect from function data (fallback to defaultInteractionEffect for legacy)
   // For chain contexts, prefer specific arrows over generic 'binds'
@@ -5642,37 +6577,115 @@ function renderExpandableFunction(fn, mainProtein, interactorProtein, defaultInt
   if (fn._context) {
     const contextType = fn._context.type || 'direct';
     if (contextType === 'chain') {
-      contextBadge = '<span class="context-badge" style="background: #f59e0b; color: white; font-size: 9px; padding: 2px 6px; border-radius: 3px; margin-left: 6px;">CHAIN CONTEXT</span>';
+      contextBadge = '<span class="context-badge context-chain">CHAIN CONTEXT</span>';
     } else if (contextType === 'direct') {
-      contextBadge = '<span class="context-badge" style="background: #10b981; color: white; font-size: 9px; padding: 2px 6px; border-radius: 3px; margin-left: 6px;">DIRECT PAIR</span>';
+      contextBadge = '<span class="context-badge context-direct">DIRECT PAIR</span>';
     }
   }
 
+  // Build interaction pair display with BOTH badges
+  // Format: [InteractionEffect] Source → Target  ||  FunctionName [FunctionEffect]
+  let interactionDisplay = '';
+  if (sourceProtein && targetProtein && arrowSymbol) {
+    interactionDisplay = `
+      <span class="detail-interaction-with-effect">
+        ${interactionEffectBadge}
+        <span class="detail-interaction">
+          ${escapeHtml(sourceProtein)}
+          <span class="detail-arrow">${arrowSymbol}</span>
+          ${escapeHtml(targetProtein)}
+        </span>
+      </span>
+    `;
+  }
+
+  // Detail sections are built on first expand (see renderLazyFunctionRow)
+  const rowId = nextFunctionRowId++;
+  pendingFunctionRows.set(rowId, {
+    fn,
+    ctx: {
+      functionName, targetProtein, sourceProteinForEffect, fnArrow, interactionEffect,
+      normalizedFunctionArrow, normalizedInteractionEffect, functionArrowText, interactionEffectText
+    }
+  });
+
+  return `
+    <div class="function-expandable-row" data-fn-row="${rowId}">
+      <div class="function-row-header">
+        <div class="function-row-left">
+          <div class="function-expand-icon">▼</div>
+          ${interactionDisplay}
+          <span class="function-separator">||</span>
+          <div class="function-name-with-effect">
+            <div class="function-name-display">${functionName}</div>
+            ${functionEffectBadge}
+          </div>
+          ${contextBadge}
+        </div>
+      </div>
+      <div class="function-expanded-content"></div>
+    </div>
+  `;
+}
+
+// Chain cascade step class per arrowKind() result
+const CHAIN_STEP_CLASS = new Map([
+  ['activates', 'chain-step-activates'],
+  ['inhibits', 'chain-step-inhibits']
+]);
+
+/**
+ * One "source → [arrow] target" row of a chain cascade.
+ * @returns {string} HTML
+ */
+function renderChainCascadeStep(stepSource, stepTarget, stepArrowClass, stepArrow){
+  return `
+            <div class="chain-cascade-step">
+              <span class="chain-cascade-protein">${escapeHtml(stepSource)}</span>
+              <span class="chain-cascade-arrow ${stepArrowClass}">→ [${stepArrow}]</span>
+              <span class="chain-cascade-protein">${escapeHtml(stepTarget)}</span>
+            </div>
+          `;
+}
+
+/**
+ * Builds the expanded detail sections of a function row: effects summary,
+ * chain context, mechanism, effect, cascades, specific effects and evidence.
+ * @param {object} fn - Function entry
+ * @param {object} ctx - Values derived by renderExpandableFunction for this row
+ * @returns {string} HTML
+ */
+function renderFunctionRowDetails(fn, ctx){
+  const {
+    functionName, targetProtein, sourceProteinForEffect, fnArrow, interactionEffect,
+    normalizedFunctionArrow, normalizedInteractionEffect, functionArrowText, interactionEffectText
+  } = ctx;
+
   // Expanded content sections
-  let expandedSections = '';
+  const sections = [];
 
   // Effects Summary Section - Show BOTH interaction and function effects
-  expandedSections += `
-    <div class="function-detail-section section-effects-summary section-highlighted" style="background: var(--color-bg-secondary); border-left: 3px solid var(--color-primary);">
+  sections.push(`
+    <div class="function-detail-section section-effects-summary section-highlighted">
       <div class="function-section-title">🎯 Effects Summary</div>
       <div class="function-section-content">
-        <div style="margin-bottom: 12px;">
-          <div style="font-size: 11px; color: var(--color-text-secondary); margin-bottom: 4px; font-weight: 600; text-transform: uppercase;">Interaction Effect (on protein)</div>
+        <div class="effects-summary-item">
+          <div class="effects-summary-label">Interaction Effect (on protein)</div>
           <div>
-            <span class="detail-effect detail-effect-${normalizedInteractionEffect}" style="font-size: 0.875rem; padding: 0.25rem 0.75rem;">${interactionEffectText}</span>
-            <span style="margin-left: 0.5rem; font-size: 0.875rem; color: var(--color-text-secondary);">${escapeHtml(targetProtein)} is ${toPastTense(interactionEffectText)} by ${escapeHtml(sourceProteinForEffect)}</span>
+            <span class="detail-effect detail-effect-${normalizedInteractionEffect} effect-pill-lg">${interactionEffectText}</span>
+            <span class="effects-summary-text">${escapeHtml(targetProtein)} is ${toPastTense(interactionEffectText)} by ${escapeHtml(sourceProteinForEffect)}</span>
           </div>
         </div>
         <div>
-          <div style="font-size: 11px; color: var(--color-text-secondary); margin-bottom: 4px; font-weight: 600; text-transform: uppercase;">Function Effect (on ${escapeHtml(functionName)})</div>
+          <div class="effects-summary-label">Function Effect (on ${escapeHtml(functionName)})</div>
           <div>
-            <span class="function-effect function-effect-${normalizedFunctionArrow}" style="font-size: 0.875rem; padding: 0.25rem 0.75rem;">${functionArrowText}</span>
-            <span style="margin-left: 0.5rem; font-size: 0.875rem; color: var(--color-text-secondary);">${escapeHtml(functionName)} is ${toPastTense(functionArrowText)} by ${escapeHtml(sourceProteinForEffect)}</span>
+            <span class="function-effect function-effect-${normalizedFunctionArrow} effect-pill-lg">${functionArrowText}</span>
+            <span class="effects-summary-text">${escapeHtml(functionName)} is ${toPastTense(functionArrowText)} by ${escapeHtml(sourceProteinForEffect)}</span>
           </div>
         </div>
       </div>
     </div>
-  `;
+  `);
 
   // Context Section - Show chain information for chain context functions
   if (fn._context && fn._context.type === 'chain' && fn._context.chain) {
@@ -5682,126 +6695,127 @@ function renderExpandableFunction(fn, mainProtein, interactorProtein, defaultInt
       const fullChain = [queryProtein, ...chainArray].map(p => escapeHtml(p)).join(' → ');
 
       // Build Full Chain Cascade breakdown
-      let cascadeHTML = '';
+      const cascadeParts = [];
 
       // Build the cascade by analyzing each step in the chain
       const fullChainArray = [queryProtein, ...chainArray];
 
       if (fullChainArray.length >= 2) {
-        cascadeHTML = '<div style="margin-top: 12px; padding: 12px; background: rgba(245, 158, 11, 0.1); border-radius: 6px;">';
-        cascadeHTML += '<div style="font-size: 12px; font-weight: 600; color: #92400e; margin-bottom: 8px;">⚡ Full Chain Cascade:</div>';
+        cascadeParts.push('<div class="chain-cascade">');
+        cascadeParts.push('<div class="chain-cascade-title">⚡ Full Chain Cascade:</div>');
 
         // For a chain like ATF6 → SREBP2 → HMGCR:
         // 1. ATF6 → SREBP2 [interaction arrow from query context]
         // 2. SREBP2 → HMGCR [THIS function's context shows the direct pair OR chain effect]
         // 3. ATF6 indirectly affects HMGCR via SREBP2
 
-        for (let i = 0; i < fullChainArray.length - 1; i++) {
-          const stepSource = fullChainArray[i];
-          const stepTarget = fullChainArray[i + 1];
-
-          // Try to determine arrow for this step
-          let stepArrow = 'affects';
-          let stepArrowColor = '#6b7280';
-
-          // Last step (direct pair adjacent to target)
-          if (i === fullChainArray.length - 2) {
-            // This is the step involving the target protein
-            // Try to infer direct pair effect from function data hints
-            // Note: Currently the function shows chain effect, not direct pair
-            // This is a limitation we're working around
-            stepArrow = formatArrow(fnArrow);
-            const arrowType = arrowKind(fnArrow, fn.intent, fn.direction);
-            stepArrowColor = arrowType === 'activates' ? '#059669' : arrowType === 'inhibits' ? '#dc2626' : '#7c3aed';
-          } else if (i === 0) {
-            // First step (query → first intermediate)
-            // Try to infer from interaction effect
-            stepArrow = formatArrow(interactionEffect);
-            const arrowType = arrowKind(interactionEffect, fn.intent, fn.direction);
-            stepArrowColor = arrowType === 'activates' ? '#059669' : arrowType === 'inhibits' ? '#dc2626' : '#7c3aed';
-          }
+        // Arrow text/class for the first and last steps come from the values
+        // already derived for this row
+        const lastStepClass = CHAIN_STEP_CLASS.get(normalizedFunctionArrow) || 'chain-step-other';
 
-          cascadeHTML += `
-            <div style="display: flex; align-items: center; margin: 6px 0; font-size: 12px;">
-              <span style="font-weight: 500;">${escapeHtml(stepSource)}</span>
-              <span style="margin: 0 8px; color: ${stepArrowColor}; font-weight: 600;">→ [${stepArrow}]</span>
-              <span style="font-weight: 500;">${escapeHtml(stepTarget)}</span>
-            </div>
-          `;
+        if (fullChainArray.length === 2) {
+          // Single step (query → target directly): the common case, and it
+          // is always the last step, so no per-step branching is needed
+          cascadeParts.push(renderChainCascadeStep(queryProtein, chainArray[0], lastStepClass, functionArrowText));
+        } else {
+          const firstStepClass = CHAIN_STEP_CLASS.get(normalizedInteractionEffect) || 'chain-step-other';
+          const lastStep = fullChainArray.length - 2;
+
+          for (let i = 0; i <= lastStep; i++) {
+            // Try to determine arrow for this step
+            let stepArrow = 'affects';
+            let stepArrowClass = '';
+
+            // Last step (direct pair adjacent to target)
+            if (i === lastStep) {
+              // This is the step involving the target protein
+              // Try to infer direct pair effect from function data hints
+              // Note: Currently the function shows chain effect, not direct pair
+              // This is a limitation we're working around
+              stepArrow = functionArrowText;
+              stepArrowClass = lastStepClass;
+            } else if (i === 0) {
+              // First step (query → first intermediate)
+              // Try to infer from interaction effect
+              stepArrow = interactionEffectText;
+              stepArrowClass = firstStepClass;
+            }
+
+            cascadeParts.push(renderChainCascadeStep(fullChainArray[i], fullChainArray[i + 1], stepArrowClass, stepArrow));
+          }
         }
 
         // Add indirect effect summary
-        const queryEffect = formatArrow(interactionEffect);
-        const pairEffect = formatArrow(fnArrow);
-        const indirectEffect = interactionEffect; // Simplified: query's effect propagates through chain
-
-        cascadeHTML += `
-          <div style="margin-top: 12px; padding-top: 12px; border-top: 1px solid rgba(245, 158, 11, 0.3);">
-            <div style="font-size: 11px; color: #78350f; font-weight: 600; margin-bottom: 4px;">Indirect Effect:</div>
-            <div style="font-size: 12px; color: #92400e;">
-              <strong>${escapeHtml(queryProtein)}</strong> indirectly ${toPastTense(formatArrow(indirectEffect)).toLowerCase()}s
+        // Simplified: query's effect propagates through chain
+        const queryEffect = interactionEffectText;
+
+        cascadeParts.push(`
+          <div class="chain-cascade-summary">
+            <div class="chain-cascade-summary-label">Indirect Effect:</div>
+            <div class="chain-cascade-summary-text">
+              <strong>${escapeHtml(queryProtein)}</strong> indirectly ${toPastTense(queryEffect).toLowerCase()}s
               <strong>${escapeHtml(targetProtein)}</strong> via ${toPastTense(queryEffect).toLowerCase()}ing
               <strong>${escapeHtml(sourceProteinForEffect)}</strong>
             </div>
           </div>
-        `;
+        `);
 
-        cascadeHTML += '</div>';
+        cascadeParts.push('</div>');
       }
 
-      expandedSections += `
-        <div class="function-detail-section" style="background: #fffbeb; border-left: 3px solid #f59e0b;">
+      sections.push(`
+        <div class="function-detail-section section-chain-context">
           <div class="function-section-title">🔗 Chain Context</div>
           <div class="function-section-content">
-            <div style="font-size: 13px; color: #92400e;">
+            <div class="chain-context-pathway">
               This function emerges from the pathway: <strong>${fullChain}</strong>
             </div>
-            <div style="font-size: 11px; color: #78350f; margin-top: 4px; font-style: italic;">
+            <div class="chain-context-note">
               The effects shown represent the compound result of the full cascade.
             </div>
-            ${cascadeHTML}
+            ${cascadeParts.join('')}
           </div>
         </div>
-      `;
+      `);
     }
   }
 
   // Mechanism Section - Shows function effect badge + actual mechanism from cellular_process
   if (fn.cellular_process) {
-    expandedSections += `
+    sections.push(`
       <div class="function-detail-section section-mechanism section-highlighted">
         <div class="function-section-title">⚙️ Mechanism</div>
         <div class="function-section-content">
-          <span class="effect-badge effect-${normalizedFunctionArrow}" style="font-size: 0.875rem; padding: 0.25rem 0.75rem;">${functionArrowText}</span>
-          <span style="margin-left: 0.5rem;">${escapeHtml(fn.cellular_process)}</span>
+          <span class="effect-badge effect-${normalizedFunctionArrow} effect-pill-lg">${functionArrowText}</span>
+          <span class="mechanism-text">${escapeHtml(fn.cellular_process)}</span>
         </div>
       </div>
-    `;
+    `);
   } else {
     // Fallback if cellular_process is missing
-    expandedSections += `
+    sections.push(`
       <div class="function-detail-section section-mechanism section-highlighted">
         <div class="function-section-title">⚙️ Mechanism</div>
         <div class="function-section-content">
-          <span class="effect-badge effect-${normalizedFunctionArrow}" style="font-size: 0.875rem; padding: 0.25rem 0.75rem;">${functionArrowText}</span>
-          <span style="margin-left: 0.5rem; color: var(--color-text-secondary);">
+          <span class="effect-badge effect-${normalizedFunctionArrow} effect-pill-lg">${functionArrowText}</span>
+          <span class="mechanism-text mechanism-text-muted">
             ${fnArrow === 'activates' ? 'Stimulates or enhances activity' :
               fnArrow === 'inhibits' ? 'Suppresses or reduces activity' :
               'Physical association or binding'}
           </span>
         </div>
       </div>
-    `;
+    `);
   }
 
   // Effect Description - color-coded by function arrow type
   if (fn.effect_description) {
-    expandedSections += `
+    sections.push(`
       <div class="function-detail-section section-effect section-highlighted effect-${normalizedFunctionArrow}">
         <div class="function-section-title">💡 Effect</div>
         <div class="function-section-content">${escapeHtml(fn.effect_description)}</div>
       </div>
-    `;
+    `);
   }
 
   // Biological Cascade - MULTI-SCENARIO SUPPORT
@@ -5834,30 +6848,30 @@ function renderExpandableFunction(fn, mainProtein, interactorProtein, defaultInt
         ? `Biological Cascades (${numCascades} scenarios)`
         : 'Biological Cascade';
 
-      expandedSections += `
+      sections.push(`
         <div class="function-detail-section">
           <div class="function-section-title">${title}</div>
           ${cascadesHTML}
         </div>
-      `;
+      `);
     }
   }
 
   // Specific Effects
   if (Array.isArray(fn.specific_effects) && fn.specific_effects.length > 0) {
-    expandedSections += `
+    sections.push(`
       <div class="function-detail-section section-specific-effects section-highlighted">
         <div class="function-section-title">⚡ Specific Effects</div>
-        <ul style="margin: 0; padding-left: 1.5em;">
+        <ul class="function-specific-effects">
           ${fn.specific_effects.map(eff => `<li class="function-section-content">${escapeHtml(eff)}</li>`).join('')}
         </ul>
       </div>
-    `;
+    `);
   }
 
   // Evidence
   if (Array.isArray(fn.evidence) && fn.evidence.length > 0) {
-    expandedSections += `
+    sections.push(`
       <div class="function-detail-section">
         <div class="function-section-title">Evidence & Publications</div>
         ${fn.evidence.map(ev => {
@@ -5880,59 +6894,25 @@ function renderExpandableFunction(fn, mainProtein, interactorProtein, defaultInt
               <div class="evidence-title">${escapeHtml(title)}</div>
               ${meta ? `<div class="evidence-meta">${meta}</div>` : ''}
               ${ev.relevant_quote ? `<div class="evidence-quote">"${escapeHtml(ev.relevant_quote)}"</div>` : ''}
-              ${pmidLinks ? `<div style="margin-top: var(--space-2);">${pmidLinks}</div>` : ''}
+              ${pmidLinks ? `<div class="evidence-links">${pmidLinks}</div>` : ''}
             </div>
           `;
         }).join('')}
       </div>
-    `;
+    `);
   } else if (Array.isArray(fn.pmids) && fn.pmids.length > 0) {
     // Just PMIDs, no full evidence
-    expandedSections += `
+    sections.push(`
       <div class="function-detail-section">
         <div class="function-section-title">References</div>
         <div>
           ${fn.pmids.map(pmid => `<a href="https://pubmed.ncbi.nlm.nih.gov/${escapeHtml(pmid)}" target="_blank" class="pmid-badge">PMID: ${escapeHtml(pmid)}</a>`).join('')}
         </div>
       </div>
-    `;
-  }
-
-  // Build interaction pair display with BOTH badges
-  // Format: [InteractionEffect] Source → Target  ||  FunctionName [FunctionEffect]
-  let interactionDisplay = '';
-  if (sourceProtein && targetProtein && arrowSymbol) {
-    interactionDisplay = `
-      <span class="detail-interaction-with-effect">
-        ${interactionEffectBadge}
-        <span class="detail-interaction">
-          ${escapeHtml(sourceProtein)}
-          <span class="detail-arrow">${arrowSymbol}</span>
-          ${escapeHtml(targetProtein)}
-        </span>
-      </span>
-    `;
+    `);
   }
 
-  return `
-    <div class="function-expandable-row">
-      <div class="function-row-header">
-        <div class="function-row-left">
-          <div class="function-expand-icon">▼</div>
-          ${interactionDisplay}
-          <span class="function-separator" style="margin: 0 8px; color: var(--color-text-secondary);">||</span>
-          <div class="function-name-with-effect">
-            <div class="function-name-display">${functionName}</div>
-            ${functionEffectBadge}
-          </div>
-          ${contextBadge}
-        </div>
-      </div>
-      <div class="function-expanded-content">
-        ${expandedSections || '<div class="function-section-content" style="color: var(--color-text-secondary);">No additional details available</div>'}
-      </div>
-    </div>
-  `;
+  return sections.length ? sections.join('') : '<div class="function-section-content function-section-empty">No additional details available</div>';
 }
 
 function handleLinkClick(ev, d){
@@ -5950,6 +6930,8 @@ function handleLinkClick(ev, d){
    =============================================================== */
 function showInteractionModal(link, clickedNode = null){
   const L = link.data || link;  // Link properties are directly on link object or in data
+  // Fields read repeatedly below
+  const { upstream_interactor: upstreamInteractor, primary, _shared_between: sharedBetween } = L;
 
   // Use semantic source/target (biological direction) instead of D3's geometric source/target
   // Semantic fields preserve the biological meaning, while link.source/target are D3 node references
@@ -5982,8 +6964,7 @@ function showInteractionModal(link, clickedNode = null){
   } else {
     // Direction is QUERY-RELATIVE (main→primary semantics)
     // For direct: use standard query-relative logic
-    if (direction === 'main_to_primary' || direction === 'a_to_b') arrowSymbol = '→';
-    else if (direction === 'primary_to_main' || direction === 'b_to_a') arrowSymbol = '←';
+    arrowSymbol = QUERY_DIRECTION_ARROWS.get(direction) || '↔';
   }
 
   // === BUILD INTERACTION METADATA SECTION ===
@@ -6038,16 +7019,6 @@ function showInteractionModal(link, clickedNode = null){
 
   // === BUILD FUNCTIONS SECTION ===
   // Deduplication helper to remove duplicate function entries
-  function deduplicateFunctions(functionArray) {
-    const seen = new Set();
-    return functionArray.filter(fn => {
-      const key = `${fn.function || ''}|${fn.arrow || ''}|${fn.cellular_process || ''}`;
-      if (seen.has(key)) return false;
-      seen.add(key);
-      return true;
-    });
-  }
-
   const rawFunctions = Array.isArray(L.functions) ? L.functions : [];
   const functions = deduplicateFunctions(rawFunctions);
   let functionsHTML = '';
@@ -6056,21 +7027,6 @@ function showInteractionModal(link, clickedNode = null){
   // IMPORTANT: This shows the effect on the downstream PROTEIN, not individual functions
   // Use the link's arrow field which represents the interaction effect from arrow determination
 
-  const isDarkMode = document.body.classList.contains('dark-mode');
-  const arrowColors = isDarkMode ? {
-    'activates': { bg: '#065f46', text: '#a7f3d0', border: '#047857', label: 'ACTIVATES' },
-    'inhibits': { bg: '#991b1b', text: '#fecaca', border: '#b91c1c', label: 'INHIBITS' },
-    'binds': { bg: '#5b21b6', text: '#ddd6fe', border: '#6d28d9', label: 'BINDS' },
-    'regulates': { bg: '#854d0e', text: '#fef3c7', border: '#a16207', label: 'REGULATES' },
-    'complex': { bg: '#6366f1', text: '#e0e7ff', border: '#4f46e5', label: 'COMPLEX' }
-  } : {
-    'activates': { bg: '#d1fae5', text: '#047857', border: '#059669', label: 'ACTIVATES' },
-    'inhibits': { bg: '#fee2e2', text: '#b91c1c', border: '#dc2626', label: 'INHIBITS' },
-    'binds': { bg: '#ede9fe', text: '#6d28d9', border: '#7c3aed', label: 'BINDS' },
-    'regulates': { bg: '#fef3c7', text: '#a16207', border: '#d97706', label: 'REGULATES' },
-    'complex': { bg: '#e0e7ff', text: '#4f46e5', border: '#6366f1', label: 'COMPLEX' }
-  };
-
   // Get interaction arrow (effect on the downstream protein)
   const interactionArrow = L.arrow || link.arrow || 'binds';
   const normalized = interactionArrow === 'activates' || interactionArrow === 'activate' ? 'activates'
@@ -6090,8 +7046,8 @@ function showInteractionModal(link, clickedNode = null){
         </span>
       </div>
       <div>
-        <span class="interaction-type-badge" style="display: inline-block; padding: 2px 8px; background: ${arrowColors[normalized].bg}; color: ${arrowColors[normalized].text}; border: 1px solid ${arrowColors[normalized].border}; border-radius: 4px; font-size: 10px; font-weight: 600; text-transform: uppercase; letter-spacing: 0.3px; margin-right: 4px; margin-bottom: 4px;">
-          ${arrowColors[normalized].label}
+        <span class="interaction-type-badge itype-spaced itype-${normalized}">
+          ${normalized.toUpperCase()}
         </span>
       </div>
     </div>
@@ -6115,42 +7071,54 @@ function showInteractionModal(link, clickedNode = null){
   if (isSharedInteraction) {
     functionTypeBadge = '<span class="mechanism-badge" style="background: #9333ea; color: white; font-size: 9px; padding: 2px 6px;">SHARED</span>';
   } else if (isIndirectInteraction) {
-    // Build full chain path display for INDIRECT label
-    // Try to extract chain from first function with chain context
-    let chainDisplay = '';
-    const firstChainFunc = functions.find(f => f._context && f._context.type === 'chain' && f._context.chain);
-    if (firstChainFunc && firstChainFunc._context.chain) {
-      chainDisplay = buildFullChainPath(SNAP.main, firstChainFunc._context.chain, L);
-    }
+    // The chain badge only depends on the query protein and this link's
+    // functions, so reopening the same link reuses it
+    if (L._cachedTypeBadge !== undefined && L._cachedTypeBadgeMain === SNAP.main && L._cachedTypeBadgeFns === L.functions) {
+      functionTypeBadge = L._cachedTypeBadge;
+    } else {
+      // Build full chain path display for INDIRECT label
+      // Try to extract chain from first function with chain context
+      let chainDisplay = '';
+      const firstChainFunc = getFirstChainFunction(functions);
+      if (firstChainFunc && firstChainFunc._context.chain) {
+        chainDisplay = buildFullChainPath(SNAP.main, firstChainFunc._context.chain, L);
+      }
+
+      // Fallback: use upstream_interactor if no chain found
+      if (!chainDisplay && upstreamInteractor) {
+        chainDisplay = `${escapeHtml(SNAP.main)} → ${escapeHtml(upstreamInteractor)} → ${escapeHtml(primary)}`;
+      }
 
-    // Fallback: use upstream_interactor if no chain found
-    if (!chainDisplay && L.upstream_interactor) {
-      chainDisplay = `${escapeHtml(SNAP.main)} → ${escapeHtml(L.upstream_interactor)} → ${escapeHtml(L.primary)}`;
-    }
+      functionTypeBadge = chainDisplay
+        ? `<span class="mechanism-badge" style="background: #f59e0b; color: white; font-size: 9px; padding: 2px 6px;">${chainDisplay}</span>`
+        : `<span class="mechanism-badge" style="background: #f59e0b; color: white; font-size: 9px; padding: 2px 6px;">INDIRECT</span>`;
 
-    functionTypeBadge = chainDisplay
-      ? `<span class="mechanism-badge" style="background: #f59e0b; color: white; font-size: 9px; padding: 2px 6px;">${chainDisplay}</span>`
-      : `<span class="mechanism-badge" style="background: #f59e0b; color: white; font-size: 9px; padding: 2px 6px;">INDIRECT</span>`;
+      L._cachedTypeBadge = functionTypeBadge;
+      L._cachedTypeBadgeMain = SNAP.main;
+      L._cachedTypeBadgeFns = L.functions;
+    }
   } else {
     functionTypeBadge = '<span class="mechanism-badge" style="background: #10b981; color: white; font-size: 9px; padding: 2px 6px;">DIRECT</span>';
   }
 
   if (functions.length > 0) {
+    const arrowCount = uniqueArrowCount(L.arrows);
+
     if (isIndirectInteraction) {
       // For indirect interactions: Don't group by direction - show all together
       // Direction is no longer query-relative, so grouping would be confusing
-      const arrows = L.arrows || {};
-      const arrowCount = Object.values(arrows).flat().filter((v, i, a) => a.indexOf(v) === i).length;
 
       functionsHTML = `<div class="modal-functions-header">Functions (${functions.length})${arrowCount > 1 ? ` <span style="background:#f59e0b;color:white;padding:2px 6px;border-radius:10px;font-size:10px;margin-left:8px;">${arrowCount} arrows</span>` : ''}</div>`;
 
-      // Display all functions without direction grouping
-      functionsHTML += `<div style="margin:16px 0;">
-        ${functions.map(f => {
-          const effectArrow = f.arrow || 'complex';
-          return renderExpandableFunction(f, SNAP.main, L.primary, effectArrow);
-        }).join('')}
-      </div>`;
+      // Display all functions without direction grouping; rows are appended
+      // straight onto functionsHTML rather than via an intermediate array
+      functionsHTML += '<div style="margin:16px 0;">';
+      for (let i = 0; i < functions.length; i++) {
+        const f = functions[i];
+        const effectArrow = f.arrow || 'complex';
+        functionsHTML += renderExpandableFunction(f, SNAP.main, primary, effectArrow);
+      }
+      functionsHTML += '</div>';
 
     } else {
       // For direct interactions: Group by INTERACTION DIRECTION
@@ -6162,8 +7130,6 @@ function showInteractionModal(link, clickedNode = null){
       };
       functions.forEach(f => grp[(f.direction || 'main_to_primary')].push(f));
 
-      const arrows = L.arrows || {};
-      const arrowCount = Object.values(arrows).flat().filter((v, i, a) => a.indexOf(v) === i).length;
 
       // Determine protein names for direction labels
       const queryProtein = SNAP.main;
@@ -6171,60 +7137,48 @@ function showInteractionModal(link, clickedNode = null){
 
       functionsHTML = `<div class="modal-functions-header">Functions (${functions.length})${arrowCount > 1 ? ` <span style="background:#f59e0b;color:white;padding:2px 6px;border-radius:10px;font-size:10px;margin-left:8px;">${arrowCount} arrows</span>` : ''}</div>`;
 
-      // Direction labels with arrow symbols based on interaction type
-      const directionConfig = {
-        main_to_primary: {
-          source: queryProtein,
-          target: interactorProtein,
-          arrowSymbol: '→',
-          color: '#3b82f6',  // Blue
-          bg: '#dbeafe'
-        },
-        primary_to_main: {
-          source: interactorProtein,
-          target: queryProtein,
-          arrowSymbol: '→',
-          color: '#9333ea',  // Purple
-          bg: '#f3e8ff'
-        },
-        bidirectional: {
-          source: queryProtein,
-          target: interactorProtein,
-          arrowSymbol: '↔',
-          color: '#059669',  // Green
-          bg: '#d1fae5'
-        }
-      };
-
-      ['main_to_primary', 'primary_to_main', 'bidirectional'].forEach(dir => {
-        if (grp[dir].length) {
-          const config = directionConfig[dir];
-          functionsHTML += `<div style="">
-            <div style="">
-              <span class="detail-interaction">
-                ${escapeHtml(config.source)}
-                <span class="detail-arrow">${config.arrowSymbol}</span>
-                ${escapeHtml(config.target)}
-              </span> (${grp[dir].length})
-            </div>
-            ${grp[dir].map(f => {
-              // Within each direction, show effect type badge
-              const effectArrow = f.arrow || 'complex';
-              const effectColor = effectArrow === 'activates' ? '#059669' : effectArrow === 'inhibits' ? '#dc2626' : '#6b7280';
-              const effectSymbol = effectArrow === 'activates' ? '-->' : effectArrow === 'inhibits' ? '--|' : '--=';
-
-              // Pass main and interactor proteins - let renderExpandableFunction compute direction from fn.interaction_direction
-              return `<div style="">
-                <div style="display:flex;align-items:center;gap:6px;margin-bottom:4px;">
-                  <span style="display:inline-block;padding:2px 6px;background:${effectColor};color:white;border-radius:3px;font-size:9px;font-weight:600;">${effectSymbol} ${effectArrow.toUpperCase()}</span>
-                  <span style="font-weight:600;font-size:11px;">${escapeHtml(f.function || 'Unknown Function')}</span>
+      // Direction headers reuse the per-direction arrow/orientation table;
+      // names are escaped once and only the dynamic pieces are assembled
+      const safeQuery = escapeHtml(queryProtein);
+      const safeInteractor = escapeHtml(interactorProtein);
+      const parts = [];
+
+      for (const dir of FUNCTION_DIRECTION_ORDER) {
+        const group = grp[dir];
+        if (!group.length) continue;
+        const config = FUNCTION_DIRECTION_TABLE.get(dir) || FUNCTION_DIRECTION_DEFAULT;
+
+        // Within each direction, show effect type badge per function
+        let inner = '';
+        for (let i = 0, n = group.length; i < n; i++) {
+          const f = group[i];
+          const effectArrow = f.arrow || 'complex';
+          const tag = FUNCTION_EFFECT_TAGS.get(effectArrow);
+          const effectColor = tag ? tag.color : FUNCTION_EFFECT_TAG_DEFAULT.color;
+          const effectSymbol = tag ? tag.symbol : FUNCTION_EFFECT_TAG_DEFAULT.symbol;
+          const effectLabel = tag ? tag.label : effectArrow.toUpperCase();
+
+          // Pass main and interactor proteins - let renderExpandableFunction compute direction from fn.interaction_direction
+          inner += `<div style="">
+                <div class="function-effect-tag-row">
+                  <span class="function-effect-tag" style="background:${effectColor};">${effectSymbol} ${effectLabel}</span>
+                  <span class="function-effect-tag-name">${escapeHtml(f.function || 'Unknown Function')}</span>
                 </div>
                 ${renderExpandableFunction(f, queryProtein, interactorProtein, effectArrow)}
               </div>`;
-            }).join('')}
-          </div>`;
         }
-      });
+
+        parts.push(
+          DIRECTION_GROUP_OPEN,
+          config.interactorIsSource ? safeInteractor : safeQuery,
+          '<span class="detail-arrow">', config.symbol, '</span>',
+          config.interactorIsSource ? safeQuery : safeInteractor,
+          '</span> (', group.length, ')</div>',
+          inner,
+          '</div>'
+        );
+      }
+      functionsHTML += parts.join('');
     }
   } else {
     const emptyMessage = isSharedInteraction
@@ -6250,8 +7204,8 @@ function showInteractionModal(link, clickedNode = null){
     if (isMainProtein) {
       // Main protein: show single "Find New Interactions" button
       footerHTML = `
-        <div class="modal-footer" style="border-top: 1px solid var(--color-border); padding: 16px; background: var(--color-bg-secondary);">
-          <button onclick="handleQueryFromModal('${clickedProteinId}')" class="btn-primary" style="padding: 8px 20px; background: #10b981; color: white; border: none; border-radius: 6px; font-weight: 500; cursor: pointer; font-size: 14px; font-family: var(--font-sans); transition: background 0.2s;">
+        <div class="modal-footer modal-footer-compact">
+          <button data-action="query" data-protein-id="${escapeHtml(clickedProteinId)}" class="btn-primary modal-btn modal-btn-query">
             Find New Interactions
           </button>
         </div>
@@ -6259,33 +7213,33 @@ function showInteractionModal(link, clickedNode = null){
     } else {
       // Interactor: show conditional Expand + Query buttons
       footerHTML = `
-        <div class="modal-footer" style="border-top: 1px solid var(--color-border); padding: 16px; background: var(--color-bg-secondary);">
-          <div style="display: flex; gap: 12px; align-items: center; flex-wrap: wrap;">
+        <div class="modal-footer modal-footer-compact">
+          <div class="modal-footer-actions">
             ${canExpand && !isExpanded && hasInteractions ? `
-              <button onclick="handleExpandFromModal('${clickedProteinId}')" class="btn-primary" style="padding: 8px 20px; background: #3b82f6; color: white; border: none; border-radius: 6px; font-weight: 500; cursor: pointer; font-size: 14px; font-family: var(--font-sans); transition: background 0.2s;">
+              <button data-action="expand" data-protein-id="${escapeHtml(clickedProteinId)}" class="btn-primary modal-btn modal-btn-expand">
                 Expand
               </button>
             ` : ''}
             ${canExpand && !isExpanded && !hasInteractions ? `
-              <button disabled style="padding: 8px 20px; background: #d1d5db; color: #6b7280; border: none; border-radius: 6px; font-weight: 500; font-size: 14px; cursor: not-allowed; font-family: var(--font-sans);">
+              <button disabled class="modal-btn modal-btn-disabled">
                 Expand (No data)
               </button>
             ` : ''}
             ${isExpanded ? `
-              <button onclick="handleCollapseFromModal('${clickedProteinId}')" class="btn-secondary" style="padding: 8px 20px; background: #ef4444; color: white; border: none; border-radius: 6px; font-weight: 500; cursor: pointer; font-size: 14px; font-family: var(--font-sans); transition: background 0.2s;">
+              <button data-action="collapse" data-protein-id="${escapeHtml(clickedProteinId)}" class="btn-secondary modal-btn modal-btn-collapse">
                 Collapse
               </button>
             ` : ''}
-            <button onclick="handleQueryFromModal('${clickedProteinId}')" class="btn-primary" style="padding: 8px 20px; background: #10b981; color: white; border: none; border-radius: 6px; font-weight: 500; cursor: pointer; font-size: 14px; font-family: var(--font-sans); transition: background 0.2s;">
+            <button data-action="query" data-protein-id="${escapeHtml(clickedProteinId)}" class="btn-primary modal-btn modal-btn-query">
               Query
             </button>
             ${!canExpand && !isExpanded ? `
-              <div style="padding: 8px 20px; background: #f3f4f6; color: #6b7280; border-radius: 6px; font-size: 13px; font-family: var(--font-sans); font-style: italic;">
+              <div class="modal-depth-note">
                 Max depth reached (${MAX_DEPTH})
               </div>
             ` : ''}
           </div>
-          <div style="margin-top: 12px; font-size: 12px; color: var(--color-text-secondary); font-family: var(--font-sans);">
+          <div class="modal-footer-hint">
             Expand uses existing data • Query finds new interactions
           </div>
         </div>
@@ -6302,34 +7256,33 @@ function showInteractionModal(link, clickedNode = null){
 
   // Check if THIS interaction's target is a mediator for OTHER indirect interactions
   // (e.g., KEAP1 is mediator in p62→KEAP1→NRF2)
-  const isMediator = (tgtName === L.upstream_interactor || srcName === L.upstream_interactor);
+  const isMediator = (tgtName === upstreamInteractor || srcName === upstreamInteractor);
 
   let typeBadge = '';
   if (isShared) {
-    typeBadge = '<span class="mechanism-badge" style="background: #9333ea; color: white; font-size: 10px; padding: 3px 8px; margin-left: 12px;">SHARED</span>';
+    typeBadge = TITLE_BADGE_SHARED;
   } else if (isIndirect) {
     // Build full chain path display for INDIRECT label
     // Try to extract chain from first function with chain context
     let chainDisplay = '';
-    const firstChainFunc = functions.find(f => f._context && f._context.type === 'chain' && f._context.chain);
+    const firstChainFunc = getFirstChainFunction(functions);
     if (firstChainFunc && firstChainFunc._context.chain) {
       chainDisplay = buildFullChainPath(SNAP.main, firstChainFunc._context.chain, L);
     }
 
     // Fallback: use upstream_interactor if no chain found
-    if (!chainDisplay && L.upstream_interactor) {
-      chainDisplay = `${escapeHtml(SNAP.main)} → ${escapeHtml(L.upstream_interactor)} → ${escapeHtml(L.primary)}`;
+    if (!chainDisplay && upstreamInteractor) {
+      chainDisplay = `${escapeHtml(SNAP.main)} → ${escapeHtml(upstreamInteractor)} → ${escapeHtml(primary)}`;
     }
 
     typeBadge = chainDisplay
-      ? `<span class="mechanism-badge" style="background: #f59e0b; color: white; font-size: 10px; padding: 3px 8px; margin-left: 12px;">${chainDisplay}</span>`
-      : `<span class="mechanism-badge" style="background: #f59e0b; color: white; font-size: 10px; padding: 3px 8px; margin-left: 12px;">INDIRECT</span>`;
+      ? TITLE_BADGE_INDIRECT_OPEN + chainDisplay + '</span>'
+      : TITLE_BADGE_INDIRECT;
   } else if (isMediator) {
     // This protein is a mediator in indirect chains AND this link is direct
-    typeBadge = `<span class="mechanism-badge" style="background: #10b981; color: white; font-size: 10px; padding: 3px 8px; margin-left: 12px;">DIRECT</span>
-                 <span class="mechanism-badge" style="background: #6366f1; color: white; font-size: 10px; padding: 3px 8px; margin-left: 4px;">MEDIATOR</span>`;
+    typeBadge = TITLE_BADGE_DIRECT + ' ' + TITLE_BADGE_MEDIATOR;
   } else {
-    typeBadge = '<span class="mechanism-badge" style="background: #10b981; color: white; font-size: 10px; padding: 3px 8px; margin-left: 12px;">DIRECT</span>';
+    typeBadge = TITLE_BADGE_DIRECT;
   }
 
   let modalTitle = `
@@ -6349,26 +7302,22 @@ function showInteractionModal(link, clickedNode = null){
       if (chainWithArrows.length > 0) {
         // CRITICAL FIX (Issue #1): For shared links, use correct protein perspective
         // Check if this is a shared link and reconstruct chain from shared interactor's perspective
-        if (isShared && L._shared_between && L._shared_between.length >= 2) {
+        if (isShared && sharedBetween && sharedBetween.length >= 2) {
           // Find the shared interactor (not the main query protein)
-          const sharedInteractor = L._shared_between.find(p => p !== SNAP.main);
+          const sharedInteractor = sharedBetween.find(p => p !== SNAP.main);
 
           if (sharedInteractor) {
-            // Filter chain segments to show only those starting from shared interactor
-            const relevantSegments = chainWithArrows.filter(seg =>
-              seg.from === sharedInteractor || chainWithArrows.indexOf(seg) > chainWithArrows.findIndex(s => s.from === sharedInteractor)
-            );
+            // Keep chain segments from the first one leaving the shared interactor;
+            // if none does, every segment is kept (as before)
+            let startIdx = -1;
+            for (let i = 0; i < chainWithArrows.length; i++) {
+              if (chainWithArrows[i].from === sharedInteractor) { startIdx = i; break; }
+            }
+            const relevantSegments = startIdx > 0 ? chainWithArrows.slice(startIdx) : chainWithArrows;
 
             if (relevantSegments.length > 0) {
-              const arrowSymbols = {
-                'activates': ' <span style="color:#059669;font-weight:700;">--&gt;</span> ',
-                'inhibits': ' <span style="color:#dc2626;font-weight:700;">--|</span> ',
-                'binds': ' <span style="color:#7c3aed;font-weight:700;">---</span> ',
-                'complex': ' <span style="color:#f59e0b;font-weight:700;">--=</span> '
-              };
-
               fullChainText = relevantSegments.map((segment, i) => {
-                const arrow = arrowSymbols[segment.arrow] || ' → ';
+                const arrow = CHAIN_ARROW_SYMBOLS.get(segment.arrow) || ' → ';
                 if (i === relevantSegments.length - 1) {
                   return escapeHtml(segment.from) + arrow + escapeHtml(segment.to);
                 } else {
@@ -6382,7 +7331,7 @@ function showInteractionModal(link, clickedNode = null){
           } else {
             // Couldn't find shared interactor, use default
             fullChainText = chainWithArrows.map((segment, i) => {
-              const arrow = arrowSymbols[segment.arrow] || ' → ';
+              const arrow = CHAIN_ARROW_SYMBOLS.get(segment.arrow) || ' → ';
               return i === chainWithArrows.length - 1
                 ? escapeHtml(segment.from) + arrow + escapeHtml(segment.to)
                 : escapeHtml(segment.from) + arrow;
@@ -6390,15 +7339,8 @@ function showInteractionModal(link, clickedNode = null){
           }
         } else {
           // NOT a shared link: Display full chain with typed arrows
-          const arrowSymbols = {
-            'activates': ' <span style="color:#059669;font-weight:700;">--&gt;</span> ',
-            'inhibits': ' <span style="color:#dc2626;font-weight:700;">--|</span> ',
-            'binds': ' <span style="color:#7c3aed;font-weight:700;">---</span> ',
-            'complex': ' <span style="color:#f59e0b;font-weight:700;">--=</span> '
-          };
-
           fullChainText = chainWithArrows.map((segment, i) => {
-            const arrow = arrowSymbols[segment.arrow] || ' → ';
+            const arrow = CHAIN_ARROW_SYMBOLS.get(segment.arrow) || ' → ';
             if (i === chainWithArrows.length - 1) {
               // Last segment: show "from arrow to"
               return escapeHtml(segment.from) + arrow + escapeHtml(segment.to);
@@ -6413,8 +7355,8 @@ function showInteractionModal(link, clickedNode = null){
         // CRITICAL FIX (Issue #1): For shared links, start chain from shared interactor
         let startProtein = SNAP.main;
 
-        if (isShared && L._shared_between && L._shared_between.length >= 2) {
-          const sharedInteractor = L._shared_between.find(p => p !== SNAP.main);
+        if (isShared && sharedBetween && sharedBetween.length >= 2) {
+          const sharedInteractor = sharedBetween.find(p => p !== SNAP.main);
           if (sharedInteractor) {
             startProtein = sharedInteractor;
           }
@@ -6423,10 +7365,10 @@ function showInteractionModal(link, clickedNode = null){
         const fullChain = [startProtein, ...mediatorChain, tgtName];
         fullChainText = fullChain.map(p => escapeHtml(p)).join(' → ');
       }
-    } else if (L.upstream_interactor && L.upstream_interactor !== SNAP.main) {
+    } else if (upstreamInteractor && upstreamInteractor !== SNAP.main) {
       // Indirect with single upstream (no chain array but has upstream)
       // TODO: Could enhance to look up arrow types here too
-      fullChainText = `${escapeHtml(SNAP.main)} → ${escapeHtml(L.upstream_interactor)} → ${escapeHtml(tgtName)}`;
+      fullChainText = `${escapeHtml(SNAP.main)} → ${escapeHtml(upstreamInteractor)} → ${escapeHtml(tgtName)}`;
     } else {
       // First-ring indirect: no mediator specified (pathway incomplete)
       fullChainText = `${escapeHtml(SNAP.main)} → ${escapeHtml(tgtName)} <span style="font-style: italic; color: #f59e0b;">(direct mediator unknown)</span>`;
@@ -6456,11 +7398,7 @@ function showInteractionModal(link, clickedNode = null){
 /* Handle node click - show interaction modal with expand/collapse controls */
 function handleNodeClick(node){
   // Find ALL links involving this node
-  const nodeLinks = links.filter(l => {
-    const src = (l.source && l.source.id) ? l.source.id : l.source;
-    const tgt = (l.target && l.target.id) ? l.target.id : l.target;
-    return src === node.id || tgt === node.id;
-  });
+  const nodeLinks = getNodeLinks(node.id);
 
   if (nodeLinks.length === 0) {
     // Fallback: show error message
@@ -6483,7 +7421,8 @@ function showAggregatedInteractionsModal(nodeLinks, clickedNode) {
   const indirectLinks = [];
   const sharedLinks = [];
 
-  nodeLinks.forEach(link => {
+  for (let i = 0; i < nodeLinks.length; i++) {
+    const link = nodeLinks[i];
     const L = link.data || {};
     if (L._is_shared_link) {
       sharedLinks.push(link);
@@ -6492,94 +7431,78 @@ function showAggregatedInteractionsModal(nodeLinks, clickedNode) {
     } else {
       directLinks.push(link);
     }
-  });
+  }
 
-  // Build sections HTML
-  let sectionsHTML = '';
+  // Section HTML fragments, joined once when the modal body is assembled
+  const sectionParts = [];
+  // Body renderers of sections past the first LAZY_SECTION_EAGER_COUNT
+  const deferredSectionBodies = [];
+  let sectionCount = 0;
 
   // Helper to render a single interaction section
-  function renderInteractionSection(link, sectionType) {
+  function renderInteractionSection(link, sectionType, deferBody) {
     const L = link.data || link;  // Link properties are directly on link object or in data
+    const {
+      semanticSource, semanticTarget, direction: linkDirection, arrow: linkArrow,
+      functions: linkFunctions, upstream_interactor: upstreamInteractor, primary
+    } = L;
 
     // Use semantic source/target (biological direction) instead of D3's geometric source/target
-    const srcName = L.semanticSource || ((link.source && link.source.id) ? link.source.id : link.source);
-    const tgtName = L.semanticTarget || ((link.target && link.target.id) ? link.target.id : link.target);
+    const srcName = semanticSource || ((link.source && link.source.id) ? link.source.id : link.source);
+    const tgtName = semanticTarget || ((link.target && link.target.id) ? link.target.id : link.target);
     const safeSrc = escapeHtml(srcName || '-');
     const safeTgt = escapeHtml(tgtName || '-');
 
     // Determine arrow symbol
     // Support both query-relative AND absolute directions
-    const direction = L.direction || link.direction || 'main_to_primary';
-    let arrowSymbol = '↔';
-    if (direction === 'main_to_primary' || direction === 'a_to_b') arrowSymbol = '→';
-    else if (direction === 'primary_to_main' || direction === 'b_to_a') arrowSymbol = '←';
+    const direction = linkDirection || link.direction || 'main_to_primary';
+    const arrowSymbol = QUERY_DIRECTION_ARROWS.get(direction) || '↔';
 
     // Type badge
     let typeBadgeHTML = '';
     if (sectionType === 'shared') {
-      typeBadgeHTML = '<span class="mechanism-badge" style="background: #9333ea; color: white;">SHARED</span>';
+      typeBadgeHTML = '<span class="mechanism-badge type-badge-shared">SHARED</span>';
     } else if (sectionType === 'indirect') {
       // Build full chain path display for INDIRECT label
       // Try to extract chain from first function with chain context
       let chainDisplay = '';
-      const functions = L.functions || [];
-      const firstChainFunc = functions.find(f => f._context && f._context.type === 'chain' && f._context.chain);
+      const firstChainFunc = getFirstChainFunction(linkFunctions || EMPTY_FUNCTIONS);
       if (firstChainFunc && firstChainFunc._context.chain) {
         chainDisplay = buildFullChainPath(SNAP.main, firstChainFunc._context.chain, L);
       }
 
       // Fallback: use upstream_interactor if no chain found
-      if (!chainDisplay && L.upstream_interactor) {
-        chainDisplay = `${escapeHtml(SNAP.main)} → ${escapeHtml(L.upstream_interactor)} → ${escapeHtml(L.primary)}`;
+      if (!chainDisplay && upstreamInteractor) {
+        chainDisplay = `${escapeHtml(SNAP.main)} → ${escapeHtml(upstreamInteractor)} → ${escapeHtml(primary)}`;
       }
 
       typeBadgeHTML = chainDisplay
-        ? `<span class="mechanism-badge" style="background: #f59e0b; color: white;">${chainDisplay}</span>`
-        : `<span class="mechanism-badge" style="background: #f59e0b; color: white;">INDIRECT</span>`;
+        ? `<span class="mechanism-badge type-badge-indirect">${chainDisplay}</span>`
+        : `<span class="mechanism-badge type-badge-indirect">INDIRECT</span>`;
     } else {
-      typeBadgeHTML = '<span class="mechanism-badge" style="background: #10b981; color: white;">DIRECT</span>';
+      typeBadgeHTML = '<span class="mechanism-badge type-badge-direct">DIRECT</span>';
     }
 
     // Interaction title
     const interactionTitle = `${safeSrc} ${arrowSymbol} ${safeTgt}`;
 
     // Arrow type badge
-    const arrow = L.arrow || link.arrow || 'binds';
+    const arrow = linkArrow || link.arrow || 'binds';
     const normalizedArrow = arrow === 'activates' || arrow === 'activate' ? 'activates'
                           : arrow === 'inhibits' || arrow === 'inhibit' ? 'inhibits'
                           : 'binds';
-    const isDarkMode = document.body.classList.contains('dark-mode');
-    const arrowColors = isDarkMode ? {
-      'activates': { bg: '#065f46', text: '#a7f3d0', border: '#047857', label: 'ACTIVATES' },
-      'inhibits': { bg: '#991b1b', text: '#fecaca', border: '#b91c1c', label: 'INHIBITS' },
-      'binds': { bg: '#5b21b6', text: '#ddd6fe', border: '#6d28d9', label: 'BINDS' }
-    } : {
-      'activates': { bg: '#d1fae5', text: '#047857', border: '#059669', label: 'ACTIVATES' },
-      'inhibits': { bg: '#fee2e2', text: '#b91c1c', border: '#dc2626', label: 'INHIBITS' },
-      'binds': { bg: '#ede9fe', text: '#6d28d9', border: '#7c3aed', label: 'BINDS' }
-    };
-    const colors = arrowColors[normalizedArrow];
-
-    // Functions
-    function deduplicateFunctions(functionArray) {
-      const seen = new Set();
-      return functionArray.filter(fn => {
-        const key = `${fn.function || ''}|${fn.arrow || ''}|${fn.cellular_process || ''}`;
-        if (seen.has(key)) return false;
-        seen.add(key);
-        return true;
-      });
-    }
-
-    const rawFunctions = Array.isArray(L.functions) ? L.functions : [];
-    const functions = deduplicateFunctions(rawFunctions);
 
-    let functionsHTML = '';
-    if (functions.length > 0) {
-      functionsHTML = functions.map(fn => {
-        // Add interaction context label to each function box
-        return `
-          <div class="function-context-header" style="padding: 8px 12px; background: var(--color-bg-secondary); border-bottom: 1px solid var(--color-border); font-size: 11px; font-weight: 600; color: var(--color-text-secondary); display: flex; align-items: center; gap: 8px;">
+    // Functions (sections without any skip deduplication and the row loop)
+    const rawFunctions = Array.isArray(linkFunctions) ? linkFunctions : EMPTY_FUNCTIONS;
+    const functions = rawFunctions.length ? deduplicateFunctions(rawFunctions) : EMPTY_FUNCTIONS;
+
+    const renderBody = () => {
+      let functionsHTML;
+      if (functions.length > 0) {
+        functionsHTML = '';
+        // Interaction context label shown above each function box (same for all)
+        const contextHeader = `
+          <div class="function-context-header">
             <span class="detail-interaction">
               ${safeSrc}
               <span class="detail-arrow">${arrowSymbol}</span>
@@ -6587,32 +7510,15 @@ function showAggregatedInteractionsModal(nodeLinks, clickedNode) {
             </span>
             ${typeBadgeHTML}
           </div>
-          ${renderExpandableFunction(fn, srcName, tgtName, link.arrow)}
-        `;
-      }).join('');
-    } else {
-      const emptyMessage = sectionType === 'shared'
-        ? 'Shared interactions may not include context-specific functions.'
-        : 'No functions associated with this interaction.';
-      functionsHTML = `
-        <div style="padding: var(--space-4); color: var(--color-text-secondary); font-style: italic;">
-          ${emptyMessage}
-        </div>
-      `;
-    }
+          `;
+        for (let i = 0, n = functions.length; i < n; i++) {
+          functionsHTML += contextHeader + renderExpandableFunction(functions[i], srcName, tgtName, link.arrow);
+        }
+      } else {
+        functionsHTML = sectionType === 'shared' ? SECTION_NO_FUNCTIONS_SHARED : SECTION_NO_FUNCTIONS;
+      }
 
-    return `
-      <div class="interaction-section" style="margin-bottom: 24px; border: 1px solid var(--color-border); border-radius: 8px; overflow: hidden;">
-        <div class="interaction-section-header" style="padding: 12px 16px; background: var(--color-bg-secondary); display: flex; align-items: center; justify-content: space-between; gap: 12px;">
-          <div style="display: flex; align-items: center; gap: 12px;">
-            <span style="font-weight: 600; font-size: 14px;">${interactionTitle}</span>
-            ${typeBadgeHTML}
-          </div>
-          <span class="interaction-type-badge" style="display: inline-block; padding: 2px 8px; background: ${colors.bg}; color: ${colors.text}; border: 1px solid ${colors.border}; border-radius: 4px; font-size: 10px; font-weight: 600; text-transform: uppercase; letter-spacing: 0.3px;">
-            ${colors.label}
-          </span>
-        </div>
-        <div class="interaction-section-body" style="padding: 16px;">
+      return `
           ${L.support_summary ? `
             <div style="margin-bottom: 16px;">
               <div class="modal-detail-label">SUMMARY</div>
@@ -6621,47 +7527,43 @@ function showAggregatedInteractionsModal(nodeLinks, clickedNode) {
           ` : ''}
           <div class="modal-functions-header">Biological Functions (${functions.length})</div>
           ${functionsHTML}
+        `;
+    };
+
+    // Deferred bodies are filled by observeLazySections once scrolled near
+    let bodyAttrs = '';
+    let bodyHTML = '';
+    if (deferBody) {
+      bodyAttrs = ` data-lazy-section="${deferredSectionBodies.push(renderBody) - 1}"`;
+    } else {
+      bodyHTML = renderBody();
+    }
+
+    return `
+      <div class="interaction-section">
+        <div class="interaction-section-header">
+          <div class="interaction-section-heading">
+            <span class="interaction-section-title">${interactionTitle}</span>
+            ${typeBadgeHTML}
+          </div>
+          <span class="interaction-type-badge itype-${normalizedArrow}">
+            ${normalizedArrow.toUpperCase()}
+          </span>
         </div>
+        <div class="interaction-section-body"${bodyAttrs}>${bodyHTML}</div>
       </div>
     `;
   }
 
   // CRITICAL FIX (Issue #6): Enhanced section headers for visual distinction
   // Render all sections with prominent, color-coded headers
-  if (directLinks.length > 0) {
-    sectionsHTML += `<div class="modal-section-divider" style="margin: 24px 0 16px 0; padding: 12px 16px; background: linear-gradient(135deg, #dbeafe 0%, #e0e7ff 100%); border-left: 6px solid #3b82f6; border-radius: 8px; box-shadow: 0 2px 4px rgba(59,130,246,0.1);">
-      <h3 style="margin: 0; font-size: 16px; font-weight: 700; color: #1e40af; text-transform: uppercase; letter-spacing: 1px; display: flex; align-items: center; gap: 8px;">
-        <span style="display: inline-block; width: 8px; height: 8px; background: #3b82f6; border-radius: 50%;"></span>
-        DIRECT INTERACTIONS (${directLinks.length})
-      </h3>
-    </div>`;
-    directLinks.forEach(link => {
-      sectionsHTML += renderInteractionSection(link, 'direct');
-    });
-  }
-
-  if (indirectLinks.length > 0) {
-    sectionsHTML += `<div class="modal-section-divider" style="margin: 24px 0 16px 0; padding: 12px 16px; background: linear-gradient(135deg, #fef3c7 0%, #fed7aa 100%); border-left: 6px solid #f59e0b; border-radius: 8px; box-shadow: 0 2px 4px rgba(245,158,11,0.1);">
-      <h3 style="margin: 0; font-size: 16px; font-weight: 700; color: #92400e; text-transform: uppercase; letter-spacing: 1px; display: flex; align-items: center; gap: 8px;">
-        <span style="display: inline-block; width: 8px; height: 8px; background: #f59e0b; border-radius: 50%;"></span>
-        INDIRECT INTERACTIONS (${indirectLinks.length})
-      </h3>
-    </div>`;
-    indirectLinks.forEach(link => {
-      sectionsHTML += renderInteractionSection(link, 'indirect');
-    });
-  }
-
-  if (sharedLinks.length > 0) {
-    sectionsHTML += `<div class="modal-section-divider" style="margin: 24px 0 16px 0; padding: 12px 16px; background: linear-gradient(135deg, #f3e8ff 0%, #fae8ff 100%); border-left: 6px solid #9333ea; border-radius: 8px; box-shadow: 0 2px 4px rgba(147,51,234,0.1);">
-      <h3 style="margin: 0; font-size: 16px; font-weight: 700; color: #581c87; text-transform: uppercase; letter-spacing: 1px; display: flex; align-items: center; gap: 8px;">
-        <span style="display: inline-block; width: 8px; height: 8px; background: #9333ea; border-radius: 50%;"></span>
-        SHARED INTERACTIONS (${sharedLinks.length})
-      </h3>
-    </div>`;
-    sharedLinks.forEach(link => {
-      sectionsHTML += renderInteractionSection(link, 'shared');
-    });
+  const sectionGroups = [['direct', directLinks], ['indirect', indirectLinks], ['shared', sharedLinks]];
+  for (const [sectionType, groupLinks] of sectionGroups) {
+    if (groupLinks.length === 0) continue;
+    sectionParts.push(renderSectionDivider(sectionType, groupLinks.length));
+    for (let i = 0; i < groupLinks.length; i++) {
+      sectionParts.push(renderInteractionSection(groupLinks[i], sectionType, sectionCount++ >= LAZY_SECTION_EAGER_COUNT));
+    }
   }
 
   // Expand/collapse footer
@@ -6674,8 +7576,8 @@ function showAggregatedInteractionsModal(nodeLinks, clickedNode) {
   if (isMainProtein) {
     // Main protein: show single "Find New Interactions" button
     footerHTML = `
-      <div class="modal-footer" style="border-top: 1px solid var(--color-border); padding: 16px; background: var(--color-bg-secondary);">
-        <button onclick="handleQueryFromModal('${nodeId}')" class="btn-primary" style="padding: 8px 20px; background: #10b981; color: white; border: none; border-radius: 6px; font-weight: 500; cursor: pointer; font-size: 14px; font-family: var(--font-sans); transition: background 0.2s;">
+      <div class="modal-footer modal-footer-compact">
+        <button data-action="query" data-protein-id="${escapeHtml(nodeId)}" class="btn-primary modal-btn modal-btn-query">
           Find New Interactions
         </button>
       </div>
@@ -6683,33 +7585,33 @@ function showAggregatedInteractionsModal(nodeLinks, clickedNode) {
   } else {
     // Interactor: show conditional Expand + Query buttons
     footerHTML = `
-      <div class="modal-footer" style="border-top: 1px solid var(--color-border); padding: 16px; background: var(--color-bg-secondary);">
-        <div style="display: flex; gap: 12px; align-items: center; flex-wrap: wrap;">
+      <div class="modal-footer modal-footer-compact">
+        <div class="modal-footer-actions">
           ${canExpand && !isExpanded && hasInteractions ? `
-            <button onclick="handleExpandFromModal('${nodeId}')" class="btn-primary" style="padding: 8px 20px; background: #3b82f6; color: white; border: none; border-radius: 6px; font-weight: 500; cursor: pointer; font-size: 14px; font-family: var(--font-sans); transition: background 0.2s;">
+            <button data-action="expand" data-protein-id="${escapeHtml(nodeId)}" class="btn-primary modal-btn modal-btn-expand">
               Expand
             </button>
           ` : ''}
           ${canExpand && !isExpanded && !hasInteractions ? `
-            <button disabled style="padding: 8px 20px; background: #d1d5db; color: #6b7280; border: none; border-radius: 6px; font-weight: 500; font-size: 14px; cursor: not-allowed; font-family: var(--font-sans);">
+            <button disabled class="modal-btn modal-btn-disabled">
               Expand (No data)
             </button>
           ` : ''}
           ${isExpanded ? `
-            <button onclick="handleCollapseFromModal('${nodeId}')" class="btn-secondary" style="padding: 8px 20px; background: #ef4444; color: white; border: none; border-radius: 6px; font-weight: 500; cursor: pointer; font-size: 14px; font-family: var(--font-sans); transition: background 0.2s;">
+            <button data-action="collapse" data-protein-id="${escapeHtml(nodeId)}" class="btn-secondary modal-btn modal-btn-collapse">
               Collapse
             </button>
           ` : ''}
-          <button onclick="handleQueryFromModal('${nodeId}')" class="btn-primary" style="padding: 8px 20px; background: #10b981; color: white; border: none; border-radius: 6px; font-weight: 500; cursor: pointer; font-size: 14px; font-family: var(--font-sans); transition: background 0.2s;">
+          <button data-action="query" data-protein-id="${escapeHtml(nodeId)}" class="btn-primary modal-btn modal-btn-query">
             Query
           </button>
           ${!canExpand && !isExpanded ? `
-            <div style="padding: 8px 20px; background: #f3f4f6; color: #6b7280; border-radius: 6px; font-size: 13px; font-family: var(--font-sans); font-style: italic;">
+            <div class="modal-depth-note">
               Max depth reached (${MAX_DEPTH})
             </div>
           ` : ''}
         </div>
-        <div style="margin-top: 12px; font-size: 12px; color: var(--color-text-secondary); font-family: var(--font-sans);">
+        <div class="modal-footer-hint">
           Expand uses existing data • Query finds new interactions
         </div>
       </div>
@@ -6718,19 +7620,20 @@ function showAggregatedInteractionsModal(nodeLinks, clickedNode) {
 
   const modalTitle = `${escapeHtml(nodeLabel)} - All Interactions (${nodeLinks.length})`;
   const modalContent = `
-    <div style="max-height: 70vh; overflow-y: auto; padding: 16px;">
-      ${sectionsHTML}
+    <div class="aggregated-sections-scroll" style="max-height: 70vh; overflow-y: auto; padding: 16px;">
+      ${sectionParts.join('')}
     </div>
     ${footerHTML}
   `;
 
   openModal(modalTitle, modalContent);
+  if (deferredSectionBodies.length) observeLazySections(deferredSectionBodies);
 }
 
 /* Helper functions for expand/collapse from modal */
 function handleExpandFromModal(proteinId){
   closeModal();
-  const node = nodes.find(n => n.id === proteinId);
+  const node = nodeById.get(proteinId);
   if (node) {
     expandInteractor(node);
   }
@@ -6741,27 +7644,73 @@ function handleCollapseFromModal(proteinId){
   collapseInteractor(proteinId);
 }
 
+// Query settings saved by the search page; re-read after it changes them
+let querySettingsCache = null;
+window.addEventListener('storage', () => { querySettingsCache = null; });
+
+/**
+ * Pipeline settings sent with /api/query, read from localStorage once and
+ * reused until a storage event reports a change (frozen: callers copy it).
+ * @returns {object}
+ */
+function getQuerySettings(){
+  if (!querySettingsCache) {
+    querySettingsCache = Object.freeze({
+      interactor_rounds: parseInt(localStorage.getItem('interactor_rounds')) || 3,
+      function_rounds: parseInt(localStorage.getItem('function_rounds')) || 3,
+      max_depth: parseInt(localStorage.getItem('max_depth')) || 3,
+      skip_validation: localStorage.getItem('skip_validation') === 'true',
+      skip_deduplicator: localStorage.getItem('skip_deduplicator') === 'true',
+      skip_arrow_determination: localStorage.getItem('skip_arrow_determination') === 'true'
+    });
+  }
+  return querySettingsCache;
+}
+
+/**
+ * Merges a freshly queried protein's results into the current graph when it is
+ * an interactor node that could be expanded. Resolves false when the page has
+ * to be reloaded instead (not in the graph, already expanded or being expanded,
+ * at the depth limit, or no usable results).
+ * @returns {Promise<boolean>}
+ */
+async function mergeQueriedProtein(proteinId, signal){
+  const node = nodeById.get(proteinId);
+  if (!node || node.type !== 'interactor') return false;
+  if (expanded.has(proteinId) || expandingInFlight.has(proteinId)) return false;
+  if ((depthMap.get(proteinId) ?? 1) >= MAX_DEPTH) return false;
+
+  expandingInFlight.add(proteinId);
+  try {
+    const res = await fetch(`/api/results/${encodeURIComponent(proteinId)}`, { signal });
+    if (!res.ok) return false;
+    const raw = await res.json();
+    // Same shape check mergeSubgraph bails out on
+    const sub = (raw && raw.snapshot_json) ? raw.snapshot_json : raw;
+    if (!sub || !Array.isArray(sub.proteins) || !Array.isArray(sub.interactions)) return false;
+    await mergeSubgraph(raw, node);
+  } finally {
+    expandingInFlight.delete(proteinId);
+  }
+  miniDone(`<span>Query complete. Added subgraph for <b>${escapeHtml(proteinId)}</b>.</span>`);
+  return true;
+}
+
 async function handleQueryFromModal(proteinId) {
   closeModal();
 
   // Get configuration from localStorage
-  const config = {
-    protein: proteinId,
-    interactor_rounds: parseInt(localStorage.getItem('interactor_rounds')) || 3,
-    function_rounds: parseInt(localStorage.getItem('function_rounds')) || 3,
-    max_depth: parseInt(localStorage.getItem('max_depth')) || 3,
-    skip_validation: localStorage.getItem('skip_validation') === 'true',
-    skip_deduplicator: localStorage.getItem('skip_deduplicator') === 'true',
-    skip_arrow_determination: localStorage.getItem('skip_arrow_determination') === 'true'
-  };
+  const config = Object.assign({ protein: proteinId }, getQuerySettings());
 
   miniProgress(`Querying ${proteinId}...`, null, null, proteinId);
+  const signal = beginJobAbort();
 
   try {
     const response = await fetch('/api/query', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify(config)
+      body: JSON.stringify(config),
+      signal
     });
 
     if (!response.ok) {
@@ -6776,15 +7725,21 @@ async function handleQueryFromModal(proteinId) {
       // Poll for completion
       await pollUntilComplete(proteinId, ({ current, total, text }) => {
         miniProgress(text || 'Processing', current, total, proteinId);
-      });
+      }, signal);
 
-      // Reload page to show updated data
+      notifyJobComplete(proteinId);
+      // Graph nodes take the new results in place, as an expansion would
+      if (await mergeQueriedProtein(proteinId, signal)) return;
+
+      // Reload page to show updated data, once the tab is in view
+      await waitUntilVisible(signal);
       miniDone(`<span>Query complete! Reloading...</span>`);
       setTimeout(() => { window.location.reload(); }, 1000);
     } else {
       miniDone(`<span style="color: #ef4444;">Unexpected status: ${data.status}</span>`);
     }
   } catch (error) {
+    if (isReportedJobEnd(error)) return;  // cancelCurrentJob/applyJobStatus already reported it
     console.error('[ERROR] Query from modal failed:', error);
     miniDone(`<span style="color: #ef4444;">Failed to start query</span>`);
   }
@@ -6823,23 +7778,18 @@ async function searchProteinFromVisualizer(proteinName) {
 
 // Start query from visualizer page
 async function startQueryFromVisualizer(proteinName) {
-  const config = {
-    protein: proteinName,
-    interactor_rounds: parseInt(localStorage.getItem('interactor_rounds')) || 3,
-    function_rounds: parseInt(localStorage.getItem('function_rounds')) || 3,
-    max_depth: parseInt(localStorage.getItem('max_depth')) || 3,
-    skip_validation: localStorage.getItem('skip_validation') === 'true',
-    skip_deduplicator: localStorage.getItem('skip_deduplicator') === 'true',
-    skip_arrow_determination: localStorage.getItem('skip_arrow_determination') === 'true'
-  };
+  requestCompletionNotifications();
+  const config = Object.assign({ protein: proteinName }, getQuerySettings());
 
   miniProgress(`Querying ${proteinName}...`, null, null, proteinName);
+  const signal = beginJobAbort();
 
   try {
     const response = await fetch('/api/query', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify(config)
+      body: JSON.stringify(config),
+      signal
     });
 
     if (!response.ok) {
@@ -6853,8 +7803,10 @@ async function startQueryFromVisualizer(proteinName) {
     if (data.status === 'processing') {
       await pollUntilComplete(proteinName, ({ current, total, text }) => {
         miniProgress(text || 'Processing', current, total, proteinName);
-      });
+      }, signal);
 
+      notifyJobComplete(proteinName);
+      await waitUntilVisible(signal);
       miniDone(`<span>Query complete! Loading visualization...</span>`);
       setTimeout(() => {
         window.location.href = `/api/visualize/${encodeURIComponent(proteinName)}?t=${Date.now()}`;
@@ -6863,6 +7815,7 @@ async function startQueryFromVisualizer(proteinName) {
       miniDone(`<span style="color: #ef4444;">Unexpected status: ${data.status}</span>`);
     }
   } catch (error) {
+    if (isReportedJobEnd(error)) return;  // cancelCurrentJob/applyJobStatus already reported it
     console.error('[ERROR] Query failed:', error);
     miniDone(`<span style="color: #ef4444;">Failed to start query</span>`);
   }
@@ -6871,7 +7824,7 @@ async function startQueryFromVisualizer(proteinName) {
 function showFunctionModalFromNode(fnNode){
   // Find the corresponding link to get the normalized arrow
   const linkId = `${fnNode.parent}-${fnNode.id}`;
-  const correspondingLink = links.find(l => l.id === linkId);
+  const correspondingLink = linkById.get(linkId);
 
   // Leverage the same renderer as link, but pass the fields explicitly
   showFunctionModal({
@@ -6895,54 +7848,163 @@ function showFunctionModalFromLink(link){
   });
 }
 
+// Function modal effect type: arrow -> CSS class and default description;
+// any other arrow is shown as binding
+const FUNCTION_MODAL_EFFECT_DEFAULT = Object.freeze({ cls: 'binds', text: '⊕ Binds/Interacts' });
+const FUNCTION_MODAL_EFFECTS = new Map([
+  ['activates', Object.freeze({ cls: 'activates', text: '✓ Function is enhanced or activated' })],
+  ['inhibits', Object.freeze({ cls: 'inhibits', text: '✗ Function is inhibited or disrupted' })],
+  ['binds', FUNCTION_MODAL_EFFECT_DEFAULT]
+]);
+
+// Function modal evidence card; cloned per evidence item and filled with
+// textContent, so paper fields never go through the HTML parser
+const EVIDENCE_CARD_TEMPLATE = document.createElement('template');
+EVIDENCE_CARD_TEMPLATE.innerHTML = '<div class="expanded-evidence-wrapper"><div class="expanded-evidence-card">' +
+  '<div class="expanded-evidence-title"></div><div class="expanded-evidence-meta"></div>' +
+  '<div class="expanded-evidence-pmids" style="margin-top:8px;"></div></div></div>';
+
+/** Appends a "Label: value" line to an evidence card's meta block */
+function appendEvidenceMeta(meta, label, value){
+  const item = document.createElement('div');
+  item.className = 'expanded-evidence-meta-item';
+  const strong = document.createElement('strong');
+  strong.textContent = label;
+  item.append(strong, ' ' + value);
+  meta.appendChild(item);
+}
+
+/** Appends a PMID/DOI badge link to an evidence card */
+function appendEvidenceBadge(container, href, text){
+  const a = document.createElement('a');
+  a.href = href;
+  a.target = '_blank';
+  a.className = 'expanded-pmid-badge';
+  a.textContent = text;
+  container.appendChild(a);
+}
+
+/**
+ * Delegated click handler for an .expanded-evidence-list: a click on a linked
+ * card opens its primary paper, while PMID/DOI badges keep their own navigation.
+ * Clicks inside a card do not reach the surrounding row/modal handlers.
+ */
+function handleEvidenceListClick(e){
+  const card = e.target.closest('.expanded-evidence-card');
+  if (!card) return;
+  e.stopPropagation();
+  const link = card.dataset.evidenceLink;
+  if (link && !e.target.closest('a')) window.open(link, '_blank');
+}
+
+/**
+ * Evidence cards for the function modal.
+ * @param {object[]} evs - fn.evidence entries
+ * @returns {DocumentFragment}
+ */
+function buildEvidenceCards(evs){
+  const frag = document.createDocumentFragment();
+  const proto = EVIDENCE_CARD_TEMPLATE.content.firstElementChild;
+  for (const ev of evs) {
+    const wrapper = proto.cloneNode(true);
+    const card = wrapper.firstElementChild;
+    const primaryLink = ev.pmid ? `https://pubmed.ncbi.nlm.nih.gov/${ev.pmid}` : (ev.doi ? `https://doi.org/${ev.doi}` : null);
+    card.dataset.evidenceLink = primaryLink || '';
+    card.dataset.hasLink = primaryLink ? 'true' : 'false';
+
+    card.querySelector('.expanded-evidence-title').textContent = ev.paper_title || 'Title not available';
+    const meta = card.querySelector('.expanded-evidence-meta');
+    if (ev.authors) appendEvidenceMeta(meta, 'Authors:', ev.authors);
+    if (ev.journal) appendEvidenceMeta(meta, 'Journal:', ev.journal);
+    if (ev.year) appendEvidenceMeta(meta, 'Year:', ev.year);
+
+    const pmids = card.querySelector('.expanded-evidence-pmids');
+    if (ev.relevant_quote) {
+      const quote = document.createElement('div');
+      quote.className = 'expanded-evidence-quote';
+      quote.textContent = `"${ev.relevant_quote}"`;
+      card.insertBefore(quote, pmids);
+    }
+    if (ev.pmid) appendEvidenceBadge(pmids, `https://pubmed.ncbi.nlm.nih.gov/${ev.pmid}`, `PMID: ${ev.pmid}`);
+    if (ev.doi) appendEvidenceBadge(pmids, `https://doi.org/${ev.doi}`, `DOI: ${ev.doi}`);
+
+    frag.appendChild(wrapper);
+  }
+  return frag;
+}
+
+// Function modal cascade steps and effect chips: cloned per item, text set via textContent
+const CASCADE_ITEM_TEMPLATE = document.createElement('template');
+CASCADE_ITEM_TEMPLATE.innerHTML = '<div class="cascade-flow-item"></div>';
+const EFFECT_CHIP_TEMPLATE = document.createElement('template');
+EFFECT_CHIP_TEMPLATE.innerHTML = '<div class="expanded-effect-chip-wrapper"><div class="expanded-effect-chip"></div></div>';
+
+/**
+ * Clones template's element once per text and fills its innermost element
+ * with textContent, so the values never go through the HTML parser.
+ * @param {Array<*>} texts
+ * @param {HTMLTemplateElement} template
+ * @returns {DocumentFragment}
+ */
+function buildTextBlocks(texts, template){
+  const frag = document.createDocumentFragment();
+  const proto = template.content.firstElementChild;
+  for (const text of texts) {
+    const el = proto.cloneNode(true);
+    let leaf = el;
+    while (leaf.firstElementChild) leaf = leaf.firstElementChild;
+    leaf.textContent = text == null ? '' : String(text);
+    frag.appendChild(el);
+  }
+  return frag;
+}
+
+// Evidence cards rendered with the function modal; the rest follow in idle-time batches of this size
+const EVIDENCE_BATCH_SIZE = 10;
+
+/**
+ * Appends evs[start..] to an open modal's evidence list in idle-time batches.
+ * Stops once the modal is closed or its body has been replaced.
+ */
+function appendEvidenceCardsWhenIdle(list, evs, start){
+  const idle = window.requestIdleCallback || ((cb) => setTimeout(cb, 1));
+  let next = start;
+  const renderBatch = () => {
+    if (!list.isConnected || !MODAL_EL.classList.contains('active')) return;
+    list.appendChild(buildEvidenceCards(evs.slice(next, next + EVIDENCE_BATCH_SIZE)));
+    next += EVIDENCE_BATCH_SIZE;
+    if (next < evs.length) idle(renderBatch, { timeout: 500 });
+  };
+  idle(renderBatch, { timeout: 500 });
+}
+
 /* Render function modal (interactor → fn) */
 function showFunctionModal({ fn, interactor, affected, label, linkArrow }){
 
-  // Format references with full paper details from evidence using beautiful wrappers
+  // References: evidence cards are cloned from EVIDENCE_CARD_TEMPLATE and
+  // filled in after the body is parsed (see below); only the list is emitted here
   const evs = Array.isArray(fn.evidence) ? fn.evidence : [];
-  const evHTML = evs.length ? `<div class="expanded-evidence-list">${evs.map(ev=>{
-    const primaryLink = ev.pmid ? `https://pubmed.ncbi.nlm.nih.gov/${ev.pmid}` : (ev.doi ? `https://doi.org/${ev.doi}` : null);
-    return `<div class="expanded-evidence-wrapper">
-      <div class="expanded-evidence-card" data-evidence-link="${primaryLink || ''}" data-has-link="${primaryLink ? 'true' : 'false'}">
-        <div class="expanded-evidence-title">${ev.paper_title || 'Title not available'}</div>
-        <div class="expanded-evidence-meta">
-          ${ev.authors ? `<div class="expanded-evidence-meta-item"><strong>Authors:</strong> ${ev.authors}</div>` : ''}
-          ${ev.journal ? `<div class="expanded-evidence-meta-item"><strong>Journal:</strong> ${ev.journal}</div>` : ''}
-          ${ev.year ? `<div class="expanded-evidence-meta-item"><strong>Year:</strong> ${ev.year}</div>` : ''}
-        </div>
-        ${ev.relevant_quote ? `<div class="expanded-evidence-quote">"${ev.relevant_quote}"</div>` : ''}
-        <div class="expanded-evidence-pmids" style="margin-top:8px;">
-          ${ev.pmid ? `<a href="https://pubmed.ncbi.nlm.nih.gov/${ev.pmid}" target="_blank" class="expanded-pmid-badge" onclick="event.stopPropagation();">PMID: ${ev.pmid}</a>` : ''}
-          ${ev.doi ? `<a href="https://doi.org/${ev.doi}" target="_blank" class="expanded-pmid-badge" onclick="event.stopPropagation();">DOI: ${ev.doi}</a>` : ''}
-        </div>
-      </div>
-    </div>`;
-  }).join('')}</div>` : (Array.isArray(fn.pmids) && fn.pmids.length
-      ? fn.pmids.map(p=> `<a class="pmid-link" target="_blank" href="https://pubmed.ncbi.nlm.nih.gov/${p}">PMID: ${p}</a>`).join(', ')
+  const evHTML = evs.length ? '<div class="expanded-evidence-list"></div>' : (Array.isArray(fn.pmids) && fn.pmids.length
+      ? fn.pmids.map(p=> `<a class="pmid-link" target="_blank" href="https://pubmed.ncbi.nlm.nih.gov/${encodeURIComponent(p)}">PMID: ${escapeHtml(p)}</a>`).join(', ')
       : '<div class="expanded-empty">No references available</div>');
 
-  // Format specific effects with 3D wrappers
+  // Format specific effects with 3D wrappers; the chips are built with
+  // textContent after the body is parsed (see below)
+  const specificEffects = Array.isArray(fn.specific_effects) ? fn.specific_effects : [];
   let effectsHTML = '';
-  if (Array.isArray(fn.specific_effects) && fn.specific_effects.length) {
-    const effectChips = fn.specific_effects.map(s=>`
-      <div class="expanded-effect-chip-wrapper">
-        <div class="expanded-effect-chip">${s}</div>
-      </div>`).join('');
+  if (specificEffects.length) {
     effectsHTML = `
       <tr class="info-row">
         <td class="info-label">SPECIFIC EFFECTS</td>
         <td class="info-value">
-          <div class="expanded-effects-grid">${effectChips}</div>
+          <div class="expanded-effects-grid"></div>
         </td>
       </tr>`;
   }
 
   // Format biological cascade - NORMALIZED VERTICAL FLOWCHART
-  const createCascadeHTML = (value) => {
+  const getCascadeSteps = (value) => {
     const segments = Array.isArray(value) ? value : (value ? [value] : []);
-    if (segments.length === 0) {
-      return '<div class="expanded-empty">Cascading biological effects not specified</div>';
-    }
 
     // Normalize: flatten all segments and split by arrow (→)
     const allSteps = [];
@@ -6954,33 +8016,20 @@ function showFunctionModal({ fn, interactor, affected, label, linkArrow }){
       const steps = text.split('→').map(s => s.trim()).filter(s => s.length > 0);
       allSteps.push(...steps);
     });
-
-    if (allSteps.length === 0) {
-      return '<div class="expanded-empty">Cascading biological effects not specified</div>';
-    }
-
-    // Create vertical flowchart blocks
-    const items = allSteps.map(step =>
-      `<div class="cascade-flow-item">${escapeHtml(step)}</div>`
-    ).join('');
-
-    return `<div class="cascade-wrapper"><div class="cascade-flow-container">${items}</div></div>`;
+    return allSteps;
   };
-  const biologicalConsequenceHTML = createCascadeHTML(fn.biological_consequence);
+  // Vertical flowchart blocks are built with textContent after the body is parsed
+  const cascadeSteps = getCascadeSteps(fn.biological_consequence);
+  const biologicalConsequenceHTML = cascadeSteps.length
+    ? '<div class="cascade-wrapper"><div class="cascade-flow-container"></div></div>'
+    : '<div class="expanded-empty">Cascading biological effects not specified</div>';
 
   const mechanism = interactor && interactor.intent ? (interactor.intent[0].toUpperCase()+interactor.intent.slice(1)) : 'Not specified';
 
   // EFFECT TYPE: Use the link's already-normalized arrow
   // The link was created with the normalized arrow, so we MUST use that for consistency
   const normalizedArrow = linkArrow || 'binds';  // Default to binds if no link arrow provided
-  const arrowColor = normalizedArrow === 'activates' ? '#059669' : (normalizedArrow === 'inhibits' ? '#dc2626' : '#7c3aed');
-  const arrowStr = fn.effect_description ?
-    `<strong style="color:${arrowColor};">${fn.effect_description}</strong>` :
-    (normalizedArrow === 'activates' ?
-      '<strong style="color:#059669;">✓ Function is enhanced or activated</strong>' :
-      (normalizedArrow === 'inhibits' ?
-        '<strong style="color:#dc2626;">✗ Function is inhibited or disrupted</strong>' :
-        '<strong style="color:#7c3aed;">⊕ Binds/Interacts</strong>'));
+  const effectStyle = FUNCTION_MODAL_EFFECTS.get(normalizedArrow) || FUNCTION_MODAL_EFFECT_DEFAULT;
 
   // Check for validity field (from fact-checker)
   const validity = fn.validity || 'TRUE';
@@ -7001,33 +8050,33 @@ function showFunctionModal({ fn, interactor, affected, label, linkArrow }){
             <div style="font-weight:600;color:${warningColor};margin-bottom:4px;">
               ${warningIcon} <strong>${warningType}</strong>
             </div>
-            <div style="color:#374151;font-size:13px;">${validationNote}</div>
+            <div style="color:#374151;font-size:13px;">${escapeHtml(validationNote)}</div>
           </div>
         </td>
       </tr>`;
   }
 
   // Update function label to show asterisk for conflicting claims
-  const functionLabel = isConflicting ? `⚠ ${label} *` : label;
+  const functionLabel = isConflicting ? `⚠ ${escapeHtml(label)} *` : escapeHtml(label);
 
   // Wrap mechanism with beautiful wrapper
   const mechanismHTML = mechanism !== 'Not specified'
-    ? `<div class="expanded-mechanism-wrapper"><span class="mechanism-badge">${mechanism}</span></div>`
+    ? `<div class="expanded-mechanism-wrapper"><span class="mechanism-badge">${escapeHtml(mechanism)}</span></div>`
     : '<span class="muted-text">Not specified</span>';
 
   // Wrap cellular process with beautiful wrapper
   const cellularHTML = fn.cellular_process
-    ? `<div class="expanded-cellular-wrapper"><div class="expanded-cellular-process"><div class="expanded-cellular-process-text">${fn.cellular_process}</div></div></div>`
+    ? `<div class="expanded-cellular-wrapper"><div class="expanded-cellular-process"><div class="expanded-cellular-process-text">${escapeHtml(fn.cellular_process)}</div></div></div>`
     : '<div class="expanded-empty">Molecular mechanism not specified</div>';
 
   // Wrap effect type with beautiful wrapper
-  const effectTypeColor = normalizedArrow === 'activates' ? 'activates' : (normalizedArrow === 'inhibits' ? 'inhibits' : 'binds');
-  const effectTypeText = fn.effect_description || (normalizedArrow === 'activates' ? '✓ Function is enhanced or activated' : (normalizedArrow === 'inhibits' ? '✗ Function is inhibited or disrupted' : '⊕ Binds/Interacts'));
-  const effectTypeHTML = `<div class="expanded-effect-type ${effectTypeColor}"><span class="effect-type-badge ${effectTypeColor}">${effectTypeText}</span></div>`;
+  const effectTypeColor = effectStyle.cls;
+  const effectTypeText = fn.effect_description || effectStyle.text;
+  const effectTypeHTML = `<div class="expanded-effect-type ${effectTypeColor}"><span class="effect-type-badge ${effectTypeColor}">${escapeHtml(effectTypeText)}</span></div>`;
 
   // Wrap function and protein names prominently
   const functionHTML = `<div class="function-name-wrapper ${effectTypeColor}"><span class="function-name ${effectTypeColor}" style="font-size: 18px;">${functionLabel}</span></div>`;
-  const affectedHTML = `<div class="interaction-name-wrapper"><div class="interaction-name" style="font-size: 16px;">${affected}</div></div>`;
+  const affectedHTML = `<div class="interaction-name-wrapper"><div class="interaction-name" style="font-size: 16px;">${escapeHtml(affected)}</div></div>`;
 
   const body = `
     <table class="info-table">
@@ -7041,7 +8090,21 @@ function showFunctionModal({ fn, interactor, affected, label, linkArrow }){
       ${effectsHTML}
       <tr class="info-row"><td class="info-label">REFERENCES</td><td class="info-value">${evHTML}</td></tr>
     </table>`;
-  openModal(`Function: ${label}`, body);
+  const bodyTemplate = document.createElement('template');
+  bodyTemplate.innerHTML = body;
+  if (cascadeSteps.length) {
+    bodyTemplate.content.querySelector('.cascade-flow-container').appendChild(buildTextBlocks(cascadeSteps, CASCADE_ITEM_TEMPLATE));
+  }
+  if (specificEffects.length) {
+    bodyTemplate.content.querySelector('.expanded-effects-grid').appendChild(buildTextBlocks(specificEffects, EFFECT_CHIP_TEMPLATE));
+  }
+  const list = evs.length ? bodyTemplate.content.querySelector('.expanded-evidence-list') : null;
+  if (list) {
+    list.appendChild(buildEvidenceCards(evs.slice(0, EVIDENCE_BATCH_SIZE)));
+    list.addEventListener('click', handleEvidenceListClick);
+  }
+  openModal(`Function: ${escapeHtml(label)}`, bodyTemplate.content);
+  if (list && evs.length > EVIDENCE_BATCH_SIZE) appendEvidenceCardsWhenIdle(list, evs, EVIDENCE_BATCH_SIZE);
 }
 
 /* ===== Progress helpers (viz page) ===== */
@@ -7053,7 +8116,96 @@ class CancellationError extends Error {
   }
 }
 
+// A job that ended in status 'error'; final, so status loops stop on it.
+// reported: the failure was already shown via miniDone
+class JobFailedError extends Error {
+  constructor(message, reported = false) {
+    super(message);
+    this.name = 'JobFailedError';
+    this.reported = reported;
+  }
+}
+
 let currentJobProtein = null;  // Track the current job for cancellation
+let currentJobAbort = null;    // AbortController for the current job's requests (see beginJobAbort)
+
+/** Starts a fresh AbortController for the job about to run and returns its signal */
+function beginJobAbort(){
+  currentJobAbort = new AbortController();
+  return currentJobAbort.signal;
+}
+
+/** True for user cancellation, whether reported by the server or by an aborted request */
+function isCancellation(err){
+  return err instanceof CancellationError || err?.name === 'CancellationError' || err?.name === 'AbortError';
+}
+
+/** True when the user has already been told how the job ended (cancelled, or failed via miniDone) */
+function isReportedJobEnd(err){
+  return isCancellation(err) || (err instanceof JobFailedError && err.reported);
+}
+
+/** Resolves once the page is visible; rejects with CancellationError once signal aborts */
+function waitUntilVisible(signal){
+  if (document.visibilityState !== 'hidden') return Promise.resolve();
+  if (signal?.aborted) return Promise.reject(new CancellationError('aborted'));
+  return new Promise((resolve, reject) => {
+    const onChange = () => {
+      if (document.visibilityState === 'hidden') return;
+      document.removeEventListener('visibilitychange', onChange);
+      signal?.removeEventListener('abort', onAbort);
+      resolve();
+    };
+    const onAbort = () => {
+      document.removeEventListener('visibilitychange', onChange);
+      reject(new CancellationError('aborted'));
+    };
+    document.addEventListener('visibilitychange', onChange);
+    signal?.addEventListener('abort', onAbort, { once: true });
+  });
+}
+
+// Status polls while the tab is hidden: slowed down, not stopped, so a finished
+// job is still noticed and announced by notifyJobComplete
+const HIDDEN_POLL_MS = 30000;
+
+/** Poll delay to use now: at least HIDDEN_POLL_MS while the page is hidden */
+function hiddenPollDelay(delay){
+  return document.visibilityState === 'hidden' ? Math.max(delay, HIDDEN_POLL_MS) : delay;
+}
+
+let completionNotificationsRequested = false;
+
+/** Asks once per page for permission to announce finished jobs (call from a click) */
+function requestCompletionNotifications(){
+  if (completionNotificationsRequested || !('Notification' in window)) return;
+  completionNotificationsRequested = true;
+  if (Notification.permission === 'default') Notification.requestPermission().catch(() => {});
+}
+
+/** Shows a system notification for a finished job when this tab is in the background */
+function notifyJobComplete(protein){
+  if (document.visibilityState !== 'hidden') return;
+  if (!('Notification' in window) || Notification.permission !== 'granted') return;
+  new Notification('Query complete', { body: protein });
+}
+
+/** setTimeout as a promise; rejects with CancellationError once signal aborts */
+function sleepUnlessAborted(ms, signal){
+  return new Promise((resolve, reject) => {
+    if (signal?.aborted) { reject(new CancellationError('aborted')); return; }
+    // The job signal outlives each sleep, so its listener is removed on normal wake-up
+    const onAbort = () => {
+      clearTimeout(t);
+      reject(new CancellationError('aborted'));
+    };
+    const t = setTimeout(() => {
+      signal?.removeEventListener('abort', onAbort);
+      resolve();
+    }, ms);
+    signal?.addEventListener('abort', onAbort, { once: true });
+  });
+}
 
 function showHeader(){
   const header = document.querySelector('.header');
@@ -7064,61 +8216,91 @@ function hideHeader(){
   if (header) header.classList.remove('header-visible');
 }
 
-function miniProgress(text, current, total, proteinName){
-  const wrap = document.getElementById('mini-progress-wrapper');
-  const bar  = document.getElementById('mini-progress-bar-inner');
-  const txt  = document.getElementById('mini-progress-text');
-  const msg  = document.getElementById('notification-message');
-  const cancelBtn = document.getElementById('mini-cancel-btn');
+let miniProgressEls = null;     // cached mini progress elements (see getMiniProgressEls)
+let pendingMiniView = null;     // last requested mini progress view, painted by flushMiniView
+let miniViewRafId = 0;
+
+function getMiniProgressEls(){
+  if (!miniProgressEls) {
+    miniProgressEls = {
+      wrap: document.getElementById('mini-progress-wrapper'),
+      bar: document.getElementById('mini-progress-bar-inner'),
+      txt: document.getElementById('mini-progress-text'),
+      msg: document.getElementById('notification-message'),
+      cancelBtn: document.getElementById('mini-cancel-btn')
+    };
+  }
+  return miniProgressEls;
+}
+
+/**
+ * Queues a mini progress view for the next frame. Each view fully describes the
+ * widget, so bursts of status updates collapse into one paint of the latest one.
+ */
+function scheduleMiniView(view){
+  pendingMiniView = view;
+  if (!miniViewRafId) miniViewRafId = requestAnimationFrame(flushMiniView);
+}
+
+function flushMiniView(){
+  miniViewRafId = 0;
+  const view = pendingMiniView;
+  pendingMiniView = null;
+  if (!view) return;
+  const { wrap, bar, txt, msg, cancelBtn } = getMiniProgressEls();
+
+  if (view.done) {
+    if (wrap) wrap.style.display='none';
+    if (bar) bar.style.width='0%';
+    if (cancelBtn) cancelBtn.style.display='none';
+    if (msg && view.html) msg.innerHTML = view.html;
+    return;
+  }
 
   if (msg) msg.innerHTML = '';
   if (!wrap || !bar || !txt) return;
+  wrap.style.display = 'grid';
+  // Show cancel button for all jobs
+  if (view.showCancel && cancelBtn) {
+    cancelBtn.style.display = 'inline-block';
+    cancelBtn.disabled = false;  // Re-enable in case it was disabled
+  }
+  bar.style.width = view.width;
+  txt.textContent = view.text;
+}
+
+function miniProgress(text, current, total, proteinName){
+  const { wrap, bar, txt } = getMiniProgressEls();
+  if (!wrap || !bar || !txt) {
+    scheduleMiniView({ width: '', text: '' });  // still clears the notification message
+    return;
+  }
 
   // Show header when progress starts
   showHeader();
-  wrap.style.display = 'grid';
 
   // Track current job
   if (proteinName) {
     currentJobProtein = proteinName;
     currentRunningJob = proteinName;  // Keep both variables in sync
-    // Show cancel button for all jobs
-    if (cancelBtn) {
-      cancelBtn.style.display = 'inline-block';
-      cancelBtn.disabled = false;  // Re-enable in case it was disabled
-    }
   }
 
+  let width, label;
   if (typeof current==='number' && typeof total==='number' && total>0){
     const pct = Math.max(0, Math.min(100, Math.round((current/total)*100)));
-    bar.style.width = pct+'%';
+    width = pct+'%';
     // Simplified format for visualization page: just protein name and percentage
-    if (proteinName) {
-      txt.textContent = `${proteinName}: ${pct}%`;
-    } else {
-      txt.textContent = `${text||'Processing…'} (${pct}%)`;
-    }
+    label = proteinName ? `${proteinName}: ${pct}%` : `${text||'Processing…'} (${pct}%)`;
   } else {
-    bar.style.width = '25%';
+    width = '25%';
     // When no progress numbers available, show protein name with status
-    if (proteinName) {
-      txt.textContent = `${proteinName}: ${text || 'Processing…'}`;
-    } else {
-      txt.textContent = text || 'Processing…';
-    }
+    label = proteinName ? `${proteinName}: ${text || 'Processing…'}` : (text || 'Processing…');
   }
+  scheduleMiniView({ width, text: label, showCancel: Boolean(proteinName) });
 }
 
 function miniDone(html){
-  const wrap = document.getElementById('mini-progress-wrapper');
-  const bar  = document.getElementById('mini-progress-bar-inner');
-  const msg  = document.getElementById('notification-message');
-  const cancelBtn = document.getElementById('mini-cancel-btn');
-
-  if (wrap) wrap.style.display='none';
-  if (bar) bar.style.width='0%';
-  if (cancelBtn) cancelBtn.style.display='none';
-  if (msg && html) msg.innerHTML = html;
+  scheduleMiniView({ done: true, html });
 
   // Hide header after a delay
   setTimeout(hideHeader, 3000);
@@ -7135,6 +8317,12 @@ async function cancelCurrentJob(){
   const cancelBtn = document.getElementById('mini-cancel-btn');
   if (cancelBtn) cancelBtn.disabled = true;
 
+  // Stop this tab's status polling and result fetches right away
+  if (currentJobAbort) {
+    currentJobAbort.abort();
+    currentJobAbort = null;
+  }
+
   try {
     const response = await fetch(`/api/cancel/${encodeURIComponent(currentJobProtein)}`, {
       method: 'POST'
@@ -7153,23 +8341,113 @@ async function cancelCurrentJob(){
     if (cancelBtn) cancelBtn.disabled = false;
   }
 }
-async function pollUntilComplete(p, onUpdate){
+/**
+ * Follows a job's status frames over Server-Sent Events.
+ * onFrame(status) returns true once the job is finished, or throws to abort.
+ * Resolves false when no stream can be used (no EventSource, the stream fails
+ * before its first frame, or a reconnect is refused) so the caller can fall
+ * back to polling.
+ * Rejects with CancellationError when signal aborts.
+ * @param {string} url
+ * @param {function(object): boolean} onFrame
+ * @param {AbortSignal} [signal]
+ * @returns {Promise<boolean>}
+ */
+function followStatusStream(url, onFrame, signal){
+  if (typeof EventSource === 'undefined') return Promise.resolve(false);
+  if (signal?.aborted) return Promise.reject(new CancellationError('aborted'));
+  return new Promise((resolve, reject) => {
+    const es = new EventSource(url);
+    let gotFrame = false;
+    const onAbort = () => {
+      es.close();
+      reject(new CancellationError('aborted'));
+    };
+    // Closes the stream and detaches from the job signal, which outlives it
+    const finish = (settle, value) => {
+      es.close();
+      signal?.removeEventListener('abort', onAbort);
+      settle(value);
+    };
+    signal?.addEventListener('abort', onAbort, { once: true });
+    es.onmessage = (ev) => {
+      gotFrame = true;
+      let done;
+      try {
+        done = onFrame(JSON.parse(ev.data));
+      } catch (err) {
+        finish(reject, err);
+        return;
+      }
+      if (done) finish(resolve, true);
+    };
+    es.onerror = () => {
+      // Once frames have arrived EventSource reconnects on its own, unless the
+      // reconnect itself failed (non-200, e.g. a proxy 502), which closes it for good
+      if (!gotFrame || es.readyState === EventSource.CLOSED) finish(resolve, false);
+    };
+  });
+}
+
+// Fallback polling: the delay starts at the loop's base interval, doubles
+// while the status is unchanged and resets to the base when it changes
+const POLL_BACKOFF_MAX_MS = 30000;
+
+/**
+ * Next wait for a status polling loop.
+ * @param {number} delay - Wait used before the last request
+ * @param {boolean} changed - Whether the last response differed from the one before
+ * @param {number} baseMs - Loop's base interval
+ * @returns {number}
+ */
+function nextPollDelay(delay, changed, baseMs){
+  return changed ? baseMs : Math.min(POLL_BACKOFF_MAX_MS, delay * 2);
+}
+
+/** Applies one /api/status payload; true when complete, throws if cancelled or failed */
+function applyJobStatus(p, s, onUpdate){
+  if (s.status==='complete'){ onUpdate && onUpdate({text:`Complete: ${p}`,current:1,total:1}); return true; }
+  if (s.status==='cancelled' || s.status==='cancelling'){
+    miniDone('<span style="color:#dc2626;">Job cancelled.</span>');
+    throw new CancellationError('Job was cancelled by user');
+  }
+  if (s.status==='error'){
+    const errorText = (s.progress && typeof s.progress === 'object' ? s.progress.text : s.progress) || s.error || 'Job failed';
+    miniDone(`<span style="color:#dc2626;">Error: ${escapeHtml(errorText)}</span>`);
+    throw new JobFailedError(errorText, true);
+  }
+  const prog = s.progress || s;
+  onUpdate && onUpdate({current:prog.current, total:prog.total, text:prog.text || s.status || 'Processing'});
+  return false;
+}
+
+async function pollUntilComplete(p, onUpdate, signal){
+  // Pushed status frames when available; interval polling otherwise
+  const streamed = await followStatusStream(`/api/status/stream/${encodeURIComponent(p)}`,
+    s => applyJobStatus(p, s, onUpdate), signal);
+  if (streamed) return;
+
+  // One low-priority, uncached status request per job, re-sent each round
+  const statusReq = new Request(`/api/status/${encodeURIComponent(p)}`, {
+    headers: { 'Accept': 'application/json' }, cache: 'no-store', priority: 'low', signal
+  });
+  let delay = 4000;
+  let lastBody = null;
   for(;;){
-    await new Promise(r=>setTimeout(r, 4000));
+    // Background tabs keep a slow poll so completion can still be announced
+    await sleepUnlessAborted(hiddenPollDelay(delay), signal);
+    let body = null;
     try{
-      const r = await fetch(`/api/status/${encodeURIComponent(p)}`);
+      const r = await fetch(statusReq);
       if (!r.ok){ onUpdate && onUpdate({text:`Waiting on ${p}…`}); continue; }
-      const s = await r.json();
-      if (s.status==='complete'){ onUpdate && onUpdate({text:`Complete: ${p}`,current:1,total:1}); break; }
-      if (s.status==='cancelled' || s.status==='cancelling'){
-        miniDone('<span style="color:#dc2626;">Job cancelled.</span>');
-        throw new CancellationError('Job was cancelled by user');
-      }
-      const prog = s.progress || s;
-      onUpdate && onUpdate({current:prog.current, total:prog.total, text:prog.text || s.status || 'Processing'});
+      body = await r.text();
+      if (applyJobStatus(p, JSON.parse(body), onUpdate)) break;
     }catch(e){
-      if (e instanceof CancellationError || e.name === 'CancellationError') throw e;
+      if (isCancellation(e) || e instanceof JobFailedError) throw e;
       onUpdate && onUpdate({text:`Rechecking ${p}…`});
+    }finally{
+      delay = nextPollDelay(delay, body !== null && body !== lastBody, 4000);
+      if (body !== null) lastBody = body;
     }
   }
 }
@@ -7184,7 +8462,8 @@ function getCurrentProteinNodes() {
 
 function findMainEdgePayload(targetId) {
   // Enrich pruning relevance when main ↔ target exists; otherwise omit (#3)
-  const hit = links.find(l => l.type === 'interaction' && (
+  // Only links touching targetId can qualify; getNodeLinks keeps links order
+  const hit = getNodeLinks(targetId).find(l => l.type === 'interaction' && (
     ((l.source.id || l.source) === SNAP.main && (l.target.id || l.target) === targetId) ||
     ((l.source.id || l.source) === targetId && (l.target.id || l.target) === SNAP.main)
   ));
@@ -7198,45 +8477,65 @@ function findMainEdgePayload(targetId) {
   };
 }
 
-async function pollPruned(jobId, onUpdate) {
+async function pollPruned(jobId, onUpdate, signal) {
+  // Pushed status frames when available; interval polling otherwise.
+  // 'unknown' keeps waiting; 'error' is final and rejects (the caller falls back to the full flow).
+  const streamed = await followStatusStream(`/api/expand/status/stream/${encodeURIComponent(jobId)}`, s => {
+    if (s.status === 'complete') { onUpdate && onUpdate({ text: s.text || 'complete' }); return true; }
+    if (s.status === 'error') throw new JobFailedError(s.text || 'prune error');
+    onUpdate && onUpdate({ text: s.status === 'unknown' ? 'checking…' : (s.text || s.status || 'processing') });
+    return false;
+  }, signal);
+  if (streamed) return;
+
+  const statusReq = new Request(`/api/expand/status/${encodeURIComponent(jobId)}`, {
+    headers: { 'Accept': 'application/json' }, cache: 'no-store', priority: 'low', signal
+  });
+  let delay = 3000;
+  let lastBody = null;
   for (;;) {
-    await new Promise(r => setTimeout(r, 3000));
+    await sleepUnlessAborted(delay, signal);
+    let body = null;
     try {
-      const r = await fetch(`/api/expand/status/${encodeURIComponent(jobId)}`);
+      const r = await fetch(statusReq);
       if (!r.ok) throw new Error(`status ${r.status}`);
-      const s = await r.json();
+      body = await r.text();
+      const s = JSON.parse(body);
       if (s.status === 'complete') { onUpdate && onUpdate({ text: s.text || 'complete' }); break; }
-      if (s.status === 'error') throw new Error(s.text || 'prune error');
+      if (s.status === 'error') throw new JobFailedError(s.text || 'prune error');
       onUpdate && onUpdate({ text: s.text || s.status || 'processing' });
-    } catch {
+    } catch (e) {
+      if (isCancellation(e) || e instanceof JobFailedError) throw e;
       onUpdate && onUpdate({ text: 'checking…' });
+    } finally {
+      delay = nextPollDelay(delay, body !== null && body !== lastBody, 3000);
+      if (body !== null) lastBody = body;
     }
   }
 }
 
-async function queueAndWaitFull(protein) {
+async function queueAndWaitFull(protein, signal) {
   // (#6) Only label text changes, bar stays the same
   miniProgress('Initializing…', null, null, protein);
   const q = await fetch('/api/query', {
     method: 'POST', headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify({ protein })
+    body: JSON.stringify({ protein }), signal
   });
   if (!q.ok) throw new Error('failed to queue full job');
 
   try {
     await pollUntilComplete(protein, ({ current, total, text }) =>
-      miniProgress(text || 'Processing', current, total, protein)
-    );
+      miniProgress(text || 'Processing', current, total, protein), signal);
   } catch (e) {
     // Re-throw with proper error type
-    if (e instanceof CancellationError || e.name === 'CancellationError') {
+    if (isCancellation(e)) {
       throw new CancellationError(e.message);
     }
     throw e;
   }
 }
 
-async function tryPrunedExpand(interNode) {
+async function tryPrunedExpand(interNode, signal) {
   const payload = {
     parent: SNAP.main,                    // (#1) always the current root as parent
     protein: interNode.id,
@@ -7247,15 +8546,15 @@ async function tryPrunedExpand(interNode) {
 
   const resp = await fetch('/api/expand/pruned', {
     method: 'POST', headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify(payload)
+    body: JSON.stringify(payload), signal
   });
   if (!resp.ok) throw new Error(`pruned request failed: ${resp.status}`);
   const j = await resp.json();
   const jobId = j.job_id;
 
   if (j.status === 'needs_full') {
-    await queueAndWaitFull(interNode.id);
-    return await tryPrunedExpand(interNode); // re-enter prune after full is built
+    await queueAndWaitFull(interNode.id, signal);
+    return await tryPrunedExpand(interNode, signal); // re-enter prune after full is built
   }
 
   if (j.status === 'queued' || j.status === 'processing') {
@@ -7265,12 +8564,12 @@ async function tryPrunedExpand(interNode) {
       const t = (p.text || '').toLowerCase();
       const label = t.includes('llm') ? 'Pruning (LLM)' : 'Pruning (relevance)';
       miniProgress(`${label}…`, null, null, interNode.id);
-    });
+    }, signal);
   } else if (j.status !== 'complete') {
     throw new Error(`unexpected pruned status: ${j.status || 'unknown'}`);
   }
 
-  const rr = await fetch(`/api/expand/results/${encodeURIComponent(jobId)}`);
+  const rr = await fetch(`/api/expand/results/${encodeURIComponent(jobId)}`, { signal });
   if (!rr.ok) throw new Error(`failed to load pruned results`);
   const pruned = await rr.json();
   await mergeSubgraph(pruned, interNode);
@@ -7278,9 +8577,10 @@ async function tryPrunedExpand(interNode) {
 }
 
 // Current full-flow used as fallback
-async function expandViaFullFlow(interNode) {
+async function expandViaFullFlow(interNode, signal) {
   const id = interNode.id;
-  let res = await fetch(`/api/results/${encodeURIComponent(id)}`);
+  // Click-initiated, so ahead of background status polls
+  let res = await fetch(`/api/results/${encodeURIComponent(id)}`, { signal, priority: 'high' });
   if (res.ok) {
     const raw = await res.json();
     await mergeSubgraph(raw, interNode);
@@ -7288,16 +8588,8 @@ async function expandViaFullFlow(interNode) {
     return;
   }
   if (res.status === 404) {
-    try {
-      await queueAndWaitFull(id);
-    } catch (e) {
-      // Re-throw cancellation errors
-      if (e instanceof CancellationError || e.name === 'CancellationError') {
-        throw e;
-      }
-      throw e;
-    }
-    const r2 = await fetch(`/api/results/${encodeURIComponent(id)}`);
+    await queueAndWaitFull(id, signal);
+    const r2 = await fetch(`/api/results/${encodeURIComponent(id)}`, { signal });
     if (!r2.ok) { miniDone(`<span>No results for ${id} after job.</span>`); return; }
     const raw2 = await r2.json();
     await mergeSubgraph(raw2, interNode);
@@ -7311,6 +8603,7 @@ async function expandViaFullFlow(interNode) {
 const MAX_DEPTH = 3;
 const depthMap = new Map();
 const expanded = new Set();
+const expandingInFlight = new Set();  // interactor ids whose expansion requests are still running
 (function seedDepths(){
   const main = SNAP.main; depthMap.set(main,0);
   SNAP.interactors.forEach(it=> {
@@ -7326,6 +8619,9 @@ async function expandInteractor(interNode){
   const depth = depthMap.get(id) ?? 1;
   const msg = document.getElementById('notification-message');
 
+  // Repeat clicks while the first expansion is still loading are ignored
+  if (expandingInFlight.has(id)) return;
+
   // Toggle collapse
   if (expanded.has(id)){
     await collapseInteractor(id);
@@ -7337,22 +8633,26 @@ async function expandInteractor(interNode){
     return;
   }
 
+  const signal = beginJobAbort();
+  expandingInFlight.add(id);
   try {
     // Prefer pruned; clean fallback to full flow
-    await tryPrunedExpand(interNode).catch(async (e) => {
-      // Don't fallback if user cancelled
-      if (e instanceof CancellationError || e.name === 'CancellationError') {
-        throw e;  // Re-throw cancellation errors
+    await tryPrunedExpand(interNode, signal).catch(async (e) => {
+      // Don't fallback if user cancelled or the full job already failed
+      if (isReportedJobEnd(e)) {
+        throw e;
       }
       console.warn('Pruned expand failed, falling back:', e);
-      await expandViaFullFlow(interNode);
+      await expandViaFullFlow(interNode, signal);
     });
   } catch (err) {
-    // Don't show error message for cancellations
-    if (err instanceof CancellationError || err.name === 'CancellationError') {
+    // Don't show error message for cancellations or already-reported failures
+    if (isReportedJobEnd(err)) {
       return;  // Silent exit on cancellation
     }
     miniDone(`<span>Error expanding ${id}: ${err?.message || err}</span>`);
+  } finally {
+    expandingInFlight.delete(id);
   }
 }
 
@@ -7398,8 +8698,6 @@ async function mergeSubgraph(raw, clickedNode){
     centerY = newClusterPos.y;
   }
 
-  const nodeIds = new Set(nodes.map(n=>n.id));
-  const linkIds = new Set(links.map(l=>l.id));
   const parentDepth = depthMap.get(clickedNode.id) ?? 1;
   const childDepth = Math.min(MAX_DEPTH, parentDepth+1);
 
@@ -7407,7 +8705,7 @@ async function mergeSubgraph(raw, clickedNode){
   const regLinks = new Set();
 
   // NEW: Add protein nodes (exclude clicked node if already exists)
-  const newProteins = sub.proteins.filter(p => p !== clickedNode.id && !nodeIds.has(p));
+  const newProteins = sub.proteins.filter(p => p !== clickedNode.id && !nodeById.has(p));
 
   // Calculate cluster radius for positioning (use existing cluster if available, or calculate new one)
   let clusterRadius;
@@ -7418,24 +8716,26 @@ async function mergeSubgraph(raw, clickedNode){
     clusterRadius = calculateClusterRadius(newProteins.length);
   }
 
-  newProteins.forEach((protein, idx) => {
-    // Position nodes in a small circle within the cluster
-    const angle = (2*Math.PI*idx)/Math.max(1, newProteins.length) - Math.PI/2;
-    const radius = clusterRadius * 0.6; // Position within cluster bounds (60% of calculated radius)
-    const x = centerX + Math.cos(angle)*radius;
-    const y = centerY + Math.sin(angle)*radius;
-
+  // Position nodes in a small circle within the cluster, starting at the top.
+  // The unit vector is advanced by a fixed rotation instead of calling cos/sin per node.
+  const radius = clusterRadius * 0.6; // Position within cluster bounds (60% of calculated radius)
+  const step = (2*Math.PI)/Math.max(1, newProteins.length);
+  const stepCos = Math.cos(step), stepSin = Math.sin(step);
+  let ux = 0, uy = -1;
+  for (const protein of newProteins) {
     // Create new protein node
-    nodes.push({
+    addNode({
       id: protein,
       label: protein,
       type: 'interactor',
       radius: interactorNodeRadius,
-      x: x,
-      y: y
+      x: centerX + ux*radius,
+      y: centerY + uy*radius
     });
+    const nextUx = ux*stepCos - uy*stepSin;
+    uy = uy*stepCos + ux*stepSin;
+    ux = nextUx;
 
-    nodeIds.add(protein);
     depthMap.set(protein, childDepth);
 
     // Track for expansion registry (for collapse)
@@ -7445,7 +8745,7 @@ async function mergeSubgraph(raw, clickedNode){
         regNodes.add(protein);
       }
     }
-  });
+  }
 
   // NEW: Add interaction links (all types: direct, shared, cross_link)
   sub.interactions.forEach(interaction => {
@@ -7468,19 +8768,19 @@ async function mergeSubgraph(raw, clickedNode){
     const linkId = `${source}-${target}-${arrow}`;
     const reverseLinkId = `${target}-${source}-${arrow}`;
 
-    // Skip if link already exists in base graph
-    const inBase = (baseLinks && (baseLinks.has(linkId) || baseLinks.has(reverseLinkId)));
+    // Skip if link already exists in base graph (in either direction)
+    const inBase = baseLinkPairs && baseLinkPairs.has(linkPairKey(source, target, arrow));
     if (inBase) {
       return;
     }
 
     // Skip if link already added in this merge
-    if (linkIds.has(linkId)) {
+    if (linkById.has(linkId)) {
       return;
     }
 
     // Check if reverse exists
-    const reverseExists = linkIds.has(reverseLinkId);
+    const reverseExists = linkById.has(reverseLinkId);
 
     // Determine if bidirectional
     const isBidirectional = isBiDir(interaction.direction) || reverseExists;
@@ -7502,8 +8802,7 @@ async function mergeSubgraph(raw, clickedNode){
       confidence: interaction.confidence || 0.5
     };
 
-    links.push(link);
-    linkIds.add(linkId);
+    addLink(link);
 
     // Track for expansion registry (for collapse)
     if (!baseLinks || !baseLinks.has(linkId)){
@@ -7528,6 +8827,8 @@ async function mergeSubgraph(raw, clickedNode){
       const oldCluster = clusters.get(oldClusterId);
       if (oldCluster) {
         oldCluster.members.delete(clickedNode.id);
+        oldCluster.memberNodes = oldCluster.memberNodes.filter(n => n.id !== clickedNode.id);
+        invalidateNodeClusterIndex();
         console.log(`  ✓ Removed ${clickedNode.id} from cluster ${oldClusterId}`);
       }
     }
@@ -7579,7 +8880,7 @@ async function mergeSubgraph(raw, clickedNode){
     const clusterCenterY = centerY;
 
     targetCluster.members.forEach(memberId => {
-      const member = nodes.find(n => n.id === memberId);
+      const member = nodeById.get(memberId);
       if (member) {
         if (Number.isFinite(member.x) && Number.isFinite(member.y) &&
             member.x !== 0 && member.y !== 0) {
@@ -7613,6 +8914,7 @@ async function mergeSubgraph(raw, clickedNode){
   // Mark expansion as complete
   expanded.add(clickedNode.id);
   expansionRegistry.set(clickedNode.id, { nodes: regNodes, links: regLinks });
+  expansionParentOfDirty = true;
 
   // Reposition indirect interactors near their upstream interactors (hybrid layout)
   // Group newly added indirect nodes by upstream
@@ -7621,7 +8923,7 @@ async function mergeSubgraph(raw, clickedNode){
   nodes.forEach(node => {
     if (regNodes.has(node.id) && node.type === 'interactor') {
       // Check if this newly added node is an indirect interactor
-      const link = links.find(l => {
+      const link = getNodeLinks(node.id).find(l => {
         const target = (l.target && l.target.id) ? l.target.id : l.target;
         return target === node.id;
       });
@@ -7642,7 +8944,7 @@ async function mergeSubgraph(raw, clickedNode){
 
   // Position each group around its upstream node
   newIndirectGroups.forEach((indirectNodes, upstreamId) => {
-    const upstreamNode = nodes.find(n => n.id === upstreamId);
+    const upstreamNode = nodeById.get(upstreamId);
 
     if (!upstreamNode) {
       console.warn(`mergeSubgraph: Upstream node ${upstreamId} not found`);
@@ -7686,7 +8988,7 @@ async function collapseInteractor(ownerId){
     else { refCounts.set(lid, c); }
   });
   if (toRemoveLinks.length){
-    links = links.filter(l => !toRemoveLinks.includes(l.id));
+    removeLinksById(new Set(toRemoveLinks));
   }
 
   // Remove nodes (only if no remaining incident links)
@@ -7703,23 +9005,23 @@ async function collapseInteractor(ownerId){
     }
   });
   if (toRemoveNodes.length){
-    nodes = nodes.filter(n => !toRemoveNodes.includes(n.id));
+    removeNodesById(new Set(toRemoveNodes));
   }
 
   // Remove cluster if it was created for this expansion
   if (clusters.has(ownerId)) {
     // Before deleting, move the owner node back to root cluster
-    const ownerNode = nodes.find(n => n.id === ownerId);
+    const ownerNode = nodeById.get(ownerId);
     if (ownerNode) {
       // Release fixed position so it can move
       ownerNode.fx = null;
       ownerNode.fy = null;
 
       // Find the main cluster (root cluster)
-      const mainNode = nodes.find(n => n.type === 'main');
+      const mainNode = getMainNode();
       if (mainNode && clusters.has(mainNode.id)) {
         const rootCluster = clusters.get(mainNode.id);
-        rootCluster.members.add(ownerId);
+        addNodeToCluster(mainNode.id, ownerId);
 
         // Position it near the root cluster center for smooth transition
         const rootPos = rootCluster.centerPos;
@@ -7733,10 +9035,12 @@ async function collapseInteractor(ownerId){
     }
 
     clusters.delete(ownerId);
+    invalidateNodeClusterIndex();
     console.log(`Removed cluster for ${ownerId}`);
   }
 
   expansionRegistry.delete(ownerId);
+  expansionParentOfDirty = true;
   expanded.delete(ownerId);
   updateGraphWithTransitions();
 }
@@ -7746,11 +9050,11 @@ async function collapseInteractor(ownerId){
  */
 function updateGraphWithTransitions(){
   // Initialize new nodes with orbital positions
+  siblingCache.clear();
   nodes.forEach(node => {
     if (!Number.isFinite(node.x) || !Number.isFinite(node.y)) {
-      const pos = calculateOrbitalPosition(node);
-      node.x = pos.x;
-      node.y = pos.y;
+      // Written straight onto the node: no intermediate {x, y} per node
+      calculateOrbitalPosition(node, node);
     }
   });
 
@@ -7800,10 +9104,7 @@ function updateGraphWithTransitions(){
       // marker-start shows arrow at source end
       // Use for bidirectional (both ends) only
       if (dir === 'bidirectional') {
-        const a=d.arrow||'binds';
-        if (a==='activates') return 'url(#arrow-activate)';
-        if (a==='inhibits') return 'url(#arrow-inhibit)';
-        return 'url(#arrow-binding)';
+        return ensureArrowMarker(d.arrow||'binds');
       }
       return null;
     })
@@ -7815,10 +9116,7 @@ function updateGraphWithTransitions(){
       // Absolute: a_to_b, b_to_a (used for shared links and database storage)
       if (dir === 'main_to_primary' || dir === 'primary_to_main' || dir === 'bidirectional' ||
           dir === 'a_to_b' || dir === 'b_to_a') {
-        const a=d.arrow||'binds';
-        if (a==='activates') return 'url(#arrow-activate)';
-        if (a==='inhibits') return 'url(#arrow-inhibit)';
-        return 'url(#arrow-binding)';
+        return ensureArrowMarker(d.arrow||'binds');
       }
       return null;
     })
@@ -7861,10 +9159,8 @@ function updateGraphWithTransitions(){
     .attr('class','node-group')
     .attr('transform', d => {
       // Start from parent position for smooth animation
-      const parent = nodes.find(n => {
-        const registry = expansionRegistry.get(n.id);
-        return registry && registry.nodes && registry.nodes.has(d.id);
-      });
+      const parentId = getExpansionParentId(d.id);
+      const parent = parentId !== undefined ? nodeById.get(parentId) : undefined;
       if (parent && parent.x && parent.y) {
         return `translate(${parent.x},${parent.y})`;
       }
@@ -7875,6 +9171,7 @@ function updateGraphWithTransitions(){
   nodeEnter.each(function(d){
     const group = d3.select(this);
     if (d.type==='main'){
+      ensureNodeGradient('main');
       group.append('circle')
         .attr('class','node main-node')
         .attr('r', mainNodeRadius)
@@ -7882,6 +9179,7 @@ function updateGraphWithTransitions(){
         .on('click', (ev)=>{ ev.stopPropagation(); handleNodeClick(d); });
       group.append('text').attr('class','node-label main-label').attr('dy',5).text(d.label);
     } else if (d.type==='interactor'){
+      ensureNodeGradient('interactor');
       // Check if this interactor has been expanded (is a cluster center)
       const isExpanded = clusters.has(d.id);
       const nodeClass = isExpanded ? 'node expanded-node' : 'node interactor-node';
@@ -7913,7 +9211,7 @@ function updateGraphWithTransitions(){
     console.log(`\n⚙️ BEFORE simulation.nodes():`);
     // Log a few cluster centers
     clusters.forEach((cluster, centerId) => {
-      const centerNode = nodes.find(n => n.id === centerId);
+      const centerNode = nodeById.get(centerId);
       if (centerNode) {
         console.log(`  - ${centerId}:`, { x: centerNode.x, y: centerNode.y, fx: centerNode.fx, fy: centerNode.fy });
       }
@@ -7923,7 +9221,7 @@ function updateGraphWithTransitions(){
 
     console.log(`\n⚙️ AFTER simulation.nodes():`);
     clusters.forEach((cluster, centerId) => {
-      const centerNode = nodes.find(n => n.id === centerId);
+      const centerNode = nodeById.get(centerId);
       if (centerNode) {
         console.log(`  - ${centerId}:`, { x: centerNode.x, y: centerNode.y, fx: centerNode.fx, fy: centerNode.fy });
       }
@@ -7942,7 +9240,7 @@ function updateGraphWithTransitions(){
     if (nodeEnter.size() > 0) {
       console.log(`\n⚙️ BEFORE reheatSimulation():`);
       clusters.forEach((cluster, centerId) => {
-        const centerNode = nodes.find(n => n.id === centerId);
+        const centerNode = nodeById.get(centerId);
         if (centerNode) {
           console.log(`  - ${centerId}:`, { x: centerNode.x, y: centerNode.y, fx: centerNode.fx, fy: centerNode.fy });
         }
@@ -7952,7 +9250,7 @@ function updateGraphWithTransitions(){
 
       console.log(`\n⚙️ AFTER reheatSimulation():`);
       clusters.forEach((cluster, centerId) => {
-        const centerNode = nodes.find(n => n.id === centerId);
+        const centerNode = nodeById.get(centerId);
         if (centerNode) {
           console.log(`  - ${centerId}:`, { x: centerNode.x, y: centerNode.y, fx: centerNode.fx, fy: centerNode.fy });
         }
@@ -8190,8 +9488,8 @@ function applyGraphFilters() {
 
     if (d.type === 'interaction') {
       // Check both arrow type and depth filters
-      const targetNode = nodes.find(n => n.id === (d.target?.id || d.target));
-      const sourceNode = nodes.find(n => n.id === (d.source?.id || d.source));
+      const targetNode = nodeById.get((d.target?.id || d.target));
+      const sourceNode = nodeById.get((d.source?.id || d.source));
       const maxDepth = Math.max(
         depthMap.get(targetNode?.id || '') || 0,
         depthMap.get(sourceNode?.id || '') || 0
@@ -8230,8 +9528,8 @@ function applyGraphFilters() {
         const arrow = l.arrow || 'binds';
 
         // Check if the link itself passes depth filter
-        const linkTargetNode = nodes.find(n => n.id === targetId);
-        const linkSourceNode = nodes.find(n => n.id === sourceId);
+        const linkTargetNode = nodeById.get(targetId);
+        const linkSourceNode = nodeById.get(sourceId);
         const linkMaxDepth = Math.max(
           depthMap.get(linkTargetNode?.id || '') || 0,
           depthMap.get(linkSourceNode?.id || '') || 0
@@ -8752,10 +10050,10 @@ function createExpandedRow(entry) {
       // PMIDs and DOI
       html += '<div class="expanded-evidence-pmids">';
       if (ev.pmid) {
-        html += `<a href="https://pubmed.ncbi.nlm.nih.gov/${escapeHtml(ev.pmid)}" target="_blank" class="expanded-pmid-badge" onclick="event.stopPropagation();">PMID: ${escapeHtml(ev.pmid)}</a>`;
+        html += `<a href="https://pubmed.ncbi.nlm.nih.gov/${escapeHtml(ev.pmid)}" target="_blank" class="expanded-pmid-badge">PMID: ${escapeHtml(ev.pmid)}</a>`;
       }
       if (ev.doi) {
-        html += `<a href="https://doi.org/${escapeHtml(ev.doi)}" target="_blank" class="expanded-pmid-badge" onclick="event.stopPropagation();">DOI: ${escapeHtml(ev.doi)}</a>`;
+        html += `<a href="https://doi.org/${escapeHtml(ev.doi)}" target="_blank" class="expanded-pmid-badge">DOI: ${escapeHtml(ev.doi)}</a>`;
       }
       html += '</div>';
 
@@ -8778,19 +10076,9 @@ function createExpandedRow(entry) {
   td.appendChild(content);
   expandedRow.appendChild(td);
 
-  // Add click handlers to evidence cards after DOM insertion
-  setTimeout(() => {
-    const evidenceCards = content.querySelectorAll('.expanded-evidence-card[data-has-link="true"]');
-    evidenceCards.forEach(card => {
-      card.addEventListener('click', (e) => {
-        // Don't trigger if clicking on the badge links (they have stopPropagation)
-        const link = card.dataset.evidenceLink;
-        if (link) {
-          window.open(link, '_blank');
-        }
-      });
-    });
-  }, 50);
+  // One delegated handler opens evidence cards' primary links
+  const evidenceList = content.querySelector('.expanded-evidence-list');
+  if (evidenceList) evidenceList.addEventListener('click', handleEvidenceListClick);
 
   return expandedRow;
 }
@@ -9222,11 +10510,23 @@ function renderPMIDs(pmids) {
   </div>`;
 }
 
+/**
+ * Escapes text for insertion as HTML text content or a quoted attribute value.
+ * Beyond the textContent -> innerHTML round trip it also escapes both quote
+ * characters, so values like data-protein-id="${escapeHtml(id)}" cannot break
+ * out of the attribute. Memoizes short strings (gene/protein names, arrows, PMIDs).
+ */
 function escapeHtml(text) {
   if (text == null) return '';
-  const div = document.createElement('div');
-  div.textContent = String(text);
-  return div.innerHTML;
+  const str = String(text);
+  if (str.length > 64) return str.replace(ESCAPE_HTML_RE, ch => ESCAPE_HTML_MAP[ch]);
+  let escaped = escapeHtmlCache.get(str);
+  if (escaped === undefined) {
+    escaped = str.replace(ESCAPE_HTML_RE, ch => ESCAPE_HTML_MAP[ch]);
+    if (escapeHtmlCache.size >= ESCAPE_HTML_CACHE_MAX) escapeHtmlCache.clear();
+    escapeHtmlCache.set(str, escaped);
+  }
+  return escaped;
 }
 
 function escapeCsv(text) {
@@ -9261,7 +10561,11 @@ document.addEventListener('click', (e) => {
   }
 });
 
-function buildFunctionExportRows() {
+/**
+ * Lazily yields export rows (header first) so CSV export can stream them
+ * without materializing the whole table.
+ */
+function* iterFunctionExportRows() {
   const header = [
     'Source',
     'Target',
@@ -9282,15 +10586,15 @@ function buildFunctionExportRows() {
     'Quote'
   ];
 
-  const rows = [header];
+  yield header;
   const entries = collectFunctionEntries();
 
   if (entries.length === 0) {
-    rows.push(new Array(header.length).fill(''));
-    return rows;
+    yield new Array(header.length).fill('');
+    return;
   }
 
-  entries.forEach(entry => {
+  for (const entry of entries) {
     const fnData = entry.fnData || {};
     const interaction = `${entry.source} -> ${entry.target}`;
     const effectLabel = entry.arrow === 'activates' ? 'Activates' : (entry.arrow === 'inhibits' ? 'Inhibits' : 'Binds');
@@ -9303,10 +10607,11 @@ function buildFunctionExportRows() {
     const evidenceItems = entry.evidence.length ? entry.evidence : [null];
     const pmidFallback = Array.isArray(fnData.pmids) ? fnData.pmids.join(' | ') : '';
 
-    evidenceItems.forEach((ev, evIndex) => {
+    for (let evIndex = 0; evIndex < evidenceItems.length; evIndex++) {
+      const ev = evidenceItems[evIndex];
       const pmidValue = ev && ev.pmid ? ev.pmid : pmidFallback;
 
-      rows.push([
+      yield [
         entry.source,
         entry.target,
         interaction,
@@ -9324,20 +10629,41 @@ function buildFunctionExportRows() {
         ev ? (ev.year || '') : '',
         pmidValue,
         ev ? (ev.relevant_quote || '') : ''
-      ]);
-    });
-  });
+      ];
+    }
+  }
+}
 
-  return rows;
+function buildFunctionExportRows() {
+  return Array.from(iterFunctionExportRows());
 }
 
-function exportToCSV() {
-  const rows = buildFunctionExportRows();
-  const csvContent = rows
-    .map(row => row.map(escapeCsv).join(','))
-    .join('\n');
+const CSV_EXPORT_CHUNK_ROWS = 500;
+
+async function exportToCSV() {
+  // Stream rows into the Blob in fixed-size chunks instead of joining one giant string
+  const rows = iterFunctionExportRows();
+  const encoder = new TextEncoder();
+  let first = true;
+  const stream = new ReadableStream({
+    pull(controller) {
+      let chunk = '';
+      for (let i = 0; i < CSV_EXPORT_CHUNK_ROWS; i++) {
+        const next = rows.next();
+        if (next.done) {
+          if (chunk) controller.enqueue(encoder.encode(chunk));
+          controller.close();
+          return;
+        }
+        chunk += (first ? '' : '\n') + next.value.map(escapeCsv).join(',');
+        first = false;
+      }
+      controller.enqueue(encoder.encode(chunk));
+    }
+  });
 
-  const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
+  const csvBlob = await new Response(stream).blob();
+  const blob = new Blob([csvBlob], { type: 'text/csv;charset=utf-8;' });
   const url = URL.createObjectURL(blob);
   const link = document.createElement('a');
   link.href = url;
@@ -9372,14 +10698,6 @@ function renderPMIDs(pmids) {
     ${pmids.length > 5 ? `<span style="color:#6b7280;font-size:12px;">+${pmids.length - 5} more</span>` : ''}
   </div>`;
 }
-
-function escapeHtml(text) {
-  if (text == null) return '';
-  const div = document.createElement('div');
-  div.textContent = String(text);
-  return div.innerHTML;
-}
-
 function escapeCsv(text) {
   if (text == null) return '';
   const str = String(text);
@@ -9492,6 +10810,9 @@ async function pollForComplete(proteinName, onComplete) {
       const data = await response.json();
 
       if (data.status === 'complete') {
+        // Announce in the background; reload once the tab is in view
+        notifyJobComplete(proteinName);
+        await waitUntilVisible();
         miniDone('Re-query complete! Refreshing...');
         currentRunningJob = null;
         currentJobProtein = null;
@@ -9523,7 +10844,7 @@ async function pollForComplete(proteinName, onComplete) {
       // Keep polling
       attempts++;
       if (attempts < maxAttempts) {
-        setTimeout(checkStatus, 1000);
+        setTimeout(checkStatus, hiddenPollDelay(1000));
       } else {
         miniDone('Timeout waiting for re-query');
         currentRunningJob = null;
@@ -9765,12 +11086,12 @@ document.addEventListener('DOMContentLoaded', () => {
 
       // Not cached - queue and wait (same as interactor expansion)
       try {
-        await queueAndWaitFull(p);
+        await queueAndWaitFull(p, beginJobAbort());
         // On success, redirect to viz page
         window.location.href = `/api/visualize/${encodeURIComponent(p)}?t=${Date.now()}`;
       } catch(err) {
         // queueAndWaitFull already shows error via miniDone
-        if (err instanceof CancellationError || err.name === 'CancellationError') {
+        if (isCancellation(err)) {
           return; // Silent exit on cancellation
         }
       }